@@ -18,7 +18,7 @@ if str(SRC_DIR) not in sys.path:
 from appealpilot.config.key_loader import DEFAULT_KEYS_PATH, load_local_keys
 from appealpilot.models import build_model_c_config, run_model_c_passthrough
 from appealpilot.retrieval import build_retrieval_config, rebuild_retrieval_index
-from appealpilot.workflow import run_pipeline_once
+from appealpilot.workflow import AppealPipeline, AppealPipelineConfig, run_pipeline_once
 
 DEFAULT_DENIAL_PATH = ROOT_DIR / "docs/examples/denial_sample.txt"
 DEFAULT_CHART_NOTES_PATH = ROOT_DIR / "docs/examples/chart_notes_sample.txt"
@@ -105,6 +105,67 @@ def _render_rebuild_panel(default_provider: str) -> None:
                 st.error(f"Failed to rebuild vector store: {exc}")
 
 
+def _run_streaming_workflow(
+    denial_text: str,
+    chart_notes: str,
+    top_k: int,
+    generation_runtime: str,
+    output_dir: Path,
+    retrieval_overrides: dict[str, str],
+) -> tuple[Any, Path]:
+    """Run the pipeline, rendering each Model C section as soon as it streams in."""
+
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(top_k=top_k, generation_runtime=generation_runtime),
+        retrieval_overrides=retrieval_overrides,
+    )
+    st.markdown("### Live Generation")
+    status = st.empty()
+    status.info("Classifying denial and retrieving evidence...")
+    placeholders = {
+        "cover_letter": st.empty(),
+        "detailed_justification": st.empty(),
+        "evidence_checklist": st.empty(),
+        "citations": st.empty(),
+    }
+    drafts: dict[str, str] = {}
+    packet = None
+
+    for event in pipeline.run_stream(
+        denial_text=denial_text, chart_notes=chart_notes, top_k=top_k
+    ):
+        kind = event["event"]
+        section = event.get("section")
+        if kind == "context":
+            status.info(
+                f"Generating appeal ({event['classification']['category']}, "
+                f"{event['evidence_count']} evidence items)..."
+            )
+        elif kind == "delta" and section in placeholders:
+            drafts[section] = drafts.get(section, "") + event["text"]
+            placeholders[section].markdown(
+                f"**{section.replace('_', ' ').title()}**\n\n{drafts[section]}"
+            )
+        elif kind == "section" and section in placeholders:
+            value = event["value"]
+            with placeholders[section].container():
+                st.markdown(f"**{section.replace('_', ' ').title()}**")
+                if isinstance(value, str):
+                    st.markdown(value)
+                else:
+                    st.json(value)
+        elif kind == "fallback":
+            status.warning(f"LLM output failed; using template fallback ({event['reason']}).")
+        elif kind == "complete":
+            packet = event["packet"]
+
+    status.empty()
+    if packet is None:
+        raise RuntimeError("Streaming workflow ended without a packet.")
+    export_dir = pipeline.export_packet(packet=packet, output_dir=output_dir)
+    return packet, export_dir
+
+
 def _render_generation_panel(default_provider: str) -> None:
     st.subheader("Generate Appeal Packet")
     st.caption("Run full denial -> classify -> retrieve -> generate workflow in real time.")
@@ -129,6 +190,7 @@ def _render_generation_panel(default_provider: str) -> None:
 
     collection_name = st.text_input("Retrieval collection", value="dfs_appeals_cases")
     output_dir = st.text_input("Output directory", value="")
+    stream_output = st.checkbox("Stream output as it is generated", value=True)
 
     if st.button("Run Appeal Workflow"):
         if not denial_text.strip():
@@ -142,15 +204,15 @@ def _render_generation_panel(default_provider: str) -> None:
             else ROOT_DIR / "outputs" / "appeals" / f"dashboard_{timestamp}"
         )
 
-        with st.spinner("Running workflow..."):
-            try:
-                retrieval_overrides: dict[str, str] = {
-                    "embedding_provider": query_provider,
-                }
-                if collection_name.strip():
-                    retrieval_overrides["collection_name"] = collection_name.strip()
+        retrieval_overrides: dict[str, str] = {
+            "embedding_provider": query_provider,
+        }
+        if collection_name.strip():
+            retrieval_overrides["collection_name"] = collection_name.strip()
 
-                packet, export_dir = run_pipeline_once(
+        if stream_output:
+            try:
+                packet, export_dir = _run_streaming_workflow(
                     denial_text=denial_text,
                     chart_notes=chart_notes,
                     top_k=int(top_k),
@@ -161,6 +223,20 @@ def _render_generation_panel(default_provider: str) -> None:
             except Exception as exc:
                 st.error(f"Workflow failed: {exc}")
                 return
+        else:
+            with st.spinner("Running workflow..."):
+                try:
+                    packet, export_dir = run_pipeline_once(
+                        denial_text=denial_text,
+                        chart_notes=chart_notes,
+                        top_k=int(top_k),
+                        generation_runtime=generation_runtime,
+                        output_dir=resolved_output_dir,
+                        retrieval_overrides=retrieval_overrides,
+                    )
+                except Exception as exc:
+                    st.error(f"Workflow failed: {exc}")
+                    return
 
         st.success(f"Workflow complete. Exported to `{export_dir}`")
         st.markdown("### Classification")
@@ -2,15 +2,42 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any
+import codecs
+import json
+import time
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from appealpilot import metrics
+from appealpilot.profiling import (
+    PROFILE_HEADER,
+    force_profiling,
+    profile_call,
+    profile_config,
+)
+from appealpilot.domain import ParsedDenial
 from appealpilot.ingest import parse_denial_text
-from appealpilot.models import classify_denial_reason
-from appealpilot.workflow import run_pipeline_once
+from appealpilot.ingest.denial_stream import DenialStreamParser
+from appealpilot.models import (
+    classify_denial_reason,
+    default_response_cache,
+    json_repair_stats,
+    routing_stats,
+)
+from appealpilot.workflow import (
+    AppealJobQueue,
+    AppealJobWorkerPool,
+    build_job_queue_config,
+    coalescing_stats,
+    run_generation_request,
+    stream_generation_request,
+)
 
 
 class ClassifyRequest(BaseModel):
@@ -25,9 +52,92 @@ class GenerateRequest(BaseModel):
     embedding_provider: str | None = None
     collection_name: str | None = None
     output_dir: str | None = None
+    latency_budget_seconds: float | None = Field(default=None, gt=0)
 
 
-app = FastAPI(title="AppealPilot API", version="0.1.0")
+_JOB_QUEUE: AppealJobQueue | None = None
+_JOB_QUEUE_LOCK = Lock()
+
+
+def get_job_queue() -> AppealJobQueue:
+    global _JOB_QUEUE
+    if _JOB_QUEUE is None:
+        with _JOB_QUEUE_LOCK:
+            if _JOB_QUEUE is None:
+                _JOB_QUEUE = AppealJobQueue(build_job_queue_config())
+    return _JOB_QUEUE
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    queue = get_job_queue()
+    pool = AppealJobWorkerPool(queue, workers=queue.config.embedded_workers)
+    if pool.workers > 0:
+        pool.start()
+    try:
+        yield
+    finally:
+        pool.stop(timeout=5)
+
+
+app = FastAPI(title="AppealPilot API", version="0.1.0", lifespan=_lifespan)
+
+
+def _cache_samples() -> Iterator[metrics.Sample]:
+    counts: dict[str, tuple[float, float]] = {}
+    cache = default_response_cache()
+    if cache is not None:
+        stats = cache.stats()
+        counts["model_c_response"] = (stats["hits"], stats["misses"])
+    # A coalesced request is served by another request's in-flight run.
+    coalescing = coalescing_stats()
+    counts["single_flight"] = (coalescing["coalesced"], coalescing["executed"])
+    for name, (hits, misses) in counts.items():
+        yield "appealpilot_cache_events_total", {"cache": name, "result": "hit"}, hits
+        yield "appealpilot_cache_events_total", {"cache": name, "result": "miss"}, misses
+
+
+metrics.register_collector(_cache_samples)
+
+
+@app.middleware("http")
+async def _record_request_metrics(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route templates keep job ids out of the label set. Streaming responses
+        # are timed to their first byte.
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.inc(
+            "appealpilot_http_requests_total",
+            route=route,
+            method=request.method,
+            status=status,
+        )
+        metrics.observe(
+            "appealpilot_http_request_duration_seconds",
+            time.perf_counter() - started,
+            route=route,
+        )
+
+
+@app.middleware("http")
+async def _profile_on_request_header(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # Handlers run in the threadpool with a copy of this context, so the flag
+    # reaches their `profile_call` wrappers.
+    requested = request.headers.get(PROFILE_HEADER, "").lower() in {"1", "true", "yes", "on"}
+    if not requested or profile_config().mode == "off":
+        return await call_next(request)
+    with force_profiling():
+        return await call_next(request)
 
 
 @app.get("/health")
@@ -35,9 +145,57 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus text format; summed across processes when APPEALPILOT_METRICS_DIR is set."""
+
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/pipeline/stats")
+def pipeline_stats() -> dict[str, Any]:
+    return {
+        "coalescing": coalescing_stats(),
+        "routing": routing_stats(),
+        "json_repair": json_repair_stats(),
+    }
+
+
 @app.post("/classify")
+@profile_call("api.classify")
 def classify(request: ClassifyRequest) -> dict[str, Any]:
-    parsed = parse_denial_text(request.denial_text)
+    return _classification_response(parse_denial_text(request.denial_text))
+
+
+@app.post("/classify/upload")
+async def classify_upload(request: Request, full_scan: bool = False) -> dict[str, Any]:
+    """Classify a denial document sent as the raw (text/plain) request body.
+
+    The body is parsed as it arrives, so memory stays bounded for very large
+    packets. Reading stops once the payer, reason and a deadline are found,
+    unless `full_scan=true`.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stream = DenialStreamParser(stop_early=not full_scan)
+    async for chunk in request.stream():
+        if await run_in_threadpool(stream.feed, decoder.decode(chunk)):
+            break
+    else:
+        stream.feed(decoder.decode(b"", final=True))
+    if not stream.chars_read:
+        raise HTTPException(status_code=400, detail="Empty denial document.")
+    parsed = await run_in_threadpool(stream.close)
+    return {
+        **_classification_response(parsed),
+        "chars_read": stream.chars_read,
+        "stopped_early": stream.stopped_early,
+    }
+
+
+def _classification_response(parsed: ParsedDenial) -> dict[str, Any]:
     classified = classify_denial_reason(parsed.denial_reason_text)
     return {
         "payer": parsed.payer,
@@ -52,31 +210,68 @@ def classify(request: ClassifyRequest) -> dict[str, Any]:
 
 
 @app.post("/generate")
+@profile_call("api.generate")
 def generate(request: GenerateRequest) -> dict[str, Any]:
-    retrieval_overrides = {}
-    if request.embedding_provider:
-        retrieval_overrides["embedding_provider"] = request.embedding_provider
-    if request.collection_name:
-        retrieval_overrides["collection_name"] = request.collection_name
-
-    output_dir = Path(request.output_dir) if request.output_dir else None
-    packet, export_dir = run_pipeline_once(
-        denial_text=request.denial_text,
-        chart_notes=request.chart_notes,
-        top_k=request.top_k,
-        generation_runtime=request.generation_runtime,
-        output_dir=output_dir,
-        retrieval_overrides=retrieval_overrides or None,
+    return run_generation_request(request.model_dump())
+
+
+def _sse_events(request: GenerateRequest) -> Iterator[str]:
+    try:
+        for event in stream_generation_request(request.model_dump()):
+            name = event.pop("event")
+            yield f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+    except Exception as exc:
+        yield f"event: error\ndata: {json.dumps({'detail': str(exc)})}\n\n"
+
+
+@app.post("/generate/stream")
+def generate_stream(request: GenerateRequest) -> StreamingResponse:
+    """Server-sent events: `context`, `delta`/`section` per output field, then `complete`."""
+
+    return StreamingResponse(
+        _sse_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return {
-        "export_dir": str(export_dir),
-        "classification": {
-            "category": packet.classification.category,
-            "confidence": packet.classification.confidence,
-            "matched_terms": list(packet.classification.matched_terms),
-        },
-        "evidence_count": len(packet.evidence_items),
-        "generator_provider": packet.generated_output.get("provider"),
-        "generator_model": packet.generated_output.get("model"),
-    }
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: GenerateRequest) -> dict[str, Any]:
+    job_id = get_job_queue().submit(request.model_dump())
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/metrics")
+def job_metrics() -> dict[str, Any]:
+    return get_job_queue().metrics()
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str) -> dict[str, Any]:
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    job.pop("payload", None)
+    return job
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str) -> dict[str, Any]:
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    if job["status"] != "succeeded":
+        raise HTTPException(
+            status_code=409,
+            detail={"job_id": job_id, "status": job["status"], "error": job["error"]},
+        )
+    return {"job_id": job_id, "status": job["status"], "result": queue.get_result(job_id)}
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str) -> dict[str, Any]:
+    status = get_job_queue().cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return {"job_id": job_id, "status": status}
@@ -0,0 +1,22 @@
+"""Offline benchmarking utilities (stub providers, synthetic corpus, evaluations).
+
+The end-to-end suite lives in `appealpilot.benchmarks.suite`; it is not
+re-exported here because it imports the workflow package, which itself uses
+`stats`.
+"""
+
+from .corpus import SyntheticDenial, synthetic_denial_letters, synthetic_dfs_documents
+from .retrieval_eval import RetrievalEvalConfig, run_retrieval_eval
+from .stats import summarize_latencies
+from .stub_llm_server import StubLLMServer, StubLLMServerConfig
+
+__all__ = [
+    "summarize_latencies",
+    "StubLLMServer",
+    "StubLLMServerConfig",
+    "SyntheticDenial",
+    "synthetic_denial_letters",
+    "synthetic_dfs_documents",
+    "RetrievalEvalConfig",
+    "run_retrieval_eval",
+]
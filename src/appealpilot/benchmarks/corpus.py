@@ -0,0 +1,129 @@
+"""Seeded synthetic DFS-like cases and denial letters for benchmarks.
+
+Nothing here is real patient data. Documents mimic the text layout produced by
+`dfs_ingest` (`field: value` lines) and letters mimic `docs/examples`, with the
+payer and denial category known so callers can also score accuracy.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from appealpilot.ingest.denial_parser import KNOWN_PAYERS
+from appealpilot.models.model_a_classifier import TAXONOMY
+from appealpilot.retrieval.chroma_retriever import RetrievalDocument
+
+TREATMENTS = (
+    ("MRI lumbar spine", "72148", "lumbar radiculopathy"),
+    ("Proton beam therapy", "77520", "prostate cancer"),
+    ("Continuous glucose monitor", "A9276", "type 1 diabetes"),
+    ("Inpatient rehabilitation", "97110", "stroke"),
+    ("Bariatric surgery", "43775", "morbid obesity"),
+    ("Genetic testing panel", "81479", "hereditary cancer risk"),
+    ("Residential treatment", "H0017", "eating disorder"),
+    ("Spinal cord stimulator", "63650", "chronic pain syndrome"),
+    ("Home health nursing", "99600", "congestive heart failure"),
+    ("Transcranial magnetic stimulation", "90867", "major depressive disorder"),
+)
+DECISIONS = ("Overturned", "Upheld", "Overturned in part")
+COVERAGE_TYPES = ("Medical necessity", "Experimental/investigational", "Out of network")
+FILLER = (
+    "The reviewer considered the submitted records, the plan's clinical policy and "
+    "current peer-reviewed literature. The patient had tried and failed conservative "
+    "therapy over several months with documented functional limitation. Imaging and "
+    "laboratory findings were consistent with the treating provider's assessment. "
+    "Guidelines from the relevant specialty society support the requested service "
+    "for patients with this presentation. "
+).split()
+
+
+@dataclass(frozen=True)
+class SyntheticDenial:
+    text: str
+    payer: str
+    category: str
+    codes: tuple[str, ...]
+
+
+def _filler(rng: random.Random, words: int) -> str:
+    start = rng.randrange(len(FILLER))
+    return " ".join(FILLER[(start + offset) % len(FILLER)] for offset in range(words))
+
+
+def synthetic_dfs_documents(
+    count: int, seed: int = 0, rationale_words: int = 120
+) -> list[RetrievalDocument]:
+    """`count` DFS-style external appeal records."""
+
+    rng = random.Random(seed)
+    documents = []
+    for index in range(count):
+        treatment, code, diagnosis = rng.choice(TREATMENTS)
+        case_number = f"SYN-{seed:03d}-{index:06d}"
+        plan = rng.choice(KNOWN_PAYERS)
+        coverage = rng.choice(COVERAGE_TYPES)
+        text = "\n".join(
+            [
+                f"case number: {case_number}",
+                f"treatment: {treatment} ({code})",
+                f"diagnosis: {diagnosis}",
+                f"health plan: {plan}",
+                f"coverage type: {coverage}",
+                f"decision: {rng.choice(DECISIONS)}",
+                f"rationale: {_filler(rng, rationale_words)}",
+            ]
+        )
+        documents.append(
+            RetrievalDocument(
+                doc_id=case_number,
+                text=text,
+                metadata={
+                    "case_number": case_number,
+                    "decision_year": str(2015 + index % 10),
+                    "health_plan": plan,
+                    "coverage_type": coverage,
+                    "treatment": treatment,
+                    "diagnosis": diagnosis,
+                },
+            )
+        )
+    return documents
+
+
+def synthetic_denial_letter(rng: random.Random, target_chars: int = 1000) -> SyntheticDenial:
+    """One denial letter padded with reviewer prose to about `target_chars`."""
+
+    payer = rng.choice(KNOWN_PAYERS)
+    category = rng.choice(sorted(TAXONOMY))
+    phrase = rng.choice(TAXONOMY[category])
+    treatment, code, diagnosis = rng.choice(TREATMENTS)
+    header = "\n".join(
+        [
+            f"Payer: {payer}",
+            f"Member ID: {rng.randrange(10**8, 10**9)}",
+            f"Claim #: {rng.randrange(10**8, 10**9)}",
+            f"DOS: 2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "",
+            f"Denial Reason: {phrase.capitalize()} for {treatment.lower()} ({diagnosis}).",
+            "",
+            "Requested Service:",
+            f"- CPT {code} ({treatment})",
+            "",
+            "Appeal Instructions:",
+            f"- Submit first-level appeal within {rng.choice((30, 60, 180))} days of this notice.",
+            "",
+        ]
+    )
+    body_chars = max(0, target_chars - len(header) - 1)
+    # Over-generate filler (words average ~7 characters) and trim to the target.
+    body = _filler(rng, body_chars // 5 + 1)[:body_chars].rsplit(" ", 1)[0]
+    text = header + body + "\n"
+    return SyntheticDenial(text=text, payer=payer, category=category, codes=(code,))
+
+
+def synthetic_denial_letters(
+    count: int, target_chars: int = 1000, seed: int = 0
+) -> list[SyntheticDenial]:
+    rng = random.Random(seed)
+    return [synthetic_denial_letter(rng, target_chars) for _ in range(count)]
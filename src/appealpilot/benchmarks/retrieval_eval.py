@@ -0,0 +1,236 @@
+"""Retrieval quality vs. latency across embedding providers.
+
+Labeled queries come from the corpus itself. Records are grouped into case
+families by normalized `treatment` + `diagnosis` metadata. One record per
+sampled family is held out of the index and turned into a query
+("<treatment> for <diagnosis>"). The family's other records are the relevant
+set.
+
+For every provider variant (`hash:<dimensions>`, `sbert`, `insurance_bert`,
+`openai`) the harness builds a fresh collection and reports:
+
+- `recall@k`: relevant hits in the top k over min(k, |relevant|)
+- `mrr`: reciprocal rank of the first relevant hit within the largest k
+- index build seconds and on-disk size
+- query p50/p95
+
+OpenAI can be evaluated without repeat spend through the embedding cache
+(`APPEALPILOT_EMBEDDING_CACHE`, see `CachedEmbeddingFunction`). Variants that
+cannot be built here, or that silently resolve to another provider (openai
+without a key), are reported under `skipped`.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from appealpilot.retrieval.chroma_retriever import (
+    ChromaRetriever,
+    RetrievalDocument,
+    build_retrieval_config,
+)
+
+from .stats import summarize_latencies
+
+DEFAULT_VARIANTS = ("hash:64", "hash:256", "hash:1024", "sbert", "insurance_bert", "openai")
+_FAMILY_NORMALIZER = re.compile(r"[^a-z0-9]+")
+
+
+class RetrievalEvalError(ValueError):
+    """Raised when an evaluation cannot be set up."""
+
+
+@dataclass(frozen=True)
+class LabeledQuery:
+    query_id: str
+    text: str
+    relevant_ids: frozenset[str]
+
+
+@dataclass(frozen=True)
+class RetrievalEvalConfig:
+    variants: tuple[str, ...] = DEFAULT_VARIANTS
+    k_values: tuple[int, ...] = (1, 5, 10)
+    max_queries: int = 200
+    seed: int = 7
+    work_dir: str = "data/interim/retrieval_eval"
+
+    def validate(self) -> None:
+        if not self.variants:
+            raise RetrievalEvalError("At least one provider variant is required.")
+        if not self.k_values or min(self.k_values) < 1:
+            raise RetrievalEvalError("k_values must be non-empty and each >= 1.")
+        if self.max_queries < 1:
+            raise RetrievalEvalError("max_queries must be >= 1.")
+        for variant in self.variants:
+            parse_variant(variant)
+
+
+def parse_variant(variant: str) -> dict[str, Any]:
+    """`hash:256` -> hash overrides with 256 dimensions; other names are providers."""
+
+    provider, _, option = variant.partition(":")
+    overrides: dict[str, Any] = {"embedding_provider": provider}
+    if option:
+        if provider != "hash" or not option.isdigit():
+            raise RetrievalEvalError(
+                f"Unsupported variant {variant!r}; only `hash:<dimensions>` takes an option."
+            )
+        overrides["hash_dimensions"] = int(option)
+    return overrides
+
+
+def _family_key(metadata: Mapping[str, Any]) -> str | None:
+    treatment = _FAMILY_NORMALIZER.sub(" ", str(metadata.get("treatment") or "").lower()).strip()
+    diagnosis = _FAMILY_NORMALIZER.sub(" ", str(metadata.get("diagnosis") or "").lower()).strip()
+    if not treatment and not diagnosis:
+        return None
+    return f"{treatment}|{diagnosis}"
+
+
+def build_labeled_queries(
+    documents: Sequence[RetrievalDocument],
+    max_queries: int = 200,
+    seed: int = 7,
+) -> tuple[list[LabeledQuery], list[RetrievalDocument]]:
+    """Return (queries, documents to index) with one held-out record per query."""
+
+    families: dict[str, list[RetrievalDocument]] = {}
+    for document in documents:
+        key = _family_key(document.metadata)
+        if key is not None:
+            families.setdefault(key, []).append(document)
+
+    rng = random.Random(seed)
+    eligible = sorted(key for key, members in families.items() if len(members) >= 2)
+    if not eligible:
+        raise RetrievalEvalError(
+            "No case family (treatment + diagnosis) has two or more records to evaluate."
+        )
+
+    # Cycle through families so a few large ones do not dominate the query set.
+    held_out: list[tuple[str, RetrievalDocument]] = []
+    pools = {key: rng.sample(families[key], len(families[key]) - 1) for key in eligible}
+    while len(held_out) < max_queries and any(pools.values()):
+        for key in eligible:
+            if pools[key] and len(held_out) < max_queries:
+                held_out.append((key, pools[key].pop()))
+
+    held_ids = {document.doc_id for _, document in held_out}
+    queries = []
+    for key, document in held_out:
+        treatment = str(document.metadata.get("treatment") or "").strip()
+        diagnosis = str(document.metadata.get("diagnosis") or "").strip()
+        text = f"{treatment} for {diagnosis}" if treatment and diagnosis else treatment or diagnosis
+        relevant = frozenset(
+            member.doc_id for member in families[key] if member.doc_id not in held_ids
+        )
+        queries.append(LabeledQuery(document.doc_id, text, relevant))
+    return queries, [document for document in documents if document.doc_id not in held_ids]
+
+
+def score_rankings(
+    rankings: Sequence[Sequence[str]],
+    queries: Sequence[LabeledQuery],
+    k_values: Sequence[int],
+) -> dict[str, float]:
+    """Mean `recall@k` for each k, plus `mrr` (over the ranked lists given)."""
+
+    scores = {f"recall@{k}": 0.0 for k in k_values}
+    scores["mrr"] = 0.0
+    for ranked, query in zip(rankings, queries):
+        for k in k_values:
+            hits = sum(1 for doc_id in ranked[:k] if doc_id in query.relevant_ids)
+            scores[f"recall@{k}"] += hits / min(k, len(query.relevant_ids))
+        rank = next(
+            (index for index, doc_id in enumerate(ranked, 1) if doc_id in query.relevant_ids),
+            None,
+        )
+        scores["mrr"] += 1.0 / rank if rank else 0.0
+    count = max(1, len(queries))
+    return {name: round(value / count, 6) for name, value in scores.items()}
+
+
+def _directory_bytes(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def evaluate_variant(
+    variant: str,
+    documents: Sequence[RetrievalDocument],
+    queries: Sequence[LabeledQuery],
+    k_values: Sequence[int],
+    work_dir: Path,
+) -> dict[str, Any]:
+    """Build a fresh index for one variant and score the query set against it."""
+
+    overrides = parse_variant(variant)
+    persist_directory = work_dir / _FAMILY_NORMALIZER.sub("_", variant)
+    shutil.rmtree(persist_directory, ignore_errors=True)
+    config = build_retrieval_config(
+        overrides={
+            **overrides,
+            "persist_directory": str(persist_directory),
+            "collection_name": "retrieval_eval",
+        }
+    )
+    retriever = ChromaRetriever(config)
+    if retriever.embedding_provider != overrides["embedding_provider"]:
+        raise RetrievalEvalError(
+            f"{variant} resolved to {retriever.embedding_provider} "
+            "(missing API key and no embedding cache replay?)."
+        )
+
+    started = time.perf_counter()
+    retriever.upsert_documents(documents)
+    build_seconds = time.perf_counter() - started
+
+    top_k = max(k_values)
+    latencies = []
+    rankings = []
+    for query in queries:
+        query_started = time.perf_counter()
+        results = retriever.query(query.text, top_k=top_k)
+        latencies.append(time.perf_counter() - query_started)
+        rankings.append([result.doc_id for result in results])
+    latency = summarize_latencies(latencies)
+
+    return {
+        **score_rankings(rankings, queries, k_values),
+        "build_seconds": round(build_seconds, 6),
+        "index_bytes": _directory_bytes(persist_directory),
+        "query_p50_seconds": latency["p50"],
+        "query_p95_seconds": latency["p95"],
+    }
+
+
+def run_retrieval_eval(
+    documents: Sequence[RetrievalDocument],
+    config: RetrievalEvalConfig | None = None,
+) -> dict[str, Any]:
+    """Evaluate every configured variant on queries derived from `documents`."""
+
+    config = config or RetrievalEvalConfig()
+    config.validate()
+    queries, indexed = build_labeled_queries(documents, config.max_queries, config.seed)
+    results: dict[str, Any] = {
+        "config": asdict(config),
+        "documents": len(indexed),
+        "queries": len(queries),
+        "variants": {},
+        "skipped": {},
+    }
+    for variant in config.variants:
+        try:
+            results["variants"][variant] = evaluate_variant(
+                variant, indexed, queries, config.k_values, Path(config.work_dir)
+            )
+        except Exception as exc:  # noqa: BLE001 - optional providers vary by environment
+            results["skipped"][variant] = f"{type(exc).__name__}: {exc}"
+    return results
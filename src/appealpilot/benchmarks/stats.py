@@ -0,0 +1,33 @@
+"""Latency summary helpers shared by benchmark scripts."""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; returns 0.0 for an empty sample."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil((pct / 100.0) * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(values: Sequence[float], wall_seconds: float | None = None) -> dict[str, float]:
+    """Return count, mean, p50/p95/p99 (seconds) and throughput when wall time is known."""
+
+    count = len(values)
+    summary = {
+        "count": float(count),
+        "mean": (sum(values) / count) if count else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+    if wall_seconds is not None:
+        summary["wall_seconds"] = wall_seconds
+        summary["throughput_per_second"] = (count / wall_seconds) if wall_seconds > 0 else 0.0
+    return summary
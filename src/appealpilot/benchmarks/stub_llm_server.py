@@ -0,0 +1,325 @@
+"""Local OpenAI-compatible chat completions stub for offline throughput tests.
+
+The stub answers `POST .../chat/completions` with a contract-valid appeal packet
+after a simulated delay of `latency_seconds + completion_tokens / tokens_per_second`,
+so prompt/completion size changes show up in benchmark timings. Requests with
+`"stream": true` get server-sent `chat.completion.chunk` events paced at the same
+token rate, after an initial `latency_seconds` time-to-first-token.
+
+Provider prefix caching is simulated like OpenAI's: prompts of at least
+`prefix_cache_min_tokens` reuse previously seen prefixes in 128-token blocks,
+reported as `usage.prompt_tokens_details.cached_tokens`. With
+`prompt_tokens_per_second > 0` only uncached prompt tokens add prefill delay.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Mapping, Sequence
+
+CHARS_PER_TOKEN_ESTIMATE = 4
+STREAM_TOKENS_PER_CHUNK = 4
+PREFIX_CACHE_BLOCK_TOKENS = 128
+
+
+@dataclass(frozen=True)
+class StubLLMServerConfig:
+    """Simulated provider behavior."""
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    latency_seconds: float = 0.05
+    tokens_per_second: float = 400.0
+    # Prefill rate for uncached prompt tokens; 0 makes prompts free.
+    prompt_tokens_per_second: float = 0.0
+    prefix_cache_min_tokens: int = 1024
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN_ESTIMATE) if text else 0
+
+
+def load_prompt_payload(messages: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
+    """Merge the JSON objects carried by the messages (static system block + case data)."""
+
+    decoder = json.JSONDecoder()
+    payload: dict[str, Any] = {}
+    for message in messages:
+        content = str(message.get("content") or "")
+        start = content.find("{")
+        if start < 0:
+            continue
+        try:
+            loaded, _ = decoder.raw_decode(content, start)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(loaded, dict):
+            payload.update(loaded)
+    return payload
+
+
+def build_stub_appeal_output(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Deterministic appeal packet grounded in whatever evidence the prompt carried."""
+
+    case_summary = payload.get("case_summary") or {}
+    evidence = list(
+        payload.get("retrieved_evidence")
+        or [{"source_id": source_id} for source_id in payload.get("evidence_ids") or []]
+    )
+    attachments = list(payload.get("required_attachments") or [])
+    payer = case_summary.get("payer") or "the health plan"
+    category = case_summary.get("denial_category") or "other"
+
+    packet = {
+        "cover_letter": (
+            f"To {payer}: we request reconsideration of the {category} denial. "
+            "The enclosed records and comparable external appeal decisions support coverage."
+        ),
+        "detailed_justification": " ".join(
+            f"Case {item.get('source_id', idx)} reached a comparable determination."
+            for idx, item in enumerate(evidence, start=1)
+        )
+        or "No comparable determinations were retrieved.",
+        "evidence_checklist": [
+            {"item": item, "status": "missing", "notes": "Attach before submission."}
+            for item in attachments
+        ],
+        "missing_information": [] if evidence else ["Comparable external appeal decisions"],
+        "citations": [
+            {
+                "claim": "Comparable determination supports coverage.",
+                "source_id": str(item.get("source_id", idx)),
+                "source_excerpt": str(item.get("snippet", ""))[:200],
+            }
+            for idx, item in enumerate(evidence, start=1)
+        ],
+    }
+    if "citation_refs" in (payload.get("output_contract") or {}):
+        # Slim contract: cite by offsets and leave the checklist to the caller.
+        packet.pop("evidence_checklist")
+        packet["citation_refs"] = [
+            {
+                "claim": citation["claim"],
+                "source_id": citation["source_id"],
+                "start": 0,
+                "end": len(citation["source_excerpt"]),
+            }
+            for citation in packet.pop("citations")
+        ]
+    # Section-wise prompts list the keys they want; answer only those.
+    sections = payload.get("sections")
+    if sections:
+        return {key: packet[key] for key in sections if key in packet}
+    return packet
+
+
+class StubLLMServer:
+    """Threaded HTTP server speaking the OpenAI chat completions wire format."""
+
+    def __init__(self, config: StubLLMServerConfig | None = None):
+        self.config = config or StubLLMServerConfig()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.requests_served = 0
+        self.max_in_flight = 0
+        self._prefix_blocks: set[str] = set()
+        self._httpd = ThreadingHTTPServer(
+            (self.config.host, self.config.port), self._handler_class()
+        )
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _cached_prefix_tokens(self, prompt_text: str, prompt_tokens: int) -> int:
+        """Tokens of `prompt_text` whose leading blocks were seen in earlier prompts."""
+
+        if prompt_tokens < self.config.prefix_cache_min_tokens:
+            return 0
+        block_chars = PREFIX_CACHE_BLOCK_TOKENS * CHARS_PER_TOKEN_ESTIMATE
+        digest = hashlib.sha256()
+        cached_blocks = 0
+        still_cached = True
+        with self._lock:
+            for start in range(0, len(prompt_text) - block_chars + 1, block_chars):
+                digest.update(prompt_text[start:start + block_chars].encode("utf-8"))
+                key = digest.hexdigest()
+                if still_cached and key in self._prefix_blocks:
+                    cached_blocks += 1
+                else:
+                    still_cached = False
+                    self._prefix_blocks.add(key)
+        return cached_blocks * PREFIX_CACHE_BLOCK_TOKENS
+
+    def _render(self, request: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+        messages = list(request.get("messages") or [])
+        content = json.dumps(build_stub_appeal_output(load_prompt_payload(messages)))
+        prompt_text = "".join(
+            f"{item.get('role', '')}:{item.get('content') or ''}" for item in messages
+        )
+        prompt_tokens = sum(estimate_tokens(str(item.get("content") or "")) for item in messages)
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {
+                "cached_tokens": self._cached_prefix_tokens(prompt_text, prompt_tokens)
+            },
+        }
+        return content, usage
+
+    def _token_delay(self, tokens: int) -> float:
+        if self.config.tokens_per_second <= 0:
+            return 0.0
+        return tokens / self.config.tokens_per_second
+
+    def _prefill_delay(self, usage: Mapping[str, Any]) -> float:
+        if self.config.prompt_tokens_per_second <= 0:
+            return 0.0
+        uncached = usage["prompt_tokens"] - usage["prompt_tokens_details"]["cached_tokens"]
+        return max(0, uncached) / self.config.prompt_tokens_per_second
+
+    def build_completion(self, request: Mapping[str, Any]) -> tuple[dict[str, Any], float]:
+        """Return the completion body and the simulated generation delay."""
+
+        content, usage = self._render(request)
+        delay = (
+            self.config.latency_seconds
+            + self._prefill_delay(usage)
+            + self._token_delay(usage["completion_tokens"])
+        )
+        body = {
+            "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": usage,
+        }
+        return body, delay
+
+    def iter_stream_chunks(
+        self, request: Mapping[str, Any]
+    ) -> Iterator[tuple[dict[str, Any], float]]:
+        """Yield `(chunk, delay_before_sending)` pairs for a streamed completion."""
+
+        content, usage = self._render(request)
+        chunk_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        base = {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+        }
+        step = STREAM_TOKENS_PER_CHUNK * CHARS_PER_TOKEN_ESTIMATE
+        delay = self.config.latency_seconds + self._prefill_delay(usage)
+        for start in range(0, len(content), step):
+            piece = content[start:start + step]
+            yield {
+                **base,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }, delay
+            delay = self._token_delay(estimate_tokens(piece))
+        yield {
+            **base,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": usage,
+        }, 0.0
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+            def _send_json(self, status: int, body: Mapping[str, Any]) -> None:
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def _send_stream(self, request: Mapping[str, Any]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                # No Content-Length: the body ends when the connection closes.
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for chunk, delay in server.iter_stream_chunks(request):
+                    time.sleep(delay)
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                try:
+                    request = json.loads(raw)
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"message": "Invalid JSON body."}})
+                    return
+
+                with server._lock:
+                    server._in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server._in_flight)
+                try:
+                    if request.get("stream"):
+                        self._send_stream(request)
+                    else:
+                        body, delay = server.build_completion(request)
+                        time.sleep(delay)
+                        self._send_json(200, body)
+                finally:
+                    with server._lock:
+                        server._in_flight -= 1
+                        server.requests_served += 1
+
+        return _Handler
@@ -0,0 +1,377 @@
+"""End-to-end benchmark suite over a synthetic corpus, with regression gating.
+
+`run_benchmark_suite` times the parser, classifier, index build, retrieval
+queries, `AppealPipeline.run` (template and cassette-replayed Model C) and
+`export_packet`. It returns a JSON-serializable dict. Each benchmark is a
+`summarize_latencies` summary in seconds, plus throughput.
+
+`compare_results` flags metrics that moved past a relative threshold against
+a baseline results file: latency up, or throughput down.
+
+The replay runtime needs a Model C cassette. Without one, the suite first
+records one against the in-process stub LLM server, so runs stay offline and
+reproducible. Embedding providers that cannot be built here (e.g. sbert
+without `sentence-transformers`) are listed under `skipped` and do not fail
+the run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+from appealpilot.ingest import parse_denial_text, parse_many
+from appealpilot.models import classify_denial_reason, classify_many
+from appealpilot.retrieval import ChromaRetriever, build_retrieval_config
+from appealpilot.workflow import AppealPipeline, AppealPipelineConfig
+
+from .corpus import synthetic_denial_letters, synthetic_dfs_documents
+from .stats import summarize_latencies
+from .stub_llm_server import StubLLMServer, StubLLMServerConfig
+
+RESULTS_SCHEMA_VERSION = 1
+BENCHMARK_RUNTIMES = ("template", "replay")
+LATENCY_METRICS = ("mean", "p50", "p95", "p99")
+DEFAULT_COMPARE_METRICS = ("p50", "p95", "throughput_per_second")
+
+
+class BenchmarkConfigError(ValueError):
+    """Raised when benchmark suite configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class BenchmarkSuiteConfig:
+    corpus_size: int = 500
+    # Denial letter sizes (characters) for the parse/classify benchmarks.
+    denial_sizes: tuple[int, ...] = (1_000, 4_000, 16_000)
+    iterations: int = 200
+    pipeline_iterations: int = 25
+    # Denial reasons per `classify_many` call.
+    classify_batch_size: int = 100_000
+    # Letters per `parse_many` call (the smallest denial size, cycled).
+    parse_batch_size: int = 100_000
+    providers: tuple[str, ...] = ("hash", "sbert")
+    runtimes: tuple[str, ...] = BENCHMARK_RUNTIMES
+    top_k: int = 5
+    # Existing cassette for the replay runtime; recorded against the stub when None.
+    cassette_path: str | None = None
+    # Multiplier on recorded Model C latency during replay (0 = no sleep).
+    replay_latency_scale: float = 1.0
+    stub_latency_seconds: float = 0.05
+    seed: int = 13
+    work_dir: str = "data/interim/benchmarks"
+
+    def validate(self) -> None:
+        if self.corpus_size < 1:
+            raise BenchmarkConfigError("corpus_size must be >= 1.")
+        if not self.denial_sizes or min(self.denial_sizes) < 200:
+            raise BenchmarkConfigError("denial_sizes must be non-empty and each >= 200.")
+        counts = (
+            self.iterations,
+            self.pipeline_iterations,
+            self.classify_batch_size,
+            self.parse_batch_size,
+        )
+        if min(counts) < 1:
+            raise BenchmarkConfigError(
+                "iterations, pipeline_iterations, classify_batch_size and parse_batch_size "
+                "must be >= 1."
+            )
+        if not self.providers:
+            raise BenchmarkConfigError("At least one embedding provider is required.")
+        unknown = set(self.runtimes) - set(BENCHMARK_RUNTIMES)
+        if unknown:
+            raise BenchmarkConfigError(
+                f"runtimes must be drawn from {', '.join(BENCHMARK_RUNTIMES)}."
+            )
+        if self.top_k < 1:
+            raise BenchmarkConfigError("top_k must be >= 1.")
+        if self.replay_latency_scale < 0 or self.stub_latency_seconds < 0:
+            raise BenchmarkConfigError("Latency settings must be >= 0.")
+
+
+@dataclass(frozen=True)
+class Regression:
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, positive meaning worse."""
+
+        if self.baseline == 0:
+            return float("inf")
+        delta = (self.current - self.baseline) / self.baseline
+        return -delta if self.metric == "throughput_per_second" else delta
+
+    def describe(self) -> str:
+        return (
+            f"{self.benchmark} {self.metric}: {self.baseline:.6g} -> {self.current:.6g} "
+            f"({self.change:+.1%} worse)"
+        )
+
+
+def _timed(
+    func: Callable[[Any], Any], items: Sequence[Any]
+) -> tuple[dict[str, float], list[Any]]:
+    latencies = []
+    outputs = []
+    started = time.perf_counter()
+    for item in items:
+        call_started = time.perf_counter()
+        outputs.append(func(item))
+        latencies.append(time.perf_counter() - call_started)
+    return summarize_latencies(latencies, time.perf_counter() - started), outputs
+
+
+@contextmanager
+def _env(values: Mapping[str, str]) -> Iterator[None]:
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _build_index(
+    config: BenchmarkSuiteConfig, provider: str, documents: Sequence[Any]
+) -> tuple[ChromaRetriever, dict[str, float]]:
+    retrieval_config = build_retrieval_config(
+        overrides={
+            "embedding_provider": provider,
+            "persist_directory": str(Path(config.work_dir) / "chroma"),
+            "collection_name": f"bench_{provider}_{config.corpus_size}",
+        }
+    )
+    retriever = ChromaRetriever(retrieval_config)
+    retriever.reset_collection()
+    batch = retrieval_config.upsert_batch_size
+    chunks = [documents[start:start + batch] for start in range(0, len(documents), batch)]
+    summary, _ = _timed(retriever.upsert_documents, chunks)
+    summary["documents"] = float(len(documents))
+    summary["throughput_per_second"] = len(documents) / summary["wall_seconds"]
+    return retriever, summary
+
+
+def _pipeline_benchmark(
+    pipeline: AppealPipeline, letters: Sequence[str], top_k: int
+) -> tuple[dict[str, Any], list[Any]]:
+    summary, packets = _timed(lambda text: pipeline.run(denial_text=text, top_k=top_k), letters)
+    fallbacks = sum(1 for packet in packets if packet.generated_output.get("fallback_reason"))
+    summary["fallbacks"] = float(fallbacks)
+    return summary, packets
+
+
+def _record_stub_cassette(
+    config: BenchmarkSuiteConfig, pipeline: AppealPipeline, letters: Sequence[str], path: Path
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    stub_config = StubLLMServerConfig(latency_seconds=config.stub_latency_seconds)
+    with StubLLMServer(stub_config) as server, _env(
+        {
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "benchmark-stub",
+            "OPENAI_BASE_URL": server.base_url,
+            "MODEL_C_CASSETTE": str(path),
+            "MODEL_C_CASSETTE_MODE": "record",
+        }
+    ):
+        for text in letters:
+            pipeline.run(denial_text=text, top_k=config.top_k)
+
+
+def run_benchmark_suite(config: BenchmarkSuiteConfig | None = None) -> dict[str, Any]:
+    """Run every benchmark and return the results document."""
+
+    config = config or BenchmarkSuiteConfig()
+    config.validate()
+    work_dir = Path(config.work_dir)
+    benchmarks: dict[str, dict[str, Any]] = {}
+    skipped: dict[str, str] = {}
+
+    for size in config.denial_sizes:
+        letters = [
+            denial.text
+            for denial in synthetic_denial_letters(config.iterations, size, seed=config.seed)
+        ]
+        benchmarks[f"parse_denial_text[{size}c]"], parsed = _timed(parse_denial_text, letters)
+        # Whole letters: the classifier's worst case is a long unstructured text.
+        benchmarks[f"classify_denial_reason[{size}c]"], _ = _timed(
+            classify_denial_reason, letters
+        )
+
+    smallest = [
+        denial.text
+        for denial in synthetic_denial_letters(
+            config.iterations, min(config.denial_sizes), seed=config.seed
+        )
+    ]
+    letter_batch = [smallest[index % len(smallest)] for index in range(config.parse_batch_size)]
+    name = f"parse_many[{config.parse_batch_size}x{min(config.denial_sizes)}c]"
+    benchmarks[name], _ = _timed(parse_many, [letter_batch])
+    benchmarks[name]["throughput_per_second"] = (
+        len(letter_batch) / benchmarks[name]["wall_seconds"]
+    )
+
+    reasons = [item.denial_reason_text for item in parsed]
+    batch = [reasons[index % len(reasons)] for index in range(config.classify_batch_size)]
+    name = f"classify_many[{config.classify_batch_size}]"
+    benchmarks[name], _ = _timed(classify_many, [batch])
+    benchmarks[name]["throughput_per_second"] = len(batch) / benchmarks[name]["wall_seconds"]
+
+    documents = synthetic_dfs_documents(config.corpus_size, seed=config.seed)
+    queries = [
+        f"denial category: {denial.category}\npayer: {denial.payer}\ncodes: {denial.codes[0]}"
+        for denial in synthetic_denial_letters(config.iterations, seed=config.seed + 1)
+    ]
+    pipeline_provider = None
+    for provider in config.providers:
+        try:
+            retriever, benchmarks[f"index_build[{provider}]"] = _build_index(
+                config, provider, documents
+            )
+        except Exception as exc:  # noqa: BLE001 - optional providers vary by environment
+            skipped[f"index_build[{provider}]"] = f"{type(exc).__name__}: {exc}"
+            continue
+        benchmarks[f"retriever.query[{provider}]"], _ = _timed(
+            lambda text: retriever.query(text, top_k=config.top_k), queries
+        )
+        pipeline_provider = pipeline_provider or provider
+
+    if pipeline_provider is None:
+        skipped["pipeline"] = "No embedding provider could build an index."
+        return _results_document(config, benchmarks, skipped)
+
+    letters = [
+        denial.text
+        for denial in synthetic_denial_letters(
+            config.pipeline_iterations, config.denial_sizes[0], seed=config.seed + 2
+        )
+    ]
+    retrieval_overrides = {
+        "embedding_provider": pipeline_provider,
+        "persist_directory": str(work_dir / "chroma"),
+        "collection_name": f"bench_{pipeline_provider}_{config.corpus_size}",
+    }
+    for runtime in config.runtimes:
+        name = f"pipeline.run[{runtime},{pipeline_provider}]"
+        pipeline = AppealPipeline(
+            config=AppealPipelineConfig(
+                output_root=str(work_dir / "exports"),
+                top_k=config.top_k,
+                generation_runtime="template" if runtime == "template" else "aisuite",
+                coalesce_requests=False,
+            ),
+            retrieval_overrides=retrieval_overrides,
+        )
+        if runtime == "template":
+            benchmarks[name], packets = _pipeline_benchmark(pipeline, letters, config.top_k)
+            export_root = work_dir / "exports"
+            shutil.rmtree(export_root, ignore_errors=True)
+            benchmarks["export_packet"], _ = _timed(
+                lambda item: pipeline.export_packet(item[1], export_root / f"case_{item[0]:04d}"),
+                list(enumerate(packets)),
+            )
+            continue
+
+        cassette = Path(config.cassette_path or work_dir / "model_c_stub_cassette.jsonl")
+        if config.cassette_path is None:
+            _record_stub_cassette(config, pipeline, letters, cassette)
+        elif not cassette.exists():
+            skipped[name] = f"Cassette not found: {cassette}"
+            continue
+        with _env(
+            {
+                "MODEL_C_CASSETTE": str(cassette),
+                "MODEL_C_CASSETTE_MODE": "replay",
+                "MODEL_C_CASSETTE_LATENCY_SCALE": str(config.replay_latency_scale),
+            }
+        ):
+            benchmarks[name], _ = _pipeline_benchmark(pipeline, letters, config.top_k)
+
+    return _results_document(config, benchmarks, skipped)
+
+
+def _results_document(
+    config: BenchmarkSuiteConfig,
+    benchmarks: dict[str, dict[str, Any]],
+    skipped: dict[str, str],
+) -> dict[str, Any]:
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": asdict(config),
+        "benchmarks": benchmarks,
+        "skipped": skipped,
+    }
+
+
+def write_results(results: Mapping[str, Any], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    results = json.loads(path.read_text())
+    if results.get("schema_version") != RESULTS_SCHEMA_VERSION:
+        raise BenchmarkConfigError(
+            f"{path} has schema_version {results.get('schema_version')!r}; "
+            f"expected {RESULTS_SCHEMA_VERSION}."
+        )
+    return results
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    threshold: float = 0.2,
+    metrics: Sequence[str] = DEFAULT_COMPARE_METRICS,
+    min_delta_seconds: float = 1e-4,
+) -> list[Regression]:
+    """Metrics at least `threshold` (relative) worse than baseline.
+
+    Latency changes smaller than `min_delta_seconds` are ignored, so
+    microsecond-scale benchmarks do not trip the gate on timer noise. Benchmarks
+    missing from either side are not compared.
+    """
+
+    regressions = []
+    current_benchmarks = current.get("benchmarks", {})
+    for name, base_summary in sorted(baseline.get("benchmarks", {}).items()):
+        summary = current_benchmarks.get(name)
+        if summary is None:
+            continue
+        for metric in metrics:
+            if metric not in base_summary or metric not in summary:
+                continue
+            regression = Regression(
+                name, metric, float(base_summary[metric]), float(summary[metric])
+            )
+            if metric in LATENCY_METRICS and (
+                regression.current - regression.baseline < min_delta_seconds
+            ):
+                continue
+            if regression.change > threshold:
+                regressions.append(regression)
+    return regressions
@@ -44,3 +44,5 @@ class AppealPacket:
     classification: DenialClassification
     evidence_items: Sequence[EvidenceItem]
     generated_output: Mapping[str, Any]
+    # Per-stage seconds and sizes (see `workflow.instrumentation.Trace.as_dict`).
+    timings: dict[str, Any] = field(default_factory=dict)
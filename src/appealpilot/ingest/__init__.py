@@ -1,5 +1,25 @@
 """Ingestion and parsing utilities."""
 
-from .denial_parser import parse_denial_text
+from .denial_parser import (
+    DenialParser,
+    DenialParserConfig,
+    DenialParserConfigError,
+    PayerEntry,
+    build_denial_parser_config,
+    parse_denial_text,
+    parse_many,
+)
+from .denial_stream import DenialStreamParser, parse_denial_file, parse_denial_stream
 
-__all__ = ["parse_denial_text"]
+__all__ = [
+    "DenialParser",
+    "DenialParserConfig",
+    "DenialParserConfigError",
+    "DenialStreamParser",
+    "PayerEntry",
+    "build_denial_parser_config",
+    "parse_denial_file",
+    "parse_denial_stream",
+    "parse_denial_text",
+    "parse_many",
+]
@@ -0,0 +1,185 @@
+"""Bounded-memory denial parsing over chunks of a very large document.
+
+`DenialStreamParser` keeps a sliding buffer of at most about
+`2 * overlap + chunk` characters. It runs the same patterns as
+`DenialParser`. A match is accepted only when it starts at least `overlap`
+characters before the buffer end, so matches that span a chunk boundary are
+seen whole on the next pass. With `stop_early=False` the result equals
+`parse_denial_text` on the full text, except:
+
+- `raw_text` is the first `head_chars` characters.
+- Fields longer than `overlap`, such as a denial reason line with no line
+  break, are cut at about `overlap` characters.
+
+With `stop_early=True` (the default), reading stops once a payer, a denial
+reason and at least one deadline hint have been found. Codes and deadlines
+then cover only the text read so far. The payer is the best-ranked one seen
+so far, not necessarily the one a full parse would pick.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+from appealpilot.domain import ParsedDenial
+
+from .denial_parser import (
+    DENIAL_REASON_PATTERN,
+    _SWEEP_PATTERN,
+    DenialParser,
+    DenialParserConfigError,
+    _collect,
+    default_denial_parser,
+)
+
+DEFAULT_OVERLAP_CHARS = 4_096
+DEFAULT_HEAD_CHARS = 4_000
+DEFAULT_CHUNK_CHARS = 1 << 16
+
+
+class DenialStreamParser:
+    """Incremental `parse_denial_text`: `feed` chunks, then `close` for the result."""
+
+    def __init__(
+        self,
+        parser: DenialParser | None = None,
+        overlap: int = DEFAULT_OVERLAP_CHARS,
+        head_chars: int = DEFAULT_HEAD_CHARS,
+        stop_early: bool = True,
+    ):
+        self.parser = parser or default_denial_parser()
+        if overlap < max(64, self.parser.payers.longest):
+            raise DenialParserConfigError(
+                "overlap must be >= 64 characters and >= the longest payer name or alias."
+            )
+        self.overlap = overlap
+        self.head_chars = head_chars
+        self.stop_early = stop_early
+        self.chars_read = 0
+        self.stopped_early = False
+        self._buffer = ""
+        self._head = ""
+        self._started = False
+        self._sweep_pos = 0
+        self._reason_pos = 0
+        self._reason: str | None = None
+        self._payer_index: int | None = None
+        self._codes: set[str] = set()
+        self._deadlines: dict[str, None] = {}
+
+    def feed(self, chunk: str) -> bool:
+        """Consume one chunk; returns True once nothing more needs to be read."""
+
+        if self.stopped_early:
+            return True
+        self.chars_read += len(chunk)
+        if not self._started:
+            chunk_head = chunk.lstrip()
+            self._started = bool(chunk_head)
+        else:
+            chunk_head = chunk
+        if len(self._head) < self.head_chars:
+            self._head += chunk_head[: self.head_chars - len(self._head)]
+
+        self._buffer += chunk
+        # Scan once at least `overlap` new characters are past the carried-over tail.
+        if len(self._buffer) >= 2 * self.overlap + 1:
+            self._scan(final=False)
+            if self.stop_early and self._complete():
+                self.stopped_early = True
+        return self.stopped_early
+
+    def close(self) -> ParsedDenial:
+        """Finish parsing and return the fields found."""
+
+        if not self.stopped_early:
+            self._scan(final=True)
+        head = self._head
+        if not self.stopped_early and self.chars_read and len(head) < self.head_chars:
+            head = head.rstrip()
+        payer = None if self._payer_index is None else self.parser.payers.names[self._payer_index]
+        return ParsedDenial(
+            raw_text=head,
+            payer=payer,
+            cpt_hcpcs_codes=tuple(sorted(self._codes)),
+            denial_reason_text=self._reason if self._reason is not None else head[:400],
+            deadline_hints=tuple(self._deadlines),
+        )
+
+    def _complete(self) -> bool:
+        return (
+            self._payer_index is not None and self._reason is not None and bool(self._deadlines)
+        )
+
+    def _scan(self, final: bool) -> None:
+        buffer = self._buffer
+        limit = len(buffer) if final else len(buffer) - self.overlap
+
+        if self._payer_index != 0:
+            found = self.parser.payers.first_index(buffer.lower(), stop=self._payer_index)
+            if found is not None:
+                self._payer_index = found
+
+        position = self._sweep_pos
+        for match in _SWEEP_PATTERN.finditer(buffer, position):
+            if not final and match.start() >= limit:
+                break
+            _collect(buffer, match, self._codes, self._deadlines)
+            position = match.end()
+        self._sweep_pos = position if final else max(position, limit)
+
+        if self._reason is None:
+            match = DENIAL_REASON_PATTERN.search(buffer, self._reason_pos)
+            if match and (final or match.start() < limit):
+                self._reason = match.group(1).strip()
+            else:
+                self._reason_pos = max(self._reason_pos, limit)
+
+        # Keep one character before the resume point as context for `\b`.
+        resume = self._sweep_pos if self._reason is not None else min(
+            self._sweep_pos, self._reason_pos
+        )
+        keep = max(0, resume - 1)
+        self._buffer = buffer[keep:]
+        self._sweep_pos -= keep
+        self._reason_pos = max(0, self._reason_pos - keep)
+
+
+def parse_denial_stream(
+    chunks: Iterable[str],
+    parser: DenialParser | None = None,
+    overlap: int = DEFAULT_OVERLAP_CHARS,
+    stop_early: bool = True,
+) -> ParsedDenial:
+    """Parse a denial from an iterator of text chunks (stops reading early by default)."""
+
+    stream = DenialStreamParser(parser, overlap=overlap, stop_early=stop_early)
+    for chunk in chunks:
+        if stream.feed(chunk):
+            break
+    return stream.close()
+
+
+def iter_text_chunks(
+    path: Path, chunk_chars: int = DEFAULT_CHUNK_CHARS, encoding: str = "utf-8"
+) -> Iterable[str]:
+    """Read a text file in chunks, with the same newline handling as `Path.read_text`."""
+
+    with path.open(encoding=encoding) as handle:
+        while chunk := handle.read(chunk_chars):
+            yield chunk
+
+
+def parse_denial_file(
+    path: Path,
+    parser: DenialParser | None = None,
+    overlap: int = DEFAULT_OVERLAP_CHARS,
+    stop_early: bool = True,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+) -> ParsedDenial:
+    """Parse a denial document from disk without loading it whole."""
+
+    return parse_denial_stream(
+        iter_text_chunks(path, chunk_chars), parser, overlap=overlap, stop_early=stop_early
+    )
@@ -0,0 +1,274 @@
+"""Process metrics with Prometheus text exposition.
+
+Counters and histograms are kept in per-thread shards, so recording is a dict
+update on the caller's own shard with no lock. A scrape sums the shards plus
+any registered collectors (callbacks reading existing stats, e.g. cache hit
+counters).
+
+With several processes (uvicorn `--workers`, job worker processes), set
+`APPEALPILOT_METRICS_DIR` to a shared directory. Each process then writes its
+snapshot to `metrics-<pid>.json` at most once per `FLUSH_INTERVAL_SECONDS`, and
+a scrape of any process sums every snapshot in the directory. Clear the
+directory when the deployment restarts, because files from dead processes keep
+counting.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+METRICS_DIR_ENV = "APPEALPILOT_METRICS_DIR"
+FLUSH_INTERVAL_SECONDS = 1.0
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+# name -> (type, help, histogram buckets)
+METRICS: dict[str, tuple[str, str, tuple[float, ...] | None]] = {
+    "appealpilot_http_requests_total": (
+        "counter", "HTTP requests by route, method and status.", None
+    ),
+    "appealpilot_http_request_duration_seconds": (
+        "histogram", "HTTP request latency by route.", LATENCY_BUCKETS
+    ),
+    "appealpilot_pipeline_stage_seconds": (
+        "histogram", "Appeal pipeline stage latency.", LATENCY_BUCKETS
+    ),
+    "appealpilot_llm_tokens_total": (
+        "counter", "Model C tokens by provider, model and kind.", None
+    ),
+    "appealpilot_generations_total": (
+        "counter", "Generated packets by outcome (aisuite, template, fallback).", None
+    ),
+    "appealpilot_embedding_batch_size": (
+        "histogram", "Texts per embedding call by provider and operation.", SIZE_BUCKETS
+    ),
+    "appealpilot_cache_events_total": (
+        "counter", "Cache lookups by cache and result (hit, miss).", None
+    ),
+}
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[str, Mapping[str, Any], float]
+
+_LOCAL = threading.local()
+_SHARDS: list[dict[tuple[str, Labels], Any]] = []
+_SHARDS_LOCK = threading.Lock()
+_COLLECTORS: list[Callable[[], Iterable[Sample]]] = []
+_FLUSH_LOCK = threading.Lock()
+_LAST_FLUSH = 0.0
+
+
+def _labels(labels: Mapping[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _shard() -> dict[tuple[str, Labels], Any]:
+    shard = getattr(_LOCAL, "shard", None)
+    if shard is None:
+        shard = {}
+        with _SHARDS_LOCK:
+            _SHARDS.append(shard)
+        _LOCAL.shard = shard
+    return shard
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    """Add to a counter."""
+
+    shard = _shard()
+    key = (name, _labels(labels))
+    shard[key] = shard.get(key, 0.0) + amount
+    _maybe_flush()
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record one histogram observation."""
+
+    buckets = METRICS[name][2] or LATENCY_BUCKETS
+    shard = _shard()
+    key = (name, _labels(labels))
+    values = shard.get(key)
+    if values is None:
+        # Per-bucket counts (last one is +Inf), then sum and count.
+        values = [0.0] * (len(buckets) + 3)
+        shard[key] = values
+    values[bisect.bisect_left(buckets, value)] += 1
+    values[-2] += value
+    values[-1] += 1
+    _maybe_flush()
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    """Add a callback returning `(name, labels, value)` samples read at scrape time."""
+
+    with _SHARDS_LOCK:
+        if collector not in _COLLECTORS:
+            _COLLECTORS.append(collector)
+
+
+def reset() -> None:
+    """Drop all recorded values (tests)."""
+
+    with _SHARDS_LOCK:
+        for shard in _SHARDS:
+            shard.clear()
+
+
+def _reinit_after_fork() -> None:
+    # Locks may have been held by other threads at fork time, and the parent's
+    # counts already live in the parent's snapshot file.
+    global _SHARDS_LOCK, _FLUSH_LOCK, _LAST_FLUSH
+    _SHARDS_LOCK = threading.Lock()
+    _FLUSH_LOCK = threading.Lock()
+    _LAST_FLUSH = 0.0
+    for shard in _SHARDS:
+        shard.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _key_string(name: str, labels: Labels) -> str:
+    return json.dumps([name, labels])
+
+
+def snapshot() -> dict[str, Any]:
+    """This process's values as `{"counters", "histograms"}` keyed by `[name, labels]` JSON."""
+
+    counters: dict[str, float] = {}
+    histograms: dict[str, list[float]] = {}
+    with _SHARDS_LOCK:
+        shards = [shard.copy() for shard in _SHARDS]
+        collectors = list(_COLLECTORS)
+    for shard in shards:
+        for (name, labels), value in shard.items():
+            key = _key_string(name, labels)
+            if isinstance(value, list):
+                merged = histograms.setdefault(key, [0.0] * len(value))
+                for index, item in enumerate(list(value)):
+                    merged[index] += item
+            else:
+                counters[key] = counters.get(key, 0.0) + value
+    for collector in collectors:
+        for name, labels, value in collector():
+            key = _key_string(name, _labels(labels))
+            counters[key] = counters.get(key, 0.0) + float(value)
+    return {"counters": counters, "histograms": histograms}
+
+
+def metrics_dir() -> Path | None:
+    value = os.getenv(METRICS_DIR_ENV)
+    return Path(value) if value else None
+
+
+def flush(directory: Path | None = None) -> Path | None:
+    """Write this process's snapshot to the shared directory (if configured)."""
+
+    global _LAST_FLUSH
+    directory = directory or metrics_dir()
+    if directory is None:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"metrics-{os.getpid()}.json"
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(snapshot()))
+    os.replace(temporary, path)
+    _LAST_FLUSH = time.monotonic()
+    return path
+
+
+def _maybe_flush() -> None:
+    if time.monotonic() - _LAST_FLUSH < FLUSH_INTERVAL_SECONDS or metrics_dir() is None:
+        return
+    if _FLUSH_LOCK.acquire(blocking=False):
+        try:
+            flush()
+        except OSError:
+            pass
+        finally:
+            _FLUSH_LOCK.release()
+
+
+def _aggregate(snapshots: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    counters: dict[str, float] = {}
+    histograms: dict[str, list[float]] = {}
+    for item in snapshots:
+        for key, value in item.get("counters", {}).items():
+            counters[key] = counters.get(key, 0.0) + value
+        for key, values in item.get("histograms", {}).items():
+            merged = histograms.setdefault(key, [0.0] * len(values))
+            for index, value in enumerate(values):
+                merged[index] += value
+    return {"counters": counters, "histograms": histograms}
+
+
+def collect() -> dict[str, Any]:
+    """Values across all processes sharing the metrics directory (or just this one)."""
+
+    directory = metrics_dir()
+    if directory is None:
+        return snapshot()
+    flush(directory)
+    snapshots = []
+    for path in sorted(directory.glob("metrics-*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return _aggregate(snapshots)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Iterable[str]], extra: tuple[str, str] | None = None) -> str:
+    pairs = [tuple(pair) for pair in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(values: Mapping[str, Any] | None = None) -> str:
+    """Render collected values in the Prometheus text format (version 0.0.4)."""
+
+    values = values or collect()
+    grouped: dict[str, list[tuple[Any, Any]]] = {}
+    for kind in ("counters", "histograms"):
+        for key, value in values.get(kind, {}).items():
+            name, labels = json.loads(key)
+            grouped.setdefault(name, []).append((labels, value))
+
+    lines: list[str] = []
+    for name in sorted(grouped):
+        metric_type, help_text, buckets = METRICS.get(name, ("untyped", name, None))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in sorted(grouped[name], key=lambda item: json.dumps(item[0])):
+            if metric_type != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0.0
+            bounds = [*(buckets or LATENCY_BUCKETS), "+Inf"]
+            for bound, count in zip(bounds, value[:-2]):
+                cumulative += count
+                label = ("le", bound if bound == "+Inf" else _format_value(float(bound)))
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, label)} {_format_value(cumulative)}"
+                )
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_format_value(value[-1])}")
+    return "\n".join(lines) + "\n"
@@ -4,19 +4,98 @@ from .model_c_aisuite import (
     ModelCConfig,
     ModelCGenerator,
     ModelCResponseError,
+    build_aisuite_client,
     build_model_c_config,
+    expand_slim_output,
     run_model_c_passthrough,
+    shared_aisuite_client,
+    validate_output_contract,
+)
+from .cassette import (
+    CassetteMissError,
+    RecordingClient,
+    ReplayClient,
+    build_cassette_client,
+    cassette_request_key,
+)
+from .json_repair import JsonRepairError, json_repair_stats, repair_json_object
+from .json_stream import JsonSectionStreamer
+from .model_a_classifier import (
+    ModelAConfig,
+    ModelAConfigError,
+    build_model_a_config,
+    classify_denial_reason,
+    classify_many,
+    set_model_a_classifier,
+)
+from .model_a_centroid import CategoryCentroids, build_category_centroids, load_category_centroids
+from .model_a_linear import HashedNgramFeaturizer, LinearModelAClassifier
+from .model_c_batch import (
+    BatchStatus,
+    LocalBatchProvider,
+    ModelCBatchError,
+    OpenAICompatibleBatchProvider,
+)
+from .model_c_router import (
+    ModelCRouter,
+    ModelCRouterConfig,
+    ModelCRoutingError,
+    build_model_c_router_config,
+    default_model_c_router,
+    routing_stats,
+)
+from .response_cache import (
+    ResponseCache,
+    ResponseCacheConfig,
+    build_response_cache_config,
+    default_response_cache,
 )
-from .model_a_classifier import classify_denial_reason
 from .model_c_template import TemplateModelCGenerator, TemplateGenerationConfig
 
 __all__ = [
     "ModelCConfig",
     "ModelCGenerator",
     "ModelCResponseError",
+    "build_aisuite_client",
     "build_model_c_config",
+    "expand_slim_output",
+    "shared_aisuite_client",
     "run_model_c_passthrough",
+    "validate_output_contract",
+    "CassetteMissError",
+    "RecordingClient",
+    "ReplayClient",
+    "build_cassette_client",
+    "cassette_request_key",
+    "JsonRepairError",
+    "json_repair_stats",
+    "repair_json_object",
+    "JsonSectionStreamer",
     "classify_denial_reason",
+    "classify_many",
+    "ModelAConfig",
+    "ModelAConfigError",
+    "build_model_a_config",
+    "set_model_a_classifier",
+    "CategoryCentroids",
+    "build_category_centroids",
+    "load_category_centroids",
+    "HashedNgramFeaturizer",
+    "LinearModelAClassifier",
+    "BatchStatus",
+    "LocalBatchProvider",
+    "ModelCBatchError",
+    "OpenAICompatibleBatchProvider",
+    "ModelCRouter",
+    "ModelCRouterConfig",
+    "ModelCRoutingError",
+    "build_model_c_router_config",
+    "default_model_c_router",
+    "routing_stats",
+    "ResponseCache",
+    "ResponseCacheConfig",
+    "build_response_cache_config",
+    "default_response_cache",
     "TemplateModelCGenerator",
     "TemplateGenerationConfig",
 ]
@@ -0,0 +1,288 @@
+"""Record/replay cassettes for Model C chat completions.
+
+`RecordingClient` wraps a real aisuite client and appends one JSON line per
+call (request hash, content, usage, latency) to a cassette file.
+`ReplayClient` serves those lines back through the same
+`client.chat.completions.create(...)` surface, optionally sleeping for the
+recorded latency, so `ModelCGenerator(client=...)` and the pipeline run the
+real parsing, repair and fallback paths offline and reproducibly.
+
+Request hashes ignore per-request volatile fields (e.g. `generated_at_utc`),
+so a replayed pipeline run matches the recording of the same case.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator, Mapping
+
+from .model_c_aisuite import VOLATILE_CASE_FIELDS, ModelCResponseError
+
+CASSETTE_MODES = ("replay", "record")
+
+
+class CassetteMissError(ModelCResponseError):
+    """Raised on replay when the cassette has no recording for a request."""
+
+
+def _normalized_content(content: Any) -> Any:
+    if not isinstance(content, str):
+        return content
+    try:
+        loaded = json.loads(content)
+    except json.JSONDecodeError:
+        return content
+    if isinstance(loaded, dict):
+        return {key: value for key, value in loaded.items() if key not in VOLATILE_CASE_FIELDS}
+    return loaded
+
+
+def cassette_request_key(request: Mapping[str, Any]) -> str:
+    """Hash model, messages and generation params; streaming does not change the key."""
+
+    canonical = {
+        "params": {
+            key: value for key, value in request.items() if key not in {"messages", "stream"}
+        },
+        "messages": [
+            {"role": message.get("role"), "content": _normalized_content(message.get("content"))}
+            for message in request.get("messages") or []
+        ],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _usage_dict(usage: Any) -> dict[str, Any]:
+    if usage is None:
+        return {}
+    if isinstance(usage, Mapping):
+        return dict(usage)
+    fields = ("prompt_tokens", "completion_tokens", "total_tokens")
+    recorded = {name: getattr(usage, name, None) for name in fields}
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is not None:
+        recorded["prompt_tokens_details"] = {"cached_tokens": cached}
+    return recorded
+
+
+def _usage_namespace(usage: Mapping[str, Any]) -> SimpleNamespace | None:
+    if not usage:
+        return None
+    values = dict(usage)
+    details = values.pop("prompt_tokens_details", None)
+    if isinstance(details, Mapping):
+        values["prompt_tokens_details"] = SimpleNamespace(**details)
+    return SimpleNamespace(**values)
+
+
+def _message_content(response: Any) -> Any:
+    try:
+        return response.choices[0].message.content
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+class _Completions:
+    def __init__(self, create: Any) -> None:
+        self.create = create
+
+
+class RecordingClient:
+    """Pass calls through to `inner` and append each exchange to `path`."""
+
+    def __init__(self, inner: Any, path: Path | str):
+        self.inner = inner
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _append(self, entry: Mapping[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=True, default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+    def _create(self, **kwargs: Any) -> Any:
+        key = cassette_request_key(kwargs)
+        started = time.perf_counter()
+        try:
+            response = self.inner.chat.completions.create(**kwargs)
+        except Exception as exc:
+            self._append(
+                {
+                    "key": key,
+                    "model": kwargs.get("model"),
+                    "error": f"{type(exc).__name__}: {exc}",
+                    "latency_seconds": round(time.perf_counter() - started, 6),
+                }
+            )
+            raise
+        if kwargs.get("stream"):
+            return self._record_stream(key, kwargs.get("model"), response, started)
+        self._append(
+            {
+                "key": key,
+                "model": kwargs.get("model"),
+                "content": _message_content(response),
+                "usage": _usage_dict(getattr(response, "usage", None)),
+                "latency_seconds": round(time.perf_counter() - started, 6),
+            }
+        )
+        return response
+
+    def _record_stream(
+        self, key: str, model: Any, chunks: Any, started: float
+    ) -> Iterator[Any]:
+        parts: list[str] = []
+        usage = None
+        first_token_seconds = None
+        for chunk in chunks:
+            try:
+                text = chunk.choices[0].delta.content
+            except (AttributeError, IndexError, TypeError):
+                text = None
+            if isinstance(text, str) and text:
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - started
+                parts.append(text)
+            usage = getattr(chunk, "usage", None) or usage
+            yield chunk
+        self._append(
+            {
+                "key": key,
+                "model": model,
+                "content": "".join(parts),
+                "usage": _usage_dict(usage),
+                "latency_seconds": round(time.perf_counter() - started, 6),
+                "first_token_seconds": (
+                    round(first_token_seconds, 6) if first_token_seconds is not None else None
+                ),
+            }
+        )
+
+
+class ReplayClient:
+    """Serve recorded responses by request hash.
+
+    Several recordings of the same request are replayed round-robin, which keeps
+    the recorded latency distribution. `latency_scale` multiplies recorded
+    latencies (0 disables sleeping).
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        latency_scale: float = 1.0,
+        stream_chunk_chars: int = 16,
+    ):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Model C cassette not found: {self.path}")
+        self.latency_scale = max(0.0, latency_scale)
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                self._entries.setdefault(entry["key"], []).append(entry)
+        self._cursors = {key: itertools.cycle(entries) for key, entries in self._entries.items()}
+        self._hits = 0
+        self._misses = 0
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"recordings": len(self), "hits": self._hits, "misses": self._misses}
+
+    def _next_entry(self, key: str) -> dict[str, Any]:
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None:
+                self._misses += 1
+                raise CassetteMissError(
+                    f"No cassette recording for request {key[:12]} in {self.path}."
+                )
+            self._hits += 1
+            return next(cursor)
+
+    def _sleep(self, seconds: Any) -> None:
+        if self.latency_scale and seconds:
+            time.sleep(float(seconds) * self.latency_scale)
+
+    def _create(self, **kwargs: Any) -> Any:
+        entry = self._next_entry(cassette_request_key(kwargs))
+        if kwargs.get("stream"):
+            return self._replay_stream(entry)
+        self._sleep(entry.get("latency_seconds"))
+        if entry.get("error"):
+            raise ModelCResponseError(f"Recorded provider error: {entry['error']}")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=entry.get("content")))],
+            usage=_usage_namespace(entry.get("usage") or {}),
+        )
+
+    def _replay_stream(self, entry: Mapping[str, Any]) -> Iterator[Any]:
+        total = float(entry.get("latency_seconds") or 0.0)
+        first = entry.get("first_token_seconds")
+        first = total if first is None else float(first)
+        self._sleep(first)
+        if entry.get("error"):
+            raise ModelCResponseError(f"Recorded provider error: {entry['error']}")
+        content = str(entry.get("content") or "")
+        pieces = [
+            content[start:start + self.stream_chunk_chars]
+            for start in range(0, len(content), self.stream_chunk_chars)
+        ]
+        gap = (total - first) / len(pieces) if pieces and total > first else 0.0
+        for index, piece in enumerate(pieces):
+            if index:
+                self._sleep(gap)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None
+            )
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=None))],
+            usage=_usage_namespace(entry.get("usage") or {}),
+        )
+
+
+def build_cassette_client(
+    path: Path | str,
+    mode: str = "replay",
+    latency_scale: float = 1.0,
+    inner: Any | None = None,
+) -> Any:
+    """Return a replay client, or a recorder around `inner` (a real client)."""
+
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Cassette mode must be one of {', '.join(CASSETTE_MODES)}.")
+    if mode == "replay":
+        return ReplayClient(path, latency_scale=latency_scale)
+    if inner is None:
+        raise ValueError("Recording a cassette needs the real client to wrap.")
+    return RecordingClient(inner, path)
+
+
+def cassette_settings_from_env() -> tuple[str, str, float] | None:
+    """Read `MODEL_C_CASSETTE` (+ `_MODE`, `_LATENCY_SCALE`); None when unset."""
+
+    path = os.getenv("MODEL_C_CASSETTE")
+    if not path:
+        return None
+    mode = (os.getenv("MODEL_C_CASSETTE_MODE") or "replay").strip().lower()
+    scale = os.getenv("MODEL_C_CASSETTE_LATENCY_SCALE")
+    return path, mode, float(scale) if scale not in (None, "") else 1.0
+
@@ -0,0 +1,196 @@
+"""Tolerant extraction and repair of slightly malformed model JSON.
+
+Handles the failure modes seen from chat models: prose or fences around the
+object, trailing commas, and output truncated at the token limit. Truncated
+output is cut back to the last complete value and its open brackets closed,
+so a partially written element is dropped rather than invented.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JsonRepairError(ValueError):
+    """Raised when text cannot be repaired into a JSON object."""
+
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"attempts": 0, "repaired": 0, "failed": 0}
+
+
+def record_repair_outcome(repaired: bool) -> None:
+    """Count one repair attempt (callers also count contract failures)."""
+
+    with _STATS_LOCK:
+        _STATS["attempts"] += 1
+        _STATS["repaired" if repaired else "failed"] += 1
+
+
+def json_repair_stats() -> dict[str, Any]:
+    """Return process-wide repair counters and the success rate."""
+
+    with _STATS_LOCK:
+        stats: dict[str, Any] = dict(_STATS)
+    stats["success_rate"] = stats["repaired"] / stats["attempts"] if stats["attempts"] else None
+    return stats
+
+
+def _extract_object(text: str) -> str | None:
+    """Return the outermost `{...}` span (to the end of text if it never closes)."""
+
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escape = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return text[start:]
+
+
+def _remove_trailing_commas(text: str) -> str:
+    out: list[str] = []
+    in_string = False
+    escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            out.append(char)
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "}]":
+            # Drop a comma separated from this closer only by whitespace.
+            back = len(out) - 1
+            while back >= 0 and out[back].isspace():
+                back -= 1
+            if back >= 0 and out[back] == ",":
+                del out[back]
+        out.append(char)
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str | None:
+    """Cut back to the last complete value and close the brackets left open.
+
+    An array element object that was still being written is dropped whole.
+    """
+
+    stack: list[tuple[str, int]] = []
+    in_string = False
+    escape = False
+    # (cut index, brackets open at that point)
+    safe_cuts: list[tuple[int, tuple[str, ...]]] = []
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append((char, index))
+            if len(stack) > 1:
+                # An empty nested container beats dropping its key entirely.
+                safe_cuts.append((index + 1, tuple(bracket for bracket, _ in stack)))
+        elif char in "}]":
+            if not stack:
+                return None
+            stack.pop()
+            if not stack:
+                return text[:index + 1]
+            safe_cuts.append((index + 1, tuple(bracket for bracket, _ in stack)))
+        elif char == "," and stack:
+            safe_cuts.append((index, tuple(bracket for bracket, _ in stack)))
+    if not stack:
+        return text
+
+    limit = len(text)
+    for depth in range(1, len(stack)):
+        if stack[depth - 1][0] == "[" and stack[depth][0] == "{":
+            limit = stack[depth][1]
+            break
+    for cut, open_brackets in reversed(safe_cuts):
+        if cut <= limit:
+            return text[:cut] + "".join(
+                _CLOSERS[bracket] for bracket in reversed(open_brackets)
+            )
+    return None
+
+
+def repair_json_object(text: str) -> tuple[dict[str, Any], list[str]]:
+    """Parse `text` as a JSON object, applying repairs only as needed.
+
+    Returns the object and the names of the repairs applied (empty when the
+    text was already valid). Raises `JsonRepairError` when nothing works.
+    """
+
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return parsed, []
+
+    repairs: list[str] = []
+    candidate = _extract_object(text)
+    if candidate is None:
+        raise JsonRepairError("No JSON object found in model output.")
+    if candidate != text.strip():
+        repairs.append("extracted_object")
+
+    steps = (
+        ("trailing_commas", _remove_trailing_commas),
+        ("closed_truncation", _close_truncated),
+    )
+    for name, step in steps:
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(parsed, dict):
+                return parsed, repairs
+            raise JsonRepairError("Model output JSON is not an object.")
+        fixed = step(candidate)
+        if fixed is not None and fixed != candidate:
+            candidate = fixed
+            repairs.append(name)
+
+    try:
+        parsed = json.loads(candidate)
+    except json.JSONDecodeError as exc:
+        raise JsonRepairError(f"Model output JSON could not be repaired: {exc.msg}.") from exc
+    if not isinstance(parsed, dict):
+        raise JsonRepairError("Model output JSON is not an object.")
+    return parsed, repairs
@@ -0,0 +1,169 @@
+"""Incremental parser that surfaces top-level JSON object sections as text streams in."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator
+
+# Parser states for the top-level object.
+_BEFORE_OBJECT = "before_object"
+_EXPECT_KEY = "expect_key"
+_IN_KEY = "in_key"
+_EXPECT_COLON = "expect_colon"
+_EXPECT_VALUE = "expect_value"
+_IN_VALUE = "in_value"
+_AFTER_VALUE = "after_value"
+_DONE = "done"
+
+
+class JsonSectionStreamer:
+    """Feed raw model text; get `delta` and `section` events per top-level key.
+
+    String sections also emit decoded `delta` events while they are still being
+    written, so a UI can render the cover letter before it is complete. Any text
+    before the opening brace (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._state = _BEFORE_OBJECT
+        self._key_chars: list[str] = []
+        self._key = ""
+        self._value_chars: list[str] = []
+        self._value_is_string = False
+        self._emitted_upto = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode_remaining = 0
+        self.sections: dict[str, Any] = {}
+
+    @property
+    def complete(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        events: list[dict[str, Any]] = []
+        for char in text:
+            self._consume(char, events)
+        self._flush_delta(events)
+        return events
+
+    def _consume(self, char: str, events: list[dict[str, Any]]) -> None:
+        state = self._state
+        if state == _DONE:
+            return
+        if state == _BEFORE_OBJECT:
+            if char == "{":
+                self._state = _EXPECT_KEY
+            return
+        if state == _EXPECT_KEY:
+            if char == '"':
+                self._key_chars = []
+                self._state = _IN_KEY
+            elif char == "}":
+                self._state = _DONE
+            return
+        if state == _IN_KEY:
+            if self._escape:
+                self._escape = False
+                self._key_chars.append(char)
+            elif char == "\\":
+                self._escape = True
+                self._key_chars.append(char)
+            elif char == '"':
+                self._key = json.loads('"' + "".join(self._key_chars) + '"')
+                self._state = _EXPECT_COLON
+            else:
+                self._key_chars.append(char)
+            return
+        if state == _EXPECT_COLON:
+            if char == ":":
+                self._state = _EXPECT_VALUE
+            return
+        if state == _EXPECT_VALUE:
+            if char.isspace():
+                return
+            self._value_chars = [char]
+            self._value_is_string = char == '"'
+            self._in_string = self._value_is_string
+            self._depth = 1 if char in "{[" else 0
+            self._emitted_upto = 1
+            self._escape = False
+            self._unicode_remaining = 0
+            self._state = _IN_VALUE
+            return
+        if state == _IN_VALUE:
+            self._consume_value(char, events)
+            return
+        if state == _AFTER_VALUE:
+            if char == ",":
+                self._state = _EXPECT_KEY
+            elif char == "}":
+                self._state = _DONE
+
+    def _consume_value(self, char: str, events: list[dict[str, Any]]) -> None:
+        if self._in_string:
+            self._value_chars.append(char)
+            if self._unicode_remaining:
+                self._unicode_remaining -= 1
+            elif self._escape:
+                self._escape = False
+                if char == "u":
+                    self._unicode_remaining = 4
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._value_is_string:
+                    self._flush_delta(events, closing=True)
+                    self._finish_value(events)
+            return
+
+        if self._depth == 0 and (char in ",}" or char.isspace()):
+            # Scalar (number/true/false/null) values end at a delimiter.
+            self._finish_value(events)
+            self._consume(char, events)
+            return
+
+        self._value_chars.append(char)
+        if char == '"':
+            self._in_string = True
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._finish_value(events)
+
+    def _flush_delta(self, events: list[dict[str, Any]], closing: bool = False) -> None:
+        if self._state != _IN_VALUE or not self._value_is_string:
+            return
+        end = len(self._value_chars) - (1 if closing else 0)
+        if not closing and (self._escape or self._unicode_remaining):
+            # Hold back an incomplete escape sequence until the next chunk.
+            end = self._last_safe_offset()
+        if end <= self._emitted_upto:
+            return
+        raw = "".join(self._value_chars[self._emitted_upto:end])
+        events.append({"event": "delta", "section": self._key, "text": json.loads(f'"{raw}"')})
+        self._emitted_upto = end
+
+    def _last_safe_offset(self) -> int:
+        offset = len(self._value_chars)
+        while offset > self._emitted_upto and self._value_chars[offset - 1] != "\\":
+            offset -= 1
+        return max(self._emitted_upto, offset - 1)
+
+    def _finish_value(self, events: list[dict[str, Any]]) -> None:
+        value = json.loads("".join(self._value_chars))
+        self.sections[self._key] = value
+        events.append({"event": "section", "section": self._key, "value": value})
+        self._state = _AFTER_VALUE
+
+
+def iter_section_events(chunks: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield section events for an iterable of raw text chunks."""
+
+    streamer = JsonSectionStreamer()
+    for chunk in chunks:
+        yield from streamer.feed(chunk)
@@ -0,0 +1,171 @@
+"""Model A fallback on the retrieval query embedding (nearest category centroid).
+
+`rebuild_retrieval_index` averages the stored DFS embeddings per category.
+Labels come from coverage type, as in `model_a_linear.dfs_coverage_category`.
+The centroids are written next to the Chroma collection. The pipeline runs
+the keyword (or linear) classifier first. Only when it returns `other` does
+the pipeline embed the retrieval query and pick the nearest centroid. That
+vector is passed on to Chroma, so the fallback adds one dot product per
+category and no extra model pass.
+
+Centroids are only used with the embedding provider and model they were
+built with.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from appealpilot.domain import DenialClassification
+
+from .model_a_classifier import ModelAConfigError
+from .model_a_linear import _numpy, dfs_coverage_category
+
+CENTROIDS_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CategoryCentroids:
+    """L2-normalized mean embedding per category, with the embedding signature."""
+
+    signature: Mapping[str, Any]
+    categories: tuple[str, ...]
+    vectors: Any  # (categories, dimensions) float32
+    counts: tuple[int, ...]
+
+    def classify_many(
+        self, embeddings: Sequence[Sequence[float]], min_similarity: float = 0.0
+    ) -> list[DenialClassification | None]:
+        """Nearest centroid per embedding; None when the best cosine is below the floor."""
+
+        np = _numpy()
+        if not len(embeddings):
+            return []
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        similarities = (matrix / np.where(norms == 0, 1.0, norms)) @ self.vectors.T
+        best = similarities.argmax(axis=1)
+        results: list[DenialClassification | None] = []
+        for index, row in zip(best.tolist(), similarities.tolist()):
+            similarity = row[index]
+            if similarity < min_similarity:
+                results.append(None)
+                continue
+            results.append(
+                DenialClassification(
+                    category=self.categories[index],
+                    confidence=round(max(0.0, min(1.0, similarity)), 4),
+                )
+            )
+        return results
+
+    def classify(
+        self, embedding: Sequence[float], min_similarity: float = 0.0
+    ) -> DenialClassification | None:
+        return self.classify_many([embedding], min_similarity)[0]
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": CENTROIDS_VERSION,
+            "signature": dict(self.signature),
+            "categories": list(self.categories),
+            "counts": list(self.counts),
+            "vectors": [[round(value, 6) for value in row] for row in self.vectors.tolist()],
+        }
+        path.write_text(json.dumps(payload))
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "CategoryCentroids":
+        np = _numpy()
+        payload = json.loads(path.read_text())
+        if payload.get("version") != CENTROIDS_VERSION:
+            raise ModelAConfigError(f"Unsupported category centroid version in {path}.")
+        return cls(
+            signature=payload["signature"],
+            categories=tuple(payload["categories"]),
+            vectors=np.asarray(payload["vectors"], dtype=np.float32),
+            counts=tuple(int(count) for count in payload["counts"]),
+        )
+
+
+def category_centroids_path(persist_directory: str | Path, collection_name: str) -> Path:
+    return Path(persist_directory) / f"{collection_name}.centroids.json"
+
+
+def build_category_centroids(retriever: Any, page_size: int = 5_000) -> CategoryCentroids | None:
+    """Average the collection's stored embeddings per DFS category (no re-embedding).
+
+    Returns None unless at least two categories have labeled records.
+    """
+
+    np = _numpy()
+    sums: dict[str, Any] = {}
+    counts: dict[str, int] = {}
+    offset = 0
+    while True:
+        page = retriever.collection.get(
+            include=["embeddings", "metadatas"], limit=page_size, offset=offset
+        )
+        ids = page.get("ids") or []
+        if not ids:
+            break
+        embeddings = page.get("embeddings")
+        metadatas = page.get("metadatas") or [{}] * len(ids)
+        for embedding, metadata in zip(embeddings, metadatas):
+            category = dfs_coverage_category(metadata or {})
+            if category is None:
+                continue
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            if norm == 0:
+                continue
+            sums[category] = sums.get(category, 0) + vector / norm
+            counts[category] = counts.get(category, 0) + 1
+        offset += len(ids)
+        if len(ids) < page_size:
+            break
+
+    if len(sums) < 2:
+        return None
+    categories = tuple(sorted(sums))
+    vectors = np.stack([sums[category] for category in categories])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return CategoryCentroids(
+        signature=dict(retriever.embedding_signature),
+        categories=categories,
+        vectors=vectors.astype(np.float32),
+        counts=tuple(counts[category] for category in categories),
+    )
+
+
+_LOADED_LOCK = threading.Lock()
+_LOADED: dict[str, tuple[int, CategoryCentroids]] = {}
+
+
+def load_category_centroids(
+    path: Path, signature: Mapping[str, Any]
+) -> CategoryCentroids | None:
+    """Centroids at `path` if they exist and match `signature`, else None.
+
+    Loaded files are cached until their mtime changes, so building a pipeline
+    per request does not re-read them.
+    """
+
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    key = str(path)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, CategoryCentroids.load(path))
+            _LOADED[key] = cached
+    centroids = cached[1]
+    return centroids if dict(centroids.signature) == dict(signature) else None
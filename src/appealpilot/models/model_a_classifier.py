@@ -1,13 +1,27 @@
-"""Model A denial reason classifier (lightweight keyword baseline)."""
+"""Model A denial reason classifier.
+
+The keyword baseline is the default. Setting `model_a.backend: linear` (or
+`APPEALPILOT_MODEL_A_BACKEND=linear`) switches `classify_denial_reason` and
+`classify_many` to the trained hashed n-gram model in `model_a_linear.py`. Its
+artifact is loaded on first use. When this classifier returns `other`, the
+pipeline can fall back to the nearest embedding centroid
+(`model_a_centroid.py`, `model_a.embedding_fallback`).
+"""
 
 from __future__ import annotations
 
+import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import Mapping
+from pathlib import Path
+from typing import Any, Iterable, Mapping
 
 from appealpilot.domain import DenialClassification
 
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
+MODEL_A_BACKENDS = ("keyword", "linear")
+
 TAXONOMY: Mapping[str, tuple[str, ...]] = {
     "medical_necessity": (
         "medical necessity",
@@ -39,31 +53,211 @@ TAXONOMY: Mapping[str, tuple[str, ...]] = {
 }
 
 
-def _score_terms(text: str, terms: tuple[str, ...]) -> tuple[int, tuple[str, ...]]:
-    matched = []
-    for term in terms:
-        if re.search(re.escape(term), text, re.IGNORECASE):
-            matched.append(term)
-    return len(matched), tuple(matched)
+class _CompiledTaxonomy:
+    """All taxonomy terms compiled once, matched in a single scan per text.
+
+    ASCII text is lowercased once and each lowered term is found with str
+    containment (C substring search). That is exactly `re.IGNORECASE` for
+    ASCII terms on ASCII text, and much faster than a regex alternation, which
+    gets no literal-prefix optimization under IGNORECASE. Any other text goes
+    through one precompiled alternation inside a lookahead, so overlapping
+    terms are all found. Terms that are case-insensitive prefixes of a longer
+    term found at the same position are credited too.
+    """
+
+    def __init__(self, taxonomy: Mapping[str, tuple[str, ...]]):
+        self.categories = tuple((category, tuple(terms)) for category, terms in taxonomy.items())
+        self.terms = tuple(dict.fromkeys(term for _, terms in self.categories for term in terms))
+        self.lowered = tuple(term.lower() for term in self.terms)
+        self.ascii_terms = all(term.isascii() for term in self.terms)
+        # Longest first, so a lookahead at one position reports the longest term.
+        order = sorted(range(len(self.terms)), key=lambda index: -len(self.terms[index]))
+        alternation = "|".join(f"(?P<t{index}>{re.escape(self.terms[index])})" for index in order)
+        self.pattern = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE) if self.terms else None
+        self.implied = {
+            index: tuple(
+                other
+                for other in range(len(self.terms))
+                if other != index
+                and len(self.terms[other]) < len(term)
+                and re.fullmatch(
+                    re.escape(self.terms[other]), term[: len(self.terms[other])], re.IGNORECASE
+                )
+            )
+            for index, term in enumerate(self.terms)
+        }
+
+    def hits(self, text: str) -> set[str]:
+        if self.ascii_terms and text.isascii():
+            lowered = text.lower()
+            return {term for term, low in zip(self.terms, self.lowered) if low in lowered}
+        found: set[int] = set()
+        if self.pattern is not None:
+            for match in self.pattern.finditer(text):
+                index = int(match.lastgroup[1:])
+                found.add(index)
+                found.update(self.implied[index])
+        return {self.terms[index] for index in found}
+
+    def classify(self, text: str) -> DenialClassification:
+        hits = self.hits(text)
+        best_category = "other"
+        best_score = 0
+        best_terms: tuple[str, ...] = ()
+
+        if hits:
+            for category, terms in self.categories:
+                matched = tuple(term for term in terms if term in hits)
+                if len(matched) > best_score:
+                    best_category = category
+                    best_score = len(matched)
+                    best_terms = matched
+
+        confidence = min(1.0, 0.35 + (0.2 * best_score)) if best_score > 0 else 0.3
+        return DenialClassification(
+            category=best_category,
+            confidence=confidence,
+            matched_terms=best_terms,
+        )
+
+
+_COMPILED_TAXONOMY = _CompiledTaxonomy(TAXONOMY)
+
+
+class ModelAConfigError(ValueError):
+    """Raised when Model A configuration or its artifact is invalid."""
+
+
+@dataclass(frozen=True)
+class ModelAConfig:
+    backend: str = "keyword"
+    model_path: str = "data/interim/model_a/linear.npz"
+    embedding_fallback: bool = True
+    centroid_min_similarity: float = 0.2
+
+    def validate(self) -> None:
+        if self.backend not in MODEL_A_BACKENDS:
+            raise ModelAConfigError(
+                f"model_a backend must be one of {', '.join(MODEL_A_BACKENDS)}."
+            )
+        if self.backend == "linear" and not self.model_path:
+            raise ModelAConfigError("model_a model_path is required for the linear backend.")
+        if not -1.0 <= self.centroid_min_similarity <= 1.0:
+            raise ModelAConfigError("model_a centroid_min_similarity must be in [-1, 1].")
+
+
+def _to_bool(value: Any, fallback: bool) -> bool:
+    if value is None or value == "":
+        return fallback
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _load_model_a_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ModelAConfigError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+    section = loaded.get("model_a", {}) or {}
+    if not isinstance(section, dict):
+        raise ModelAConfigError("`model_a` in settings.yaml must be a mapping.")
+    return section
+
+
+def build_model_a_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> ModelAConfig:
+    """Build config from settings.yaml + env vars + explicit overrides."""
+
+    merged = dict(_load_model_a_from_settings(settings_path))
+    env = {
+        "backend": os.getenv("APPEALPILOT_MODEL_A_BACKEND"),
+        "model_path": os.getenv("APPEALPILOT_MODEL_A_PATH"),
+        "embedding_fallback": os.getenv("APPEALPILOT_MODEL_A_EMBEDDING_FALLBACK"),
+    }
+    merged.update({key: value for key, value in env.items() if value not in (None, "")})
+    if overrides:
+        merged.update(overrides)
+
+    config = ModelAConfig(
+        backend=str(merged.get("backend") or "keyword").strip().lower(),
+        model_path=str(merged.get("model_path") or "data/interim/model_a/linear.npz"),
+        embedding_fallback=_to_bool(merged.get("embedding_fallback"), True),
+        centroid_min_similarity=float(merged.get("centroid_min_similarity", 0.2)),
+    )
+    config.validate()
+    return config
+
+
+_ACTIVE_LOCK = threading.Lock()
+_ACTIVE: Any | None = None
+_ACTIVE_RESOLVED = False
+
+
+def set_model_a_classifier(classifier: Any | None) -> None:
+    """Install a classifier with `classify`/`classify_many` (None = keyword baseline)."""
+
+    global _ACTIVE, _ACTIVE_RESOLVED
+    with _ACTIVE_LOCK:
+        _ACTIVE = classifier
+        _ACTIVE_RESOLVED = True
+
+
+def reset_model_a_classifier() -> None:
+    """Forget the installed classifier; the next call re-reads the config."""
+
+    global _ACTIVE, _ACTIVE_RESOLVED
+    with _ACTIVE_LOCK:
+        _ACTIVE = None
+        _ACTIVE_RESOLVED = False
+
+
+def _active_classifier() -> Any | None:
+    global _ACTIVE, _ACTIVE_RESOLVED
+    if _ACTIVE_RESOLVED:
+        return _ACTIVE
+    with _ACTIVE_LOCK:
+        if not _ACTIVE_RESOLVED:
+            config = build_model_a_config()
+            if config.backend == "linear":
+                from .model_a_linear import LinearModelAClassifier
+
+                _ACTIVE = LinearModelAClassifier.load(Path(config.model_path))
+            _ACTIVE_RESOLVED = True
+        return _ACTIVE
+
+
+def classify_with_keywords(denial_text: str) -> DenialClassification:
+    """The keyword baseline, regardless of the configured backend."""
+
+    return _COMPILED_TAXONOMY.classify(denial_text)
 
 
 def classify_denial_reason(denial_text: str) -> DenialClassification:
     """Classify denial reason into a v1 taxonomy."""
 
-    best_category = "other"
-    best_score = 0
-    best_terms: tuple[str, ...] = ()
-
-    for category, terms in TAXONOMY.items():
-        score, matched = _score_terms(denial_text, terms)
-        if score > best_score:
-            best_category = category
-            best_score = score
-            best_terms = matched
-
-    confidence = min(1.0, 0.35 + (0.2 * best_score)) if best_score > 0 else 0.3
-    return DenialClassification(
-        category=best_category,
-        confidence=confidence,
-        matched_terms=best_terms,
-    )
+    classifier = _active_classifier()
+    if classifier is not None:
+        return classifier.classify(denial_text)
+    return _COMPILED_TAXONOMY.classify(denial_text)
+
+
+def classify_many(denial_texts: Iterable[str]) -> list[DenialClassification]:
+    """Classify many denial reasons (same results as `classify_denial_reason` per text)."""
+
+    classifier = _active_classifier()
+    if classifier is not None:
+        return classifier.classify_many(denial_texts)
+    classify = _COMPILED_TAXONOMY.classify
+    return [classify(text) for text in denial_texts]
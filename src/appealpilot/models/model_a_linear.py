@@ -0,0 +1,286 @@
+"""Trainable Model A: hashed word n-grams + a softmax linear model (numpy only).
+
+Texts become sparse rows of hashed unigram/bigram counts. Counts are
+sublinear-scaled (1 + log tf) and L2-normalized, and rows are kept as CSR
+arrays. Scores are one sparse matrix x dense weights product for the whole
+batch, so `classify_many` pays Python overhead only for tokenizing. Training
+is mini-batch SGD on the softmax cross-entropy, with the same sparse
+products.
+
+The artifact is a single compressed `.npz` (float16 weights, bias, classes,
+featurizer settings). It is loaded on first use, see
+`model_a_classifier.build_model_a_config`. `matched_terms` still lists the
+taxonomy keywords found for the predicted category, so explanations look the
+same as with the keyword baseline.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from appealpilot.domain import DenialClassification
+
+from .model_a_classifier import _COMPILED_TAXONOMY, ModelAConfigError
+
+ARTIFACT_VERSION = 1
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Coverage-type wording in DFS records -> Model A category.
+DFS_COVERAGE_CATEGORIES = (
+    ("experimental", "experimental_investigational"),
+    ("investigational", "experimental_investigational"),
+    ("clinical trial", "experimental_investigational"),
+    ("out of network", "out_of_network"),
+    ("out-of-network", "out_of_network"),
+    ("medical necessity", "medical_necessity"),
+)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ModelAConfigError(
+            "numpy is required for the linear Model A. Install with `pip install numpy`."
+        ) from exc
+    return numpy
+
+
+@dataclass(frozen=True)
+class HashedNgramFeaturizer:
+    dimensions: int = 2**16
+    max_ngram: int = 2
+
+    def row(self, text: str) -> tuple[list[int], list[float]]:
+        """Hashed feature indices and L2-normalized sublinear weights for one text."""
+
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        counts: dict[int, int] = {}
+        dimensions = self.dimensions
+        for size in range(1, self.max_ngram + 1):
+            for start in range(len(tokens) - size + 1):
+                gram = " ".join(tokens[start:start + size]) if size > 1 else tokens[start]
+                index = zlib.crc32(gram.encode("utf-8")) % dimensions
+                counts[index] = counts.get(index, 0) + 1
+        values = [1.0 + math.log(count) for count in counts.values()]
+        norm = math.sqrt(sum(value * value for value in values)) or 1.0
+        return list(counts), [value / norm for value in values]
+
+    def transform(self, texts: Sequence[str]) -> tuple[Any, Any, Any]:
+        """CSR arrays `(indptr, indices, data)` for a batch of texts."""
+
+        np = _numpy()
+        indptr = [0]
+        indices: list[int] = []
+        data: list[float] = []
+        for text in texts:
+            row_indices, row_values = self.row(text)
+            indices.extend(row_indices)
+            data.extend(row_values)
+            indptr.append(len(indices))
+        return (
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(data, dtype=np.float32),
+        )
+
+
+def _sparse_dot(indptr: Any, indices: Any, data: Any, weights: Any) -> Any:
+    """CSR matrix x dense (dimensions, classes) matrix -> dense (rows, classes)."""
+
+    np = _numpy()
+    rows = len(indptr) - 1
+    out = np.zeros((rows, weights.shape[1]), dtype=np.float32)
+    if len(indices) == 0:
+        return out
+    contributions = weights[indices] * data[:, None]
+    starts = indptr[:-1]
+    nonempty = starts < indptr[1:]
+    # reduceat sums each row's slice; empty rows would pick up a neighbour's value.
+    out[nonempty] = np.add.reduceat(contributions, starts[nonempty], axis=0)
+    return out
+
+
+def _softmax(scores: Any) -> Any:
+    np = _numpy()
+    shifted = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class LinearModelAClassifier:
+    """Softmax classifier over hashed n-grams."""
+
+    def __init__(
+        self,
+        featurizer: HashedNgramFeaturizer,
+        classes: Sequence[str],
+        weights: Any,
+        bias: Any,
+    ):
+        self.featurizer = featurizer
+        self.classes = tuple(classes)
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        featurizer: HashedNgramFeaturizer | None = None,
+        epochs: int = 20,
+        learning_rate: float = 1.0,
+        l2: float = 1e-6,
+        batch_size: int = 64,
+        seed: int = 0,
+    ) -> "LinearModelAClassifier":
+        np = _numpy()
+        if len(texts) != len(labels) or not texts:
+            raise ModelAConfigError("Training needs equally many (non-zero) texts and labels.")
+        featurizer = featurizer or HashedNgramFeaturizer()
+        classes = sorted(set(labels))
+        if len(classes) < 2:
+            raise ModelAConfigError("Training needs at least two distinct labels.")
+        class_index = {name: index for index, name in enumerate(classes)}
+        targets = np.asarray([class_index[label] for label in labels], dtype=np.int64)
+        rows = [featurizer.row(text) for text in texts]
+
+        weights = np.zeros((featurizer.dimensions, len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            order = rng.permutation(len(rows))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                lengths = np.asarray([len(rows[i][0]) for i in batch], dtype=np.int64)
+                indptr = np.concatenate(([0], np.cumsum(lengths)))
+                indices = np.asarray(
+                    [index for i in batch for index in rows[i][0]], dtype=np.int64
+                )
+                data = np.asarray(
+                    [value for i in batch for value in rows[i][1]], dtype=np.float32
+                )
+                probabilities = _softmax(_sparse_dot(indptr, indices, data, weights) + bias)
+                probabilities[np.arange(len(batch)), targets[batch]] -= 1.0
+                gradient = probabilities / len(batch)
+                row_ids = np.repeat(np.arange(len(batch)), lengths)
+                weights *= 1.0 - learning_rate * l2
+                np.add.at(weights, indices, -learning_rate * data[:, None] * gradient[row_ids])
+                bias -= learning_rate * gradient.sum(axis=0)
+        return cls(featurizer, classes, weights, bias)
+
+    def predict_proba(self, texts: Sequence[str]) -> Any:
+        indptr, indices, data = self.featurizer.transform(texts)
+        return _softmax(_sparse_dot(indptr, indices, data, self.weights) + self.bias)
+
+    def classify_many(self, texts: Iterable[str]) -> list[DenialClassification]:
+        np = _numpy()
+        texts = list(texts)
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        confidences = probabilities[np.arange(len(texts)), best].tolist()
+        category_terms = dict(_COMPILED_TAXONOMY.categories)
+        hits_for = _COMPILED_TAXONOMY.hits
+        results = []
+        for text, index, confidence in zip(texts, best.tolist(), confidences):
+            category = self.classes[index]
+            hits = hits_for(text)
+            results.append(
+                DenialClassification(
+                    category=category,
+                    confidence=round(confidence, 4),
+                    matched_terms=tuple(
+                        term for term in category_terms.get(category, ()) if term in hits
+                    ),
+                )
+            )
+        return results
+
+    def classify(self, text: str) -> DenialClassification:
+        return self.classify_many([text])[0]
+
+    def save(self, path: Path) -> Path:
+        np = _numpy()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": ARTIFACT_VERSION,
+            "dimensions": self.featurizer.dimensions,
+            "max_ngram": self.featurizer.max_ngram,
+            "classes": list(self.classes),
+        }
+        with path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                weights=self.weights.astype(np.float16),
+                bias=self.bias.astype(np.float32),
+                meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearModelAClassifier":
+        np = _numpy()
+        if not path.exists():
+            raise ModelAConfigError(
+                f"Model A artifact not found: {path}. Train one with src/scripts/train_model_a.py."
+            )
+        with np.load(path) as archive:
+            meta = json.loads(archive["meta"].tobytes().decode("utf-8"))
+            if meta.get("version") != ARTIFACT_VERSION:
+                raise ModelAConfigError(f"Unsupported Model A artifact version in {path}.")
+            weights = archive["weights"].astype(np.float32)
+            bias = archive["bias"].astype(np.float32)
+        featurizer = HashedNgramFeaturizer(
+            dimensions=int(meta["dimensions"]), max_ngram=int(meta["max_ngram"])
+        )
+        return cls(featurizer, meta["classes"], weights, bias)
+
+
+def dfs_coverage_category(metadata: Mapping[str, Any]) -> str | None:
+    """Model A category implied by a DFS record's coverage type, if any."""
+
+    coverage = str(metadata.get("coverage_type") or "").lower()
+    return next((name for phrase, name in DFS_COVERAGE_CATEGORIES if phrase in coverage), None)
+
+
+def dfs_training_examples(documents: Iterable[Any]) -> list[tuple[str, str]]:
+    """(text, category) pairs from DFS records whose coverage type maps to a category.
+
+    The `coverage type:` line is dropped from the text so the label is not a feature.
+    """
+
+    examples = []
+    for document in documents:
+        metadata: Mapping[str, Any] = getattr(document, "metadata", None) or {}
+        category = dfs_coverage_category(metadata)
+        if category is None:
+            continue
+        text = "\n".join(
+            line
+            for line in str(document.text).splitlines()
+            if not line.lower().startswith("coverage type:")
+        )
+        examples.append((text, category))
+    return examples
+
+
+def load_labeled_jsonl(path: Path) -> list[tuple[str, str]]:
+    """(text, category) pairs from `{"text": ..., "category": ...}` lines."""
+
+    examples = []
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not record.get("text") or not record.get("category"):
+            raise ModelAConfigError(f"{path}:{number} needs `text` and `category`.")
+        examples.append((str(record["text"]), str(record["category"])))
+    return examples
@@ -6,12 +6,24 @@ OpenAI and Groq models without changing business logic.
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, Sequence
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator, Mapping, Sequence
+
+from appealpilot import metrics
+
+from .json_repair import JsonRepairError, record_repair_outcome, repair_json_object
+from .json_stream import JsonSectionStreamer
+from .response_cache import ResponseCache, build_cache_key
 
 DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
 
@@ -24,6 +36,102 @@ DEFAULT_SYSTEM_PROMPT = (
     "missing_information, citations."
 )
 
+SLIM_SYSTEM_PROMPT = (
+    "You are AppealPilot, an insurance denial appeal copilot. "
+    "Use only user-provided case facts and retrieved evidence. "
+    "Do not invent facts. "
+    "Return valid JSON only with keys: "
+    "cover_letter, detailed_justification, missing_information, citation_refs."
+)
+
+GENERATION_MODES = ("single", "sectioned")
+OUTPUT_CONTRACTS = ("full", "slim")
+
+OUTPUT_CONTRACT: dict[str, Any] = {
+    "cover_letter": "string",
+    "detailed_justification": "string",
+    "evidence_checklist": [
+        {
+            "item": "string",
+            "status": "present|missing",
+            "notes": "string",
+        }
+    ],
+    "missing_information": ["string"],
+    "citations": [
+        {
+            "claim": "string",
+            "source_id": "string",
+            "source_excerpt": "string",
+        }
+    ],
+}
+
+# Slim contract: the LLM writes prose and cites by reference; the checklist and
+# citation excerpts are filled in locally from the prompt inputs.
+SLIM_OUTPUT_CONTRACT: dict[str, Any] = {
+    "cover_letter": "string",
+    "detailed_justification": "string",
+    "missing_information": ["string"],
+    "citation_refs": [
+        {
+            "claim": "string",
+            "source_id": "string",
+            "start": "int (optional character offset into the evidence snippet)",
+            "end": "int (optional, exclusive)",
+        }
+    ],
+}
+
+LOCAL_EXCERPT_CHARS = 500
+LOCAL_CHECKLIST_NOTES = "Confirm and attach."
+
+GROUNDING_RULES = (
+    "Use only provided facts and evidence.",
+    "If evidence is missing, add it to missing_information.",
+    "Every factual claim should map to at least one citation.",
+    "Do not include PHI not provided in inputs.",
+)
+
+# Sectioned mode: each call writes these keys from only the inputs listed.
+SECTION_PLAN: dict[str, dict[str, tuple[str, ...]]] = {
+    "cover_letter": {
+        "keys": ("cover_letter",),
+        "inputs": ("case_summary", "evidence_ids", "additional_instructions"),
+    },
+    "justification": {
+        "keys": ("detailed_justification",),
+        "inputs": ("case_summary", "retrieved_evidence", "additional_instructions"),
+    },
+    "checklist": {
+        "keys": ("evidence_checklist", "missing_information"),
+        "inputs": ("case_summary", "required_attachments", "evidence_ids"),
+    },
+    "citations": {
+        "keys": ("citations",),
+        "inputs": ("denial_reason", "retrieved_evidence"),
+    },
+}
+
+SLIM_SECTION_PLAN: dict[str, dict[str, tuple[str, ...]]] = {
+    "cover_letter": SECTION_PLAN["cover_letter"],
+    "justification": SECTION_PLAN["justification"],
+    "missing_information": {
+        "keys": ("missing_information",),
+        "inputs": ("case_summary", "required_attachments", "evidence_ids"),
+    },
+    "citations": {
+        "keys": ("citation_refs",),
+        "inputs": ("denial_reason", "retrieved_evidence"),
+    },
+}
+
+# Prompt layout: these payload keys never vary per case, so they ride in the
+# system message and form a byte-identical prefix that providers can cache.
+STATIC_PROMPT_KEYS = ("task", "sections", "output_contract", "grounding_rules")
+# Per-request values are moved to the very end of the user message.
+VOLATILE_CASE_FIELDS = ("generated_at_utc",)
+
 _JSON_CODE_BLOCK = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
 DEFAULT_PASSTHROUGH_SYSTEM_PROMPT = "You are a concise assistant."
 
@@ -44,6 +152,9 @@ class ModelCConfig:
     temperature: float = 0.2
     max_tokens: int = 1600
     top_p: float = 1.0
+    max_in_flight: int = 8
+    generation_mode: str = "single"  # single | sectioned
+    output_contract: str = "full"  # full | slim
 
     @property
     def provider(self) -> str:
@@ -60,6 +171,16 @@ class ModelCConfig:
             raise ModelCConfigurationError("Model C temperature must be in [0, 2].")
         if not 0 <= self.top_p <= 1:
             raise ModelCConfigurationError("Model C top_p must be in [0, 1].")
+        if self.max_in_flight < 1:
+            raise ModelCConfigurationError("Model C max_in_flight must be >= 1.")
+        if self.generation_mode not in GENERATION_MODES:
+            raise ModelCConfigurationError(
+                f"Model C generation_mode must be one of {', '.join(GENERATION_MODES)}."
+            )
+        if self.output_contract not in OUTPUT_CONTRACTS:
+            raise ModelCConfigurationError(
+                f"Model C output_contract must be one of {', '.join(OUTPUT_CONTRACTS)}."
+            )
 
 
 def _to_float(value: Any, fallback: float) -> float:
@@ -111,18 +232,32 @@ def build_model_c_config(
     )
     max_tokens = _to_int(os.getenv("MODEL_C_MAX_TOKENS", base.get("max_tokens")), 1600)
     top_p = _to_float(os.getenv("MODEL_C_TOP_P", base.get("top_p")), 1.0)
+    max_in_flight = _to_int(
+        os.getenv("MODEL_C_MAX_IN_FLIGHT", base.get("max_in_flight")), 8
+    )
+    generation_mode = str(
+        os.getenv("MODEL_C_GENERATION_MODE", base.get("generation_mode")) or "single"
+    ).strip().lower()
+    output_contract = str(
+        os.getenv("MODEL_C_OUTPUT_CONTRACT", base.get("output_contract")) or "full"
+    ).strip().lower()
 
     config = ModelCConfig(
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
         top_p=top_p,
+        max_in_flight=max_in_flight,
+        generation_mode=generation_mode,
+        output_contract=output_contract,
     )
     config.validate()
     return config
 
 
-def _default_aisuite_client() -> Any:
+def build_aisuite_client() -> Any:
+    """Build a new aisuite client from provider keys (and base URLs) in the environment."""
+
     try:
         import aisuite as ai
     except ImportError as exc:
@@ -130,17 +265,112 @@ def _default_aisuite_client() -> Any:
             "aisuite is required. Install with `pip install \"aisuite[openai,groq]\"`."
         ) from exc
 
-    provider_configs: dict[str, dict[str, str]] = {}
-    if os.getenv("OPENAI_API_KEY"):
-        provider_configs["openai"] = {"api_key": os.environ["OPENAI_API_KEY"]}
-    if os.getenv("GROQ_API_KEY"):
-        provider_configs["groq"] = {"api_key": os.environ["GROQ_API_KEY"]}
-
+    provider_configs = _provider_configs_from_env()
     if provider_configs:
         return ai.Client(provider_configs=provider_configs)
     return ai.Client()
 
 
+def _provider_configs_from_env() -> dict[str, dict[str, str]]:
+    provider_configs: dict[str, dict[str, str]] = {}
+    for provider in ("openai", "groq"):
+        api_key = os.getenv(f"{provider.upper()}_API_KEY")
+        if not api_key:
+            continue
+        provider_configs[provider] = {"api_key": api_key}
+        # Lets OpenAI-compatible endpoints (e.g. the local stub server) stand in.
+        base_url = os.getenv(f"{provider.upper()}_BASE_URL")
+        if base_url:
+            provider_configs[provider]["base_url"] = base_url
+    return provider_configs
+
+
+_SHARED_CLIENTS: dict[str, Any] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def shared_aisuite_client() -> Any:
+    """Return a long-lived client so provider HTTP connections are reused across calls.
+
+    Clients are keyed by the provider configuration so reloading keys (or pointing
+    at a different base URL) transparently yields a fresh client. With
+    `MODEL_C_CASSETTE` set, calls are recorded to or replayed from that cassette
+    (see `cassette.py`).
+    """
+
+    from .cassette import cassette_settings_from_env
+
+    cassette = cassette_settings_from_env()
+    cache_key = json.dumps(
+        {"providers": _provider_configs_from_env(), "cassette": cassette}, sort_keys=True
+    )
+    client = _SHARED_CLIENTS.get(cache_key)
+    if client is not None:
+        return client
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(cache_key)
+        if client is None:
+            client = _build_shared_client(cassette)
+            _SHARED_CLIENTS[cache_key] = client
+        return client
+
+
+def _build_shared_client(cassette: tuple[str, str, float] | None) -> Any:
+    if cassette is None:
+        return build_aisuite_client()
+    from .cassette import build_cassette_client
+
+    path, mode, latency_scale = cassette
+    inner = build_aisuite_client() if mode == "record" else None
+    return build_cassette_client(path, mode, latency_scale=latency_scale, inner=inner)
+
+
+_PROVIDER_SLOTS: dict[str, threading.BoundedSemaphore] = {}
+_PROVIDER_SLOTS_LOCK = threading.Lock()
+
+
+def _provider_semaphore(config: ModelCConfig) -> threading.BoundedSemaphore:
+    """Return the process-wide limiter for a provider.
+
+    The first config seen for a provider fixes its cap; later configs share it so
+    sync and async callers together never exceed `max_in_flight`.
+    """
+
+    with _PROVIDER_SLOTS_LOCK:
+        semaphore = _PROVIDER_SLOTS.get(config.provider)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(config.max_in_flight)
+            _PROVIDER_SLOTS[config.provider] = semaphore
+        return semaphore
+
+
+@contextmanager
+def _provider_slot(config: ModelCConfig) -> Iterator[None]:
+    """Cap in-flight blocking calls per provider across all generators in the process."""
+
+    with _provider_semaphore(config):
+        yield
+
+
+@asynccontextmanager
+async def _async_provider_slot(config: ModelCConfig) -> AsyncIterator[None]:
+    """Async counterpart of `_provider_slot` sharing the same process-wide limiter."""
+
+    semaphore = _provider_semaphore(config)
+    if not semaphore.acquire(blocking=False):
+        acquire = asyncio.ensure_future(asyncio.to_thread(semaphore.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The worker thread still takes the slot; hand it back once it does.
+            acquire.add_done_callback(lambda _: semaphore.release())
+            raise
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
 def _strip_code_fence(text: str) -> str:
     match = _JSON_CODE_BLOCK.match(text.strip())
     if match:
@@ -196,11 +426,64 @@ def _usage_as_dict(response: Any) -> dict[str, Any]:
     if usage is None:
         return {}
 
-    return {
-        "prompt_tokens": getattr(usage, "prompt_tokens", None),
-        "completion_tokens": getattr(usage, "completion_tokens", None),
-        "total_tokens": getattr(usage, "total_tokens", None),
+    usage_dict = {
+        "prompt_tokens": _usage_field(usage, "prompt_tokens"),
+        "completion_tokens": _usage_field(usage, "completion_tokens"),
+        "total_tokens": _usage_field(usage, "total_tokens"),
     }
+    cached_tokens = _cached_prompt_tokens(usage)
+    if cached_tokens is not None:
+        usage_dict["cached_prompt_tokens"] = cached_tokens
+    return usage_dict
+
+
+def _record_token_usage(config: ModelCConfig, usage: Mapping[str, Any]) -> None:
+    for kind in ("prompt_tokens", "completion_tokens", "cached_prompt_tokens"):
+        if usage.get(kind):
+            metrics.inc(
+                "appealpilot_llm_tokens_total",
+                float(usage[kind]),
+                provider=config.provider,
+                model=config.model,
+                kind=kind.removesuffix("_tokens"),
+            )
+
+
+def _usage_field(usage: Any, name: str) -> Any:
+    if isinstance(usage, Mapping):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+def _cached_prompt_tokens(usage: Any) -> int | None:
+    """Prompt tokens served from the provider's prefix cache, when reported.
+
+    OpenAI (and Groq) report `prompt_tokens_details.cached_tokens`; DeepSeek-style
+    endpoints report `prompt_cache_hit_tokens`.
+    """
+
+    details = _usage_field(usage, "prompt_tokens_details")
+    cached = _usage_field(details, "cached_tokens") if details is not None else None
+    if cached is None:
+        cached = _usage_field(usage, "prompt_cache_hit_tokens")
+    try:
+        return int(cached) if cached is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _chunk_text(chunk: Any) -> str:
+    try:
+        delta = chunk.choices[0].delta
+    except (AttributeError, IndexError, TypeError):
+        return ""
+    content = getattr(delta, "content", None)
+    return content if isinstance(content, str) else ""
+
+
+def _section_events(output: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
+    for key, value in output.items():
+        yield {"event": "section", "section": key, "value": value}
 
 
 def _uses_openai_gpt5_model(model: str) -> bool:
@@ -232,11 +515,12 @@ def _run_chat_with_retry(
     messages: Sequence[Mapping[str, str]],
 ) -> tuple[Any, str]:
     params = _build_generation_parameters(config)
-    response = client.chat.completions.create(
-        model=config.model,
-        messages=list(messages),
-        **params,
-    )
+    with _provider_slot(config):
+        response = client.chat.completions.create(
+            model=config.model,
+            messages=list(messages),
+            **params,
+        )
 
     try:
         return response, _extract_text_content(response)
@@ -245,14 +529,55 @@ def _run_chat_with_retry(
         if not _uses_openai_gpt5_model(config.model):
             raise exc
 
-        retry_params = dict(params)
-        retry_tokens = int(retry_params.get("max_completion_tokens", config.max_tokens))
-        retry_params["max_completion_tokens"] = max(retry_tokens, 2400)
-        retry_params["reasoning_effort"] = "low"
-        response = client.chat.completions.create(
-            model=config.model,
-            messages=list(messages),
-            **retry_params,
+        with _provider_slot(config):
+            response = client.chat.completions.create(
+                model=config.model,
+                messages=list(messages),
+                **_build_retry_parameters(config, params),
+            )
+        return response, _extract_text_content(response)
+
+
+def _build_retry_parameters(config: ModelCConfig, params: Mapping[str, Any]) -> dict[str, Any]:
+    retry_params = dict(params)
+    retry_tokens = int(retry_params.get("max_completion_tokens", config.max_tokens))
+    retry_params["max_completion_tokens"] = max(retry_tokens, 2400)
+    retry_params["reasoning_effort"] = "low"
+    return retry_params
+
+
+async def _acreate_completion(
+    client: Any,
+    config: ModelCConfig,
+    messages: Sequence[Mapping[str, str]],
+    params: Mapping[str, Any],
+) -> Any:
+    completions = client.chat.completions
+    async with _async_provider_slot(config):
+        acreate = getattr(completions, "acreate", None)
+        if acreate is not None:
+            return await acreate(model=config.model, messages=list(messages), **params)
+        # Older aisuite releases only expose the blocking API.
+        return await asyncio.to_thread(
+            completions.create, model=config.model, messages=list(messages), **params
+        )
+
+
+async def _arun_chat_with_retry(
+    *,
+    client: Any,
+    config: ModelCConfig,
+    messages: Sequence[Mapping[str, str]],
+) -> tuple[Any, str]:
+    params = _build_generation_parameters(config)
+    response = await _acreate_completion(client, config, messages, params)
+    try:
+        return response, _extract_text_content(response)
+    except ModelCResponseError as exc:
+        if not _uses_openai_gpt5_model(config.model):
+            raise exc
+        response = await _acreate_completion(
+            client, config, messages, _build_retry_parameters(config, params)
         )
         return response, _extract_text_content(response)
 
@@ -284,7 +609,7 @@ def run_model_c_passthrough(
         overrides["top_p"] = float(top_p)
 
     config = build_model_c_config(overrides=overrides or None)
-    active_client = client or _default_aisuite_client()
+    active_client = client or shared_aisuite_client()
     messages = [
         {"role": "system", "content": (system_prompt or DEFAULT_PASSTHROUGH_SYSTEM_PROMPT).strip()},
         {"role": "user", "content": prompt_text},
@@ -309,6 +634,135 @@ def run_model_c_passthrough(
     }
 
 
+def validate_output_contract(
+    output: Mapping[str, Any], contract: Mapping[str, Any] = OUTPUT_CONTRACT
+) -> None:
+    """Raise `ModelCResponseError` unless every contract key has the expected type."""
+
+    for key, spec in contract.items():
+        if key not in output:
+            raise ModelCResponseError(f"Model C output is missing `{key}`.")
+        expected = list if isinstance(spec, list) else str
+        if not isinstance(output[key], expected):
+            raise ModelCResponseError(
+                f"Model C output `{key}` must be a {expected.__name__}."
+            )
+
+
+def _local_excerpt(snippet: str, start: Any, end: Any) -> str:
+    try:
+        start_offset, end_offset = int(start), int(end)
+    except (TypeError, ValueError):
+        return snippet[:LOCAL_EXCERPT_CHARS]
+    if not 0 <= start_offset < end_offset <= len(snippet):
+        return snippet[:LOCAL_EXCERPT_CHARS]
+    return snippet[start_offset:min(end_offset, start_offset + LOCAL_EXCERPT_CHARS)]
+
+
+def expand_slim_output(
+    output: Mapping[str, Any],
+    retrieved_evidence: Sequence[Mapping[str, Any]],
+    required_attachments: Sequence[str],
+) -> dict[str, Any]:
+    """Turn a slim-contract response into the full output contract.
+
+    Checklist rows come from the required attachments and citation excerpts are
+    cut from the cited evidence snippet; references to unknown sources are dropped.
+    """
+
+    validate_output_contract(output, SLIM_OUTPUT_CONTRACT)
+    snippets = {
+        str(item.get("source_id", "")): str(item.get("snippet") or "")
+        for item in retrieved_evidence
+    }
+    citations = []
+    for ref in output["citation_refs"]:
+        if not isinstance(ref, Mapping):
+            continue
+        source_id = str(ref.get("source_id", ""))
+        if source_id not in snippets:
+            continue
+        citations.append(
+            {
+                "claim": str(ref.get("claim") or ""),
+                "source_id": source_id,
+                "source_excerpt": _local_excerpt(
+                    snippets[source_id], ref.get("start"), ref.get("end")
+                ),
+            }
+        )
+    return {
+        "cover_letter": output["cover_letter"],
+        "detailed_justification": output["detailed_justification"],
+        "evidence_checklist": [
+            {"item": item, "status": "missing", "notes": LOCAL_CHECKLIST_NOTES}
+            for item in required_attachments
+        ],
+        "missing_information": output["missing_information"],
+        "citations": citations,
+    }
+
+
+def _parse_model_json(raw_text: str, label: str = "Model C") -> tuple[dict[str, Any], list[str]]:
+    """Parse model output as a JSON object, repairing it locally if needed."""
+
+    normalized = _strip_code_fence(raw_text)
+    try:
+        parsed = json.loads(normalized)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if not isinstance(parsed, dict):
+            raise ModelCResponseError(f"{label} output must be a JSON object.")
+        return parsed, []
+
+    try:
+        return repair_json_object(normalized)
+    except JsonRepairError as exc:
+        record_repair_outcome(False)
+        raise ModelCResponseError(
+            f"{label} did not return valid JSON. Adjust prompt/model or inspect `raw_text`."
+        ) from exc
+
+
+def _validate_repaired(
+    output: Mapping[str, Any], contract: Mapping[str, Any], repaired: int
+) -> None:
+    """Validate the contract, counting each repaired response as a success or failure."""
+
+    try:
+        validate_output_contract(output, contract)
+    except ModelCResponseError:
+        for _ in range(repaired):
+            record_repair_outcome(False)
+        raise
+    for _ in range(repaired):
+        record_repair_outcome(True)
+
+
+def _sum_usage(responses: Sequence[Any]) -> SimpleNamespace:
+    totals: dict[str, int] = {}
+    for response in responses:
+        for name, value in _usage_as_dict(response).items():
+            if value is not None:
+                totals[name] = totals.get(name, 0) + int(value)
+    return SimpleNamespace(**totals)
+
+
+_SECTION_EXECUTOR: ThreadPoolExecutor | None = None
+_SECTION_EXECUTOR_LOCK = threading.Lock()
+
+
+def _section_executor() -> ThreadPoolExecutor:
+    global _SECTION_EXECUTOR
+    with _SECTION_EXECUTOR_LOCK:
+        if _SECTION_EXECUTOR is None:
+            _SECTION_EXECUTOR = ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="model-c-section"
+            )
+        return _SECTION_EXECUTOR
+
+
 class ModelCGenerator:
     """Provider-agnostic Model C wrapper using aisuite."""
 
@@ -316,82 +770,390 @@ class ModelCGenerator:
         self,
         config: ModelCConfig | None = None,
         client: Any | None = None,
-        system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        system_prompt: str | None = None,
+        cache: ResponseCache | None = None,
     ):
         self.config = config or build_model_c_config()
         self.config.validate()
-        self.client = client or _default_aisuite_client()
-        self.system_prompt = system_prompt
+        self.client = client or shared_aisuite_client()
+        self.system_prompt = system_prompt or (
+            SLIM_SYSTEM_PROMPT if self._slim else DEFAULT_SYSTEM_PROMPT
+        )
+        self.cache = cache
 
-    def generate(
+    @property
+    def _slim(self) -> bool:
+        return self.config.output_contract == "slim"
+
+    @property
+    def _contract(self) -> dict[str, Any]:
+        return SLIM_OUTPUT_CONTRACT if self._slim else OUTPUT_CONTRACT
+
+    @property
+    def _section_plan(self) -> dict[str, dict[str, tuple[str, ...]]]:
+        return SLIM_SECTION_PLAN if self._slim else SECTION_PLAN
+
+    def _build_payload(
         self,
         case_summary: Mapping[str, Any],
         retrieved_evidence: Sequence[Mapping[str, Any]],
-        required_attachments: Sequence[str] | None = None,
-        additional_instructions: str | None = None,
+        required_attachments: Sequence[str] | None,
+        additional_instructions: str | None,
     ) -> dict[str, Any]:
-        """Generate a structured appeal packet payload."""
-
-        payload = {
+        return {
             "task": "Generate an appeal letter packet JSON for the denial case.",
-            "output_contract": {
-                "cover_letter": "string",
-                "detailed_justification": "string",
-                "evidence_checklist": [
-                    {
-                        "item": "string",
-                        "status": "present|missing",
-                        "notes": "string",
-                    }
-                ],
-                "missing_information": ["string"],
-                "citations": [
-                    {
-                        "claim": "string",
-                        "source_id": "string",
-                        "source_excerpt": "string",
-                    }
-                ],
-            },
-            "grounding_rules": [
-                "Use only provided facts and evidence.",
-                "If evidence is missing, add it to missing_information.",
-                "Every factual claim should map to at least one citation.",
-                "Do not include PHI not provided in inputs.",
-            ],
+            "output_contract": self._contract,
+            "grounding_rules": list(GROUNDING_RULES),
             "case_summary": dict(case_summary),
             "retrieved_evidence": list(retrieved_evidence),
             "required_attachments": list(required_attachments or []),
             "additional_instructions": additional_instructions or "",
         }
 
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
-        ]
-        response, raw_text = _run_chat_with_retry(
-            client=self.client,
-            config=self.config,
-            messages=messages,
+    def _build_section_payloads(self, payload: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+        """Split the full payload into per-section prompts carrying only what each needs."""
+
+        case_summary = dict(payload["case_summary"])
+        evidence = list(payload["retrieved_evidence"])
+        inputs = {
+            "case_summary": case_summary,
+            "retrieved_evidence": evidence,
+            "evidence_ids": [str(item.get("source_id", "")) for item in evidence],
+            "required_attachments": list(payload["required_attachments"]),
+            "denial_reason": case_summary.get("denial_reason_text", ""),
+            "additional_instructions": payload.get("additional_instructions") or "",
+        }
+        payloads = {}
+        contract = self._contract
+        for name, plan in self._section_plan.items():
+            keys = plan["keys"]
+            payloads[name] = {
+                "task": (
+                    "Generate only the "
+                    + ", ".join(keys)
+                    + " section(s) of an appeal packet as a JSON object with exactly those keys."
+                ),
+                "sections": list(keys),
+                "output_contract": {key: contract[key] for key in keys},
+                "grounding_rules": list(GROUNDING_RULES),
+                **{field: inputs[field] for field in plan["inputs"]},
+            }
+        return payloads
+
+    def _assemble_sections(
+        self, section_results: Mapping[str, tuple[Any, str]]
+    ) -> tuple[SimpleNamespace, str]:
+        """Merge per-section JSON into one packet and validate the full contract."""
+
+        output: dict[str, Any] = {}
+        repairs: list[str] = []
+        repaired_sections = 0
+        for name, (_, raw_text) in section_results.items():
+            parsed, section_repairs = _parse_model_json(raw_text, f"Model C section `{name}`")
+            if section_repairs:
+                repaired_sections += 1
+                repairs.extend(f"{name}:{repair}" for repair in section_repairs)
+            for key in self._section_plan[name]["keys"]:
+                if key in parsed:
+                    output[key] = parsed[key]
+        contract = self._contract
+        _validate_repaired(output, contract, repaired_sections)
+        response = SimpleNamespace(
+            usage=_sum_usage([response for response, _ in section_results.values()]),
+            json_repairs=repairs,
         )
+        return response, json.dumps({key: output[key] for key in contract})
+
+    def _generate_sectioned(self, payload: Mapping[str, Any]) -> tuple[Any, str]:
+        executor = _section_executor()
+        futures = {
+            name: executor.submit(
+                _run_chat_with_retry,
+                client=self.client,
+                config=self.config,
+                messages=self._build_messages(section_payload),
+            )
+            for name, section_payload in self._build_section_payloads(payload).items()
+        }
+        return self._assemble_sections({name: future.result() for name, future in futures.items()})
+
+    async def _agenerate_sectioned(self, payload: Mapping[str, Any]) -> tuple[Any, str]:
+        section_payloads = self._build_section_payloads(payload)
+        results = await asyncio.gather(
+            *(
+                _arun_chat_with_retry(
+                    client=self.client,
+                    config=self.config,
+                    messages=self._build_messages(section_payload),
+                )
+                for section_payload in section_payloads.values()
+            )
+        )
+        return self._assemble_sections(dict(zip(section_payloads, results)))
+
+    def _cache_generation_params(self) -> dict[str, Any]:
+        params = _build_generation_parameters(self.config)
+        if self.config.generation_mode != "single":
+            params["generation_mode"] = self.config.generation_mode
+        if self._slim:
+            params["output_contract"] = self.config.output_contract
+        return params
+
+    def _cache_lookup(
+        self, payload: Mapping[str, Any], bypass_cache: bool
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        if self.cache is None or bypass_cache:
+            return None, None
+        cache_key = build_cache_key(
+            model=self.config.model,
+            generation_params=self._cache_generation_params(),
+            system_prompt=self.system_prompt,
+            payload=payload,
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # Hits cost no tokens; keep the original call's usage for reference.
+            return cache_key, {
+                **cached,
+                "usage": {},
+                "cached_usage": cached.get("usage") or {},
+                "cache_hit": True,
+            }
+        return cache_key, None
+
+    def _build_messages(self, payload: Mapping[str, Any]) -> list[dict[str, str]]:
+        """Static instructions first (system message), then the case data.
+
+        The static block is serialized with sorted keys so every request for the
+        same contract/section shares a byte-identical prefix; volatile fields such
+        as the generation timestamp go last so they do not break the cached
+        prefix of repeated cases.
+        """
+
+        static = {key: payload[key] for key in STATIC_PROMPT_KEYS if key in payload}
+        case = {key: value for key, value in payload.items() if key not in static}
+        volatile: dict[str, Any] = {}
+        if isinstance(case.get("case_summary"), Mapping):
+            case_summary = dict(case["case_summary"])
+            for field in VOLATILE_CASE_FIELDS:
+                if field in case_summary:
+                    volatile[field] = case_summary.pop(field)
+            case["case_summary"] = case_summary
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
+                + "\n\n"
+                + json.dumps(static, ensure_ascii=True, sort_keys=True),
+            },
+            {"role": "user", "content": json.dumps({**case, **volatile}, ensure_ascii=True)},
+        ]
 
-        normalized = _strip_code_fence(raw_text)
-
-        try:
-            parsed = json.loads(normalized)
-        except json.JSONDecodeError as exc:
-            raise ModelCResponseError(
-                "Model C did not return valid JSON. "
-                "Adjust prompt/model or inspect `raw_text`."
-            ) from exc
-
-        if not isinstance(parsed, dict):
-            raise ModelCResponseError("Model C output must be a JSON object.")
+    def _finalize(
+        self,
+        response: Any,
+        raw_text: str,
+        cache_key: str | None,
+        payload: Mapping[str, Any],
+        generation_mode: str = "single",
+    ) -> dict[str, Any]:
+        parsed, repairs = _parse_model_json(raw_text)
+        if repairs:
+            _validate_repaired(parsed, self._contract, 1)
+        repairs = repairs or list(getattr(response, "json_repairs", None) or [])
+        if self._slim:
+            parsed = expand_slim_output(
+                parsed, payload["retrieved_evidence"], payload["required_attachments"]
+            )
 
-        return {
+        result = {
             "provider": self.config.provider,
             "model": self.config.model,
             "usage": _usage_as_dict(response),
             "output": parsed,
             "raw_text": raw_text,
         }
+        _record_token_usage(self.config, result["usage"])
+        if generation_mode != "single":
+            result["generation_mode"] = generation_mode
+        if self._slim:
+            result["output_contract"] = self.config.output_contract
+        if repairs:
+            # Served instead of the template; the raw text is kept for review.
+            result["json_repaired"] = True
+            result["json_repairs"] = repairs
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return {**result, "cache_hit": False}
+
+    def build_chat_request(
+        self,
+        case_summary: Mapping[str, Any],
+        retrieved_evidence: Sequence[Mapping[str, Any]],
+        required_attachments: Sequence[str] | None = None,
+        additional_instructions: str | None = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Return `(payload, chat request body)` for one single-call generation.
+
+        Used by batch submission, which sends the request body offline and later
+        hands the completion text to `finalize_completion` with the payload.
+        """
+
+        payload = self._build_payload(
+            case_summary, retrieved_evidence, required_attachments, additional_instructions
+        )
+        body = {
+            "model": self.config.model.split(":", maxsplit=1)[1],
+            "messages": self._build_messages(payload),
+            **_build_generation_parameters(self.config),
+        }
+        return payload, body
+
+    def finalize_completion(
+        self,
+        content: str,
+        usage: Mapping[str, Any] | None,
+        payload: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Parse, repair and validate completion text produced outside `generate`."""
+
+        if not (content or "").strip():
+            raise ModelCResponseError("Model returned empty content.")
+        return self._finalize(
+            SimpleNamespace(usage=dict(usage or {}) or None), content, None, payload
+        )
+
+    def generate(
+        self,
+        case_summary: Mapping[str, Any],
+        retrieved_evidence: Sequence[Mapping[str, Any]],
+        required_attachments: Sequence[str] | None = None,
+        additional_instructions: str | None = None,
+        bypass_cache: bool = False,
+    ) -> dict[str, Any]:
+        """Generate a structured appeal packet payload."""
+
+        payload = self._build_payload(
+            case_summary, retrieved_evidence, required_attachments, additional_instructions
+        )
+        cache_key, cached = self._cache_lookup(payload, bypass_cache)
+        if cached is not None:
+            return cached
+
+        if self.config.generation_mode == "sectioned":
+            response, raw_text = self._generate_sectioned(payload)
+        else:
+            response, raw_text = _run_chat_with_retry(
+                client=self.client,
+                config=self.config,
+                messages=self._build_messages(payload),
+            )
+        return self._finalize(
+            response, raw_text, cache_key, payload, self.config.generation_mode
+        )
+
+    async def agenerate(
+        self,
+        case_summary: Mapping[str, Any],
+        retrieved_evidence: Sequence[Mapping[str, Any]],
+        required_attachments: Sequence[str] | None = None,
+        additional_instructions: str | None = None,
+        bypass_cache: bool = False,
+    ) -> dict[str, Any]:
+        """Async variant of `generate`; in-flight calls are capped per provider."""
+
+        payload = self._build_payload(
+            case_summary, retrieved_evidence, required_attachments, additional_instructions
+        )
+        cache_key, cached = self._cache_lookup(payload, bypass_cache)
+        if cached is not None:
+            return cached
+
+        if self.config.generation_mode == "sectioned":
+            response, raw_text = await self._agenerate_sectioned(payload)
+        else:
+            response, raw_text = await _arun_chat_with_retry(
+                client=self.client,
+                config=self.config,
+                messages=self._build_messages(payload),
+            )
+        return self._finalize(
+            response, raw_text, cache_key, payload, self.config.generation_mode
+        )
+
+    def generate_stream(
+        self,
+        case_summary: Mapping[str, Any],
+        retrieved_evidence: Sequence[Mapping[str, Any]],
+        required_attachments: Sequence[str] | None = None,
+        additional_instructions: str | None = None,
+        bypass_cache: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream `delta`/`section` events as the packet is generated, then `complete`.
+
+        The final `complete` event carries the same result dict as `generate`.
+        Providers without streaming support degrade to one blocking call whose
+        sections are emitted together. Streaming always uses a single call, even
+        when `generation_mode` is `sectioned`.
+        """
+
+        payload = self._build_payload(
+            case_summary, retrieved_evidence, required_attachments, additional_instructions
+        )
+        cache_key, cached = self._cache_lookup(payload, bypass_cache)
+        if cached is not None:
+            yield from _section_events(cached.get("output") or {})
+            yield {"event": "complete", "result": cached}
+            return
+
+        messages = self._build_messages(payload)
+        params = _build_generation_parameters(self.config)
+        with _provider_slot(self.config):
+            try:
+                chunks = iter(
+                    self.client.chat.completions.create(
+                        model=self.config.model, messages=messages, stream=True, **params
+                    )
+                )
+                first_chunk = next(chunks, None)
+            except Exception:
+                chunks = None
+
+            if chunks is not None:
+                streamer = JsonSectionStreamer()
+                raw_parts: list[str] = []
+                usage = None
+                pending = [first_chunk] if first_chunk is not None else []
+                for chunk in itertools.chain(pending, chunks):
+                    usage = getattr(chunk, "usage", None) or usage
+                    text = _chunk_text(chunk)
+                    if not text:
+                        continue
+                    raw_parts.append(text)
+                    for event in streamer.feed(text):
+                        # Slim `citation_refs` surface later as expanded `citations`.
+                        if event["section"] in OUTPUT_CONTRACT:
+                            yield event
+
+        if chunks is None:
+            # Streaming unsupported or rejected; fall back to one blocking call.
+            result = self.generate(
+                case_summary,
+                retrieved_evidence,
+                required_attachments,
+                additional_instructions,
+                bypass_cache=bypass_cache,
+            )
+            yield from _section_events(result.get("output") or {})
+            yield {"event": "complete", "result": result}
+            return
+
+        raw_text = "".join(raw_parts).strip()
+        if not raw_text:
+            raise ModelCResponseError("Model returned empty content.")
+        result = self._finalize(SimpleNamespace(usage=usage), raw_text, cache_key, payload)
+        # Sections the incremental parser could not see (e.g. malformed framing).
+        for key, value in result["output"].items():
+            if key not in streamer.sections:
+                yield {"event": "section", "section": key, "value": value}
+        yield {"event": "complete", "result": result}
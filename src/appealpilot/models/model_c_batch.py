@@ -0,0 +1,259 @@
+"""Batch submission for Model C (OpenAI-compatible `/v1/batches` format).
+
+Batch jobs trade latency (results within the completion window, typically
+24h) for lower per-token prices and separate rate limits, which suits
+overnight backlog runs. Requests are written as JSONL lines of the form
+`{"custom_id", "method": "POST", "url": "/v1/chat/completions", "body"}` and
+results come back keyed by `custom_id`.
+
+`OpenAICompatibleBatchProvider` talks to OpenAI or Groq (both expose the same
+Files + Batches API); `LocalBatchProvider` runs a batch file through any
+chat client in-process and stands in for the service in tests and offline runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Protocol
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+DEFAULT_BASE_URLS = {
+    "openai": "https://api.openai.com/v1",
+    "groq": "https://api.groq.com/openai/v1",
+}
+
+
+class ModelCBatchError(RuntimeError):
+    """Raised when a batch cannot be submitted or its results cannot be read."""
+
+
+@dataclass(frozen=True)
+class BatchStatus:
+    """Provider-neutral snapshot of a batch job."""
+
+    batch_id: str
+    status: str
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_BATCH_STATUSES
+
+
+class BatchProvider(Protocol):
+    """Minimal surface shared by hosted and local batch services."""
+
+    def submit(self, input_path: Path) -> str: ...
+
+    def status(self, batch_id: str) -> BatchStatus: ...
+
+    def results(self, batch_id: str) -> list[dict[str, Any]]: ...
+
+
+def batch_request_line(custom_id: str, body: Mapping[str, Any]) -> dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": dict(body)}
+
+
+def write_batch_file(path: Path, lines: Iterable[Mapping[str, Any]]) -> int:
+    """Write batch request lines as JSONL and return how many were written."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, ensure_ascii=True) + "\n")
+            count += 1
+    return count
+
+
+def _iter_jsonl(text: str) -> Iterator[dict[str, Any]]:
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_batch_result(line: Mapping[str, Any]) -> tuple[str | None, dict[str, Any] | None, str | None]:
+    """Return `(content, usage, error)` from one batch output line."""
+
+    error = line.get("error")
+    response = line.get("response") or {}
+    if error:
+        message = error.get("message") if isinstance(error, Mapping) else str(error)
+        return None, None, message or "batch request failed"
+    if int(response.get("status_code") or 0) != 200:
+        return None, None, f"batch request returned HTTP {response.get('status_code')}"
+    body = response.get("body") or {}
+    try:
+        content = body["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return None, None, "batch response has no message content"
+    return content, dict(body.get("usage") or {}), None
+
+
+class OpenAICompatibleBatchProvider:
+    """Files + Batches API client for OpenAI and Groq (needs the `openai` package)."""
+
+    def __init__(
+        self,
+        provider: str = "openai",
+        api_key: str | None = None,
+        base_url: str | None = None,
+        completion_window: str = "24h",
+    ):
+        try:
+            from openai import OpenAI
+        except ImportError as exc:
+            raise ModelCBatchError(
+                "The openai package is required for hosted batches. "
+                "Install with `pip install \"aisuite[openai]\"`."
+            ) from exc
+
+        key = api_key or os.getenv(f"{provider.upper()}_API_KEY")
+        if not key:
+            raise ModelCBatchError(f"{provider.upper()}_API_KEY is required for batch submission.")
+        self.completion_window = completion_window
+        self._client = OpenAI(
+            api_key=key,
+            base_url=base_url
+            or os.getenv(f"{provider.upper()}_BASE_URL")
+            or DEFAULT_BASE_URLS.get(provider),
+        )
+
+    def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as handle:
+            uploaded = self._client.files.create(file=handle, purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> BatchStatus:
+        batch = self._client.batches.retrieve(batch_id)
+        counts = getattr(batch, "request_counts", None)
+        return BatchStatus(
+            batch_id=batch_id,
+            status=str(batch.status),
+            total=int(getattr(counts, "total", 0) or 0),
+            completed=int(getattr(counts, "completed", 0) or 0),
+            failed=int(getattr(counts, "failed", 0) or 0),
+        )
+
+    def results(self, batch_id: str) -> list[dict[str, Any]]:
+        batch = self._client.batches.retrieve(batch_id)
+        lines: list[dict[str, Any]] = []
+        for file_id in (batch.output_file_id, getattr(batch, "error_file_id", None)):
+            if file_id:
+                lines.extend(_iter_jsonl(self._client.files.content(file_id).text))
+        return lines
+
+
+class LocalBatchProvider:
+    """In-process batch service running each line through a chat client.
+
+    Lines are processed on a background thread (or synchronously with
+    `background=False`), so callers exercise the same submit/poll/collect flow
+    as against a hosted provider. Per-line failures become error lines.
+    """
+
+    def __init__(self, client: Any, provider: str = "openai", background: bool = True):
+        self.client = client
+        self.provider = provider
+        self.background = background
+        self._lock = threading.Lock()
+        self._batches: dict[str, dict[str, Any]] = {}
+
+    def submit(self, input_path: Path) -> str:
+        requests = list(_iter_jsonl(input_path.read_text(encoding="utf-8")))
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._batches[batch_id] = {"status": "in_progress", "total": len(requests), "results": []}
+        if self.background:
+            threading.Thread(target=self._run, args=(batch_id, requests), daemon=True).start()
+        else:
+            self._run(batch_id, requests)
+        return batch_id
+
+    def _run(self, batch_id: str, requests: list[dict[str, Any]]) -> None:
+        for request in requests:
+            result = self._complete(request)
+            with self._lock:
+                self._batches[batch_id]["results"].append(result)
+        with self._lock:
+            self._batches[batch_id]["status"] = "completed"
+
+    def _complete(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        custom_id = request.get("custom_id")
+        body = dict(request.get("body") or {})
+        model = f"{self.provider}:{body.pop('model', '')}"
+        try:
+            response = self.client.chat.completions.create(model=model, **body)
+            content = response.choices[0].message.content
+        except Exception as exc:
+            return {
+                "custom_id": custom_id,
+                "response": None,
+                "error": {"code": type(exc).__name__, "message": str(exc)},
+            }
+        usage = getattr(response, "usage", None)
+        return {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": {
+                        name: getattr(usage, name, None)
+                        for name in ("prompt_tokens", "completion_tokens", "total_tokens")
+                    },
+                },
+            },
+            "error": None,
+        }
+
+    def status(self, batch_id: str) -> BatchStatus:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                raise ModelCBatchError(f"Unknown batch {batch_id}.")
+            results = batch["results"]
+            failed = sum(1 for result in results if result["error"])
+            return BatchStatus(
+                batch_id=batch_id,
+                status=batch["status"],
+                total=batch["total"],
+                completed=len(results) - failed,
+                failed=failed,
+            )
+
+    def results(self, batch_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._batches[batch_id]["results"])
+
+
+def wait_for_batch(
+    provider: BatchProvider,
+    batch_id: str,
+    poll_interval_seconds: float = 60.0,
+    timeout_seconds: float | None = None,
+) -> BatchStatus:
+    """Poll until the batch reaches a terminal status (or the timeout passes)."""
+
+    started = time.monotonic()
+    while True:
+        status = provider.status(batch_id)
+        if status.done:
+            return status
+        if timeout_seconds is not None and time.monotonic() - started >= timeout_seconds:
+            return status
+        time.sleep(poll_interval_seconds)
@@ -0,0 +1,453 @@
+"""Latency-aware routing across Model C providers with circuit breaking and hedging.
+
+The router wraps one `ModelCGenerator` per configured `provider:model`, sends each
+request to the healthiest provider whose circuit is not open, fails over down the
+ranked list on errors, and can hedge a slow call with the next provider.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from .model_c_aisuite import (
+    ModelCConfig,
+    ModelCConfigurationError,
+    ModelCGenerator,
+    ModelCResponseError,
+    build_model_c_config,
+)
+from .response_cache import ResponseCache
+
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Rolling error rate inflates a provider's latency score by up to 5x.
+_ERROR_RATE_PENALTY = 4.0
+
+
+class ModelCRoutingError(ModelCResponseError):
+    """Raised when every routed provider failed or was short-circuited."""
+
+    def __init__(self, message: str, routing: Mapping[str, Any]):
+        super().__init__(message)
+        self.routing = dict(routing)
+
+
+@dataclass(frozen=True)
+class ModelCRouterConfig:
+    """Ordered candidate models plus circuit breaker and hedging settings."""
+
+    models: tuple[str, ...] = ()
+    hedge_delay_seconds: float = 0.0  # 0 disables hedging
+    failure_threshold: int = 3
+    cooldown_seconds: float = 30.0
+    latency_window: int = 50
+
+    @property
+    def model(self) -> str:
+        return self.models[0] if self.models else "router:unconfigured"
+
+    @property
+    def provider(self) -> str:
+        return self.model.split(":", maxsplit=1)[0]
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.models) > 1
+
+    def validate(self) -> None:
+        for model in self.models:
+            if ":" not in model:
+                raise ModelCConfigurationError(
+                    f"Router model `{model}` must be 'provider:model_name'."
+                )
+        if self.hedge_delay_seconds < 0:
+            raise ModelCConfigurationError("Router hedge_delay_seconds must be >= 0.")
+        if self.failure_threshold < 1:
+            raise ModelCConfigurationError("Router failure_threshold must be >= 1.")
+        if self.cooldown_seconds < 0:
+            raise ModelCConfigurationError("Router cooldown_seconds must be >= 0.")
+        if self.latency_window < 1:
+            raise ModelCConfigurationError("Router latency_window must be >= 1.")
+
+
+def _load_router_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ModelCConfigurationError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+
+    model_c = loaded.get("model_c") or {}
+    router = model_c.get("router") if isinstance(model_c, dict) else None
+    if router is None:
+        return {}
+    if not isinstance(router, dict):
+        raise ModelCConfigurationError("`model_c.router` in settings.yaml must be a mapping.")
+    return router
+
+
+def _parse_models(value: Any) -> tuple[str, ...]:
+    if value is None or value == "":
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(str(item).strip() for item in value if str(item).strip())
+
+
+def build_model_c_router_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> ModelCRouterConfig:
+    """Build router config from `model_c.router` in settings, env vars, and overrides."""
+
+    base = _load_router_from_settings(settings_path)
+    if overrides:
+        base = {**base, **dict(overrides)}
+
+    config = ModelCRouterConfig(
+        models=_parse_models(os.getenv("MODEL_C_ROUTER_MODELS", base.get("models"))),
+        hedge_delay_seconds=float(
+            os.getenv("MODEL_C_HEDGE_DELAY_SECONDS", base.get("hedge_delay_seconds")) or 0.0
+        ),
+        failure_threshold=int(base.get("failure_threshold") or 3),
+        cooldown_seconds=float(base.get("cooldown_seconds", 30.0)),
+        latency_window=int(base.get("latency_window") or 50),
+    )
+    config.validate()
+    return config
+
+
+class ProviderHealth:
+    """Rolling latency/error window and circuit breaker state for one provider."""
+
+    def __init__(self, provider: str, config: ModelCRouterConfig):
+        self.provider = provider
+        self.config = config
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=config.latency_window)
+        self._outcomes: deque[bool] = deque(maxlen=config.latency_window)
+        self._consecutive_failures = 0
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.circuit_opens = 0
+
+    def try_acquire(self, now: float | None = None) -> bool:
+        """Return True if a request may be sent; open circuits admit one probe after cooldown."""
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_OPEN and now - self._opened_at >= self.config.cooldown_seconds:
+                self._state = CIRCUIT_HALF_OPEN
+            if self._state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency_seconds: float) -> None:
+        with self._lock:
+            self.successes += 1
+            self._latencies.append(latency_seconds)
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            self._state = CIRCUIT_CLOSED
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Free a half-open probe slot without recording an outcome (e.g. cache hits)."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            reopen = self._state == CIRCUIT_HALF_OPEN
+            if reopen or self._consecutive_failures >= self.config.failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    self.circuit_opens += 1
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                # After the cooldown the provider competes again from a clean window.
+                self._latencies.clear()
+                self._outcomes.clear()
+            self._probe_in_flight = False
+
+    def latency_estimate(self) -> float | None:
+        """Median rolling latency, inflated by the rolling error rate; None if unobserved."""
+
+        with self._lock:
+            if not self._latencies:
+                return float("inf") if self._outcomes else None
+            ordered = sorted(self._latencies)
+            median = ordered[len(ordered) // 2]
+            error_rate = self._outcomes.count(False) / len(self._outcomes)
+        return median * (1.0 + _ERROR_RATE_PENALTY * error_rate)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            outcomes = list(self._outcomes)
+            state = self._state
+        return {
+            "state": state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "circuit_opens": self.circuit_opens,
+            "rolling_error_rate": (outcomes.count(False) / len(outcomes)) if outcomes else 0.0,
+            "rolling_p50_seconds": latencies[len(latencies) // 2] if latencies else None,
+            "rolling_samples": len(latencies),
+        }
+
+
+_HEDGE_EXECUTOR: ThreadPoolExecutor | None = None
+_HEDGE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _HEDGE_EXECUTOR
+    with _HEDGE_EXECUTOR_LOCK:
+        if _HEDGE_EXECUTOR is None:
+            _HEDGE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="model-c-hedge"
+            )
+        return _HEDGE_EXECUTOR
+
+
+class ModelCRouter:
+    """Generator-compatible router over several `ModelCGenerator` instances."""
+
+    def __init__(
+        self,
+        config: ModelCRouterConfig | None = None,
+        generators: Sequence[Any] | None = None,
+        base_config: ModelCConfig | None = None,
+        client: Any | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        self.config = config or build_model_c_router_config()
+        self.config.validate()
+        if generators is None:
+            base = base_config or build_model_c_config()
+            generators = [
+                ModelCGenerator(config=replace(base, model=model), client=client, cache=cache)
+                for model in (self.config.models or (base.model,))
+            ]
+        if not generators:
+            raise ModelCConfigurationError("ModelCRouter needs at least one generator.")
+        self.generators = list(generators)
+        self.health: dict[str, ProviderHealth] = {}
+        for generator in self.generators:
+            provider = generator.config.provider
+            self.health.setdefault(provider, ProviderHealth(provider, self.config))
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "failovers": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "short_circuited": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _rank(self) -> list[Any]:
+        """Order generators by latency score; unobserved providers score as the best seen."""
+
+        estimates = {
+            provider: health.latency_estimate() for provider, health in self.health.items()
+        }
+        known = [value for value in estimates.values() if value is not None]
+        neutral = min(known) if known else 0.0
+        order = {id(generator): index for index, generator in enumerate(self.generators)}
+        return sorted(
+            self.generators,
+            key=lambda generator: (
+                estimates[generator.config.provider]
+                if estimates[generator.config.provider] is not None
+                else neutral,
+                order[id(generator)],
+            ),
+        )
+
+    def _invoke(
+        self,
+        generator: Any,
+        kwargs: Mapping[str, Any],
+        attempts: list[dict[str, Any]],
+        role: str,
+    ) -> dict[str, Any]:
+        health = self.health[generator.config.provider]
+        started = time.monotonic()
+        try:
+            result = generator.generate(**kwargs)
+        except Exception as exc:
+            health.record_failure()
+            attempts.append(
+                {
+                    "model": generator.config.model,
+                    "role": role,
+                    "outcome": "error",
+                    "error": f"{type(exc).__name__}: {exc}",
+                    "latency_seconds": time.monotonic() - started,
+                }
+            )
+            raise
+        latency = time.monotonic() - started
+        if result.get("cache_hit"):
+            health.release()
+        else:
+            health.record_success(latency)
+        attempts.append(
+            {
+                "model": generator.config.model,
+                "role": role,
+                "outcome": "ok",
+                "latency_seconds": latency,
+            }
+        )
+        return result
+
+    def _hedged(
+        self,
+        primary: Any,
+        backup: Any,
+        kwargs: Mapping[str, Any],
+        attempts: list[dict[str, Any]],
+    ) -> tuple[dict[str, Any], Any, bool]:
+        executor = _hedge_executor()
+        futures = {executor.submit(self._invoke, primary, kwargs, attempts, "primary"): primary}
+        done, _ = wait(futures, timeout=self.config.hedge_delay_seconds)
+        hedged = False
+        if not done and self.health[backup.config.provider].try_acquire():
+            hedged = True
+            self._count("hedges")
+            futures[executor.submit(self._invoke, backup, kwargs, attempts, "hedge")] = backup
+
+        pending = set(futures)
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower call keeps running and still updates provider health.
+                    return future.result(), futures[future], hedged
+                error = future.exception()
+        raise error  # type: ignore[misc]
+
+    def generate(self, **kwargs: Any) -> dict[str, Any]:
+        """Generate via the healthiest provider, failing over (and hedging) as configured."""
+
+        self._count("requests")
+        attempts: list[dict[str, Any]] = []
+        skipped: list[str] = []
+        remaining = self._rank()
+
+        def _routing(selected: str | None, hedged: bool) -> dict[str, Any]:
+            return {
+                "selected_model": selected,
+                "candidates": [generator.config.model for generator in self.generators],
+                "skipped_open_circuit": list(skipped),
+                "hedged": hedged,
+                "attempts": list(attempts),
+            }
+
+        last_error: BaseException | None = None
+        while remaining:
+            primary = remaining.pop(0)
+            if not self.health[primary.config.provider].try_acquire():
+                skipped.append(primary.config.model)
+                continue
+            backup = remaining[0] if self.config.hedge_delay_seconds > 0 and remaining else None
+            hedged = False
+            try:
+                if backup is None:
+                    result, winner = self._invoke(primary, kwargs, attempts, "primary"), primary
+                else:
+                    result, winner, hedged = self._hedged(primary, backup, kwargs, attempts)
+            except Exception as exc:
+                last_error = exc
+                if hedged:
+                    remaining.pop(0)
+                if remaining:
+                    self._count("failovers")
+                continue
+            if hedged and winner is not primary:
+                self._count("hedge_wins")
+            return {**result, "routing": _routing(winner.config.model, hedged)}
+
+        if last_error is None:
+            self._count("short_circuited")
+            raise ModelCRoutingError(
+                "All Model C providers have open circuits.", routing=_routing(None, False)
+            )
+        raise ModelCRoutingError(
+            f"All routed Model C providers failed: {last_error}",
+            routing=_routing(None, False),
+        ) from last_error
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "models": [generator.config.model for generator in self.generators],
+            "providers": {
+                provider: health.snapshot() for provider, health in self.health.items()
+            },
+            **counters,
+        }
+
+
+_DEFAULT_ROUTERS: dict[tuple[Any, ...], ModelCRouter] = {}
+_DEFAULT_ROUTERS_LOCK = threading.Lock()
+
+
+def default_model_c_router(
+    config: ModelCRouterConfig,
+    base_config: ModelCConfig,
+    cache: ResponseCache | None = None,
+) -> ModelCRouter:
+    """Return the process-wide router for a config so provider health persists across requests."""
+
+    key = (config, base_config, id(cache) if cache is not None else None)
+    with _DEFAULT_ROUTERS_LOCK:
+        router = _DEFAULT_ROUTERS.get(key)
+        if router is None:
+            router = ModelCRouter(config=config, base_config=base_config, cache=cache)
+            _DEFAULT_ROUTERS[key] = router
+        return router
+
+
+def routing_stats() -> list[dict[str, Any]]:
+    """Return health and routing counters for every process-wide router."""
+
+    with _DEFAULT_ROUTERS_LOCK:
+        routers = list(_DEFAULT_ROUTERS.values())
+    return [router.stats() for router in routers]
@@ -0,0 +1,301 @@
+"""Persistent Model C response cache with TTL and size-based eviction.
+
+Cached entries contain generated appeal text derived from case data (PHI), so
+the cache is off by default; enable it only on storage approved for PHI and
+keep `ttl_seconds` within the deployment's retention policy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Any, Mapping
+
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
+DEFAULT_CACHE_DIRECTORY = "data/interim/model_c_cache"
+# Fields that vary per run without changing what the model is asked to do.
+VOLATILE_CASE_FIELDS = ("generated_at_utc",)
+
+
+class ResponseCacheConfigError(ValueError):
+    """Raised when response cache configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class ResponseCacheConfig:
+    """Runtime config for the on-disk Model C response cache."""
+
+    enabled: bool = False
+    directory: str = DEFAULT_CACHE_DIRECTORY
+    ttl_seconds: float = 7 * 24 * 3600
+    max_bytes: int = 256 * 1024 * 1024
+
+    def validate(self) -> None:
+        if not self.directory:
+            raise ResponseCacheConfigError("cache directory is required.")
+        if self.ttl_seconds <= 0:
+            raise ResponseCacheConfigError("cache ttl_seconds must be > 0.")
+        if self.max_bytes < 1:
+            raise ResponseCacheConfigError("cache max_bytes must be >= 1.")
+
+
+def _to_bool(value: Any, fallback: bool) -> bool:
+    if value is None or value == "":
+        return fallback
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _load_cache_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ResponseCacheConfigError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+
+    model_c = loaded.get("model_c") or {}
+    cache = model_c.get("cache") if isinstance(model_c, dict) else None
+    if cache is None:
+        return {}
+    if not isinstance(cache, dict):
+        raise ResponseCacheConfigError("`model_c.cache` in settings.yaml must be a mapping.")
+    return cache
+
+
+def build_response_cache_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> ResponseCacheConfig:
+    """Build cache config from `model_c.cache` in settings, env vars, and overrides."""
+
+    base = _load_cache_from_settings(settings_path)
+    if overrides:
+        base = {**base, **dict(overrides)}
+
+    config = ResponseCacheConfig(
+        enabled=_to_bool(os.getenv("MODEL_C_CACHE_ENABLED", base.get("enabled")), False),
+        directory=os.getenv("MODEL_C_CACHE_DIR", base.get("directory", DEFAULT_CACHE_DIRECTORY)),
+        ttl_seconds=float(
+            os.getenv("MODEL_C_CACHE_TTL_SECONDS", base.get("ttl_seconds") or 7 * 24 * 3600)
+        ),
+        max_bytes=int(
+            os.getenv("MODEL_C_CACHE_MAX_BYTES", base.get("max_bytes") or 256 * 1024 * 1024)
+        ),
+    )
+    config.validate()
+    return config
+
+
+def canonical_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Drop per-run volatile fields so identical cases share a cache key."""
+
+    canonical = dict(payload)
+    case_summary = canonical.get("case_summary")
+    if isinstance(case_summary, Mapping):
+        canonical["case_summary"] = {
+            key: value
+            for key, value in case_summary.items()
+            if key not in VOLATILE_CASE_FIELDS
+        }
+    return canonical
+
+
+def build_cache_key(
+    *,
+    model: str,
+    generation_params: Mapping[str, Any],
+    system_prompt: str,
+    payload: Mapping[str, Any],
+) -> str:
+    """Hash the model, generation params, system prompt and canonical payload."""
+
+    payload_hash = hashlib.sha256(
+        json.dumps(canonical_payload(payload), sort_keys=True, ensure_ascii=True, default=str)
+        .encode("utf-8")
+    ).hexdigest()
+    material = json.dumps(
+        {
+            "model": model,
+            "params": dict(generation_params),
+            "system_prompt": system_prompt,
+            "payload_sha256": payload_hash,
+        },
+        sort_keys=True,
+        ensure_ascii=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """One JSON file per key; least-recently-used files are evicted past `max_bytes`.
+
+    Storage errors are best-effort: an unreadable entry is a miss and a failed
+    write is skipped, so a full or read-only disk never fails generation.
+    """
+
+    def __init__(self, config: ResponseCacheConfig | None = None):
+        self.config = config or ResponseCacheConfig()
+        self.config.validate()
+        self.directory = Path(self.config.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._approx_bytes: int | None = None
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._errors = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as exc:
+            with self._lock:
+                self._misses += 1
+                if not isinstance(exc, FileNotFoundError):
+                    self._errors += 1
+            return None
+
+        if time.time() - float(entry.get("created_at", 0)) > self.config.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return entry.get("value")
+
+    def set(self, key: str, value: Mapping[str, Any]) -> None:
+        path = self._path(key)
+        body = json.dumps(
+            {"created_at": time.time(), "value": dict(value)}, ensure_ascii=True
+        )
+        tmp_path = path.with_suffix(f".{os.getpid()}.{get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            with self._lock:
+                self._errors += 1
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_bytes()
+            else:
+                self._approx_bytes += len(body)
+            over_budget = self._approx_bytes > self.config.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least-recently-used until under 90% of `max_bytes`.
+
+        Expiry uses each entry's `created_at`; recency uses file mtime, which
+        `get` refreshes on every hit.
+        """
+
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.config.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            expired = now - self._created_at(path) > self.config.ttl_seconds
+            if not expired and total <= target:
+                continue
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._approx_bytes = total
+            self._evictions += removed
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "errors": self._errors,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def _scan_bytes(self) -> int:
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    @staticmethod
+    def _created_at(path: Path) -> float:
+        try:
+            return float(json.loads(path.read_text()).get("created_at", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0.0
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+_DEFAULT_CACHES: dict[str, ResponseCache] = {}
+_DEFAULT_CACHES_LOCK = Lock()
+
+
+def default_response_cache(config: ResponseCacheConfig | None = None) -> ResponseCache | None:
+    """Return the process-wide cache for the configured directory, or None if disabled."""
+
+    resolved = config or build_response_cache_config()
+    if not resolved.enabled:
+        return None
+    with _DEFAULT_CACHES_LOCK:
+        cache = _DEFAULT_CACHES.get(resolved.directory)
+        if cache is None:
+            cache = ResponseCache(resolved)
+            _DEFAULT_CACHES[resolved.directory] = cache
+        return cache
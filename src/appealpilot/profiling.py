@@ -0,0 +1,312 @@
+"""Opt-in profiling of pipeline runs, index builds and API handlers.
+
+`APPEALPILOT_PROFILE` selects when a call is profiled:
+
+- `off` (default): nothing is wrapped beyond one boolean check
+- a number in (0, 1]: that fraction of calls, e.g. `0.01`; `on` means every call
+- `header`: only API requests sent with `X-AppealPilot-Profile: 1`
+
+The header also forces profiling in sampling mode. Profiles are written per
+call to `APPEALPILOT_PROFILE_DIR` (default `data/interim/profiles`), keeping the
+newest `max_files`. Two formats are supported: `pstats` (cProfile, open with
+`python -m pstats` or snakeviz) and `collapsed` (a sampling thread that
+records `frame;frame;frame count` lines for flamegraph tools and speedscope).
+
+Nested profiled calls on the same thread are folded into the outermost one.
+Only the calling thread is profiled, so work handed to executor threads is not
+included.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, TypeVar
+
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parent / "config" / "settings.yaml"
+PROFILE_HEADER = "X-AppealPilot-Profile"
+PROFILE_MODES = ("off", "sample", "header")
+PROFILE_FORMATS = ("pstats", "collapsed")
+
+_T = TypeVar("_T", bound=Callable[..., Any])
+
+
+class ProfileConfigError(ValueError):
+    """Raised when profiling configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    mode: str = "off"
+    # Fraction of calls profiled in `sample` mode.
+    sample_rate: float = 0.0
+    format: str = "pstats"
+    directory: str = "data/interim/profiles"
+    max_files: int = 200
+    # Stack sampling period for the `collapsed` format.
+    sample_interval_seconds: float = 0.005
+
+    def validate(self) -> None:
+        if self.mode not in PROFILE_MODES:
+            raise ProfileConfigError(f"profile mode must be one of {', '.join(PROFILE_MODES)}.")
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ProfileConfigError("profile sample_rate must be between 0 and 1.")
+        if self.format not in PROFILE_FORMATS:
+            raise ProfileConfigError(
+                f"profile format must be one of {', '.join(PROFILE_FORMATS)}."
+            )
+        if self.max_files < 1:
+            raise ProfileConfigError("profile max_files must be >= 1.")
+        if self.sample_interval_seconds <= 0:
+            raise ProfileConfigError("profile sample_interval_seconds must be > 0.")
+
+
+def _parse_profile_setting(value: Any) -> dict[str, Any]:
+    """Map an `APPEALPILOT_PROFILE`-style value to `mode`/`sample_rate`."""
+
+    text = str(value).strip().lower()
+    if text in {"", "off", "0", "false", "no"}:
+        return {"mode": "off", "sample_rate": 0.0}
+    if text in {"on", "true", "yes", "always"}:
+        return {"mode": "sample", "sample_rate": 1.0}
+    if text == "header":
+        return {"mode": "header", "sample_rate": 0.0}
+    try:
+        rate = float(text)
+    except ValueError as exc:
+        raise ProfileConfigError(f"Unrecognized profile setting {value!r}.") from exc
+    return {"mode": "sample" if rate > 0 else "off", "sample_rate": rate}
+
+
+def _load_profiling_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ProfileConfigError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+    section = loaded.get("profiling", {}) or {}
+    if not isinstance(section, dict):
+        raise ProfileConfigError("`profiling` in settings.yaml must be a mapping.")
+    return section
+
+
+def build_profile_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> ProfileConfig:
+    """Build config from settings.yaml + env vars + explicit overrides.
+
+    `profile` (settings key or `APPEALPILOT_PROFILE`) accepts the shorthand
+    values described in the module docstring.
+    """
+
+    merged = dict(_load_profiling_from_settings(settings_path))
+    env = {
+        "profile": os.getenv("APPEALPILOT_PROFILE"),
+        "directory": os.getenv("APPEALPILOT_PROFILE_DIR"),
+        "format": os.getenv("APPEALPILOT_PROFILE_FORMAT"),
+    }
+    merged.update({key: value for key, value in env.items() if value not in (None, "")})
+    if overrides:
+        merged.update(overrides)
+    if merged.get("profile") is not None:
+        merged.update(_parse_profile_setting(merged.pop("profile")))
+
+    config = ProfileConfig(
+        mode=str(merged.get("mode") or "off"),
+        sample_rate=float(merged.get("sample_rate") or 0.0),
+        format=str(merged.get("format") or "pstats"),
+        directory=str(merged.get("directory") or "data/interim/profiles"),
+        max_files=int(merged.get("max_files") or 200),
+        sample_interval_seconds=float(merged.get("sample_interval_seconds") or 0.005),
+    )
+    config.validate()
+    return config
+
+
+_CONFIG: ProfileConfig | None = None
+_CONFIG_LOCK = threading.Lock()
+_ACTIVE = threading.local()
+_SEQUENCE = itertools.count(1)
+_FORCED: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "appealpilot_profile_forced", default=False
+)
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profile_config() -> ProfileConfig:
+    """Process-wide config, built on first use."""
+
+    global _CONFIG
+    if _CONFIG is None:
+        with _CONFIG_LOCK:
+            if _CONFIG is None:
+                _CONFIG = build_profile_config()
+    return _CONFIG
+
+
+def configure_profiling(config: ProfileConfig | None) -> None:
+    """Replace the process-wide config (None rebuilds it from settings/env on next use)."""
+
+    global _CONFIG
+    if config is not None:
+        config.validate()
+    with _CONFIG_LOCK:
+        _CONFIG = config
+
+
+@contextmanager
+def force_profiling(enabled: bool = True) -> Iterator[None]:
+    """Profile calls made in this context regardless of sampling (unless mode is off)."""
+
+    token = _FORCED.set(enabled)
+    try:
+        yield
+    finally:
+        _FORCED.reset(token)
+
+
+def _should_profile(config: ProfileConfig) -> bool:
+    if config.mode == "off" or getattr(_ACTIVE, "depth", 0):
+        return False
+    if _FORCED.get():
+        return True
+    return config.mode == "sample" and random.random() < config.sample_rate
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[Path | None]:
+    """Profile the block when the config selects this call.
+
+    Yields None; the written profile path is available afterwards via
+    `last_profile_path()` on the same thread.
+    """
+
+    config = profile_config()
+    if not _should_profile(config):
+        yield None
+        return
+
+    _ACTIVE.depth = 1
+    try:
+        if config.format == "collapsed":
+            with _StackSampler(config.sample_interval_seconds) as sampler:
+                yield None
+            payload = sampler.render()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield None
+            finally:
+                profiler.disable()
+            payload = profiler
+        _ACTIVE.last_path = _write_profile(config, name, payload)
+    finally:
+        _ACTIVE.depth = 0
+
+
+def last_profile_path() -> Path | None:
+    """Path of the most recent profile written on this thread."""
+
+    return getattr(_ACTIVE, "last_path", None)
+
+
+def profile_call(name: str) -> Callable[[_T], _T]:
+    """Decorator form of `profiled`."""
+
+    def decorator(func: _T) -> _T:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if profile_config().mode == "off":
+                return func(*args, **kwargs)
+            with profiled(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class _StackSampler:
+    """Samples the calling thread's Python stack on a background thread."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.thread_id = threading.get_ident()
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "_StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def render(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def _write_profile(config: ProfileConfig, name: str, payload: Any) -> Path:
+    directory = Path(config.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    suffix = "collapsed" if config.format == "collapsed" else "prof"
+    safe_name = _UNSAFE_NAME.sub("_", name).strip("_") or "call"
+    path = directory / f"{stamp}-{safe_name}-{os.getpid()}-{next(_SEQUENCE)}.{suffix}"
+    if isinstance(payload, str):
+        path.write_text(payload)
+    else:
+        payload.dump_stats(str(path))
+    _rotate(directory, config.max_files)
+    return path
+
+
+def _rotate(directory: Path, max_files: int) -> None:
+    files = []
+    for path in directory.iterdir():
+        if path.suffix in {".prof", ".collapsed"}:
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+    files.sort()
+    for _, path in files[: max(0, len(files) - max_files)]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
 import math
 import os
@@ -13,6 +14,8 @@ from pathlib import Path
 from threading import Lock
 from typing import Any, Iterable, Mapping, Sequence
 
+from appealpilot import metrics
+
 DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
 TOKEN_PATTERN = re.compile(r"[a-zA-Z0-9_]+")
 CHARS_PER_TOKEN_ESTIMATE = 3
@@ -23,12 +26,19 @@ DEFAULT_SBERT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_INSURANCE_BERT_MODEL = "llmware/industry-bert-insurance-v0.1"
 _SBERT_MODEL_CACHE: dict[str, Any] = {}
 _SBERT_MODEL_CACHE_LOCK = Lock()
+EMBEDDING_CACHE_ENV = "APPEALPILOT_EMBEDDING_CACHE"
+EMBEDDING_CACHE_MODE_ENV = "APPEALPILOT_EMBEDDING_CACHE_MODE"
+EMBEDDING_CACHE_MODES = ("record", "replay")
 
 
 class RetrievalConfigError(ValueError):
     """Raised when retrieval configuration is invalid."""
 
 
+class EmbeddingCacheMissError(RetrievalConfigError):
+    """Raised in replay mode when a text has no cached embedding."""
+
+
 @dataclass(frozen=True)
 class RetrievalConfig:
     """Runtime config for Chroma-based retrieval."""
@@ -341,6 +351,104 @@ class SentenceTransformerEmbeddingFunction:
         return self(input)
 
 
+class CachedEmbeddingFunction:
+    """JSONL record/replay cache for paid (OpenAI) embeddings, keyed by model + text.
+
+    `record` serves cached texts and embeds the rest with `inner`, appending
+    them to the file; `replay` never calls the provider and raises
+    `EmbeddingCacheMissError` for unseen texts. Reports the same `name()` as
+    chroma's OpenAI function so collections built either way stay compatible.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        model_name: str,
+        inner: Any | None = None,
+        mode: str = "record",
+    ):
+        if mode not in EMBEDDING_CACHE_MODES:
+            raise RetrievalConfigError(
+                f"Embedding cache mode must be one of {', '.join(EMBEDDING_CACHE_MODES)}."
+            )
+        if mode == "record" and inner is None:
+            raise RetrievalConfigError("Recording embeddings needs the provider function.")
+        self.path = Path(path)
+        self.model_name = model_name
+        self.inner = inner
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._vectors: dict[str, list[float]] = {}
+        if self.path.exists():
+            for line in self.path.read_text().splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self._vectors[entry["key"]] = entry["embedding"]
+
+    @staticmethod
+    def name() -> str:
+        return "openai"
+
+    @classmethod
+    def build_from_config(cls, config: Mapping[str, Any]) -> "CachedEmbeddingFunction":
+        # Collections reopened without a function get a replay-only cache.
+        return cls(config["path"], config["model_name"], mode="replay")
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def supported_spaces(self) -> list[str]:
+        return ["cosine", "l2", "ip"]
+
+    def get_config(self) -> dict[str, Any]:
+        return {"model_name": self.model_name, "path": str(self.path)}
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def __call__(self, input: Sequence[str]) -> list[list[float]]:
+        keys = [self._key(text) for text in input]
+        with self._lock:
+            missing = sorted(
+                {index for index, key in enumerate(keys) if key not in self._vectors}
+            )
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            if self.mode == "replay":
+                raise EmbeddingCacheMissError(
+                    f"{len(missing)} text(s) have no cached embedding in {self.path}."
+                )
+            vectors = self.inner([input[index] for index in missing])
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a") as handle:
+                    for index, vector in zip(missing, vectors):
+                        embedding = [float(value) for value in vector]
+                        self._vectors[keys[index]] = embedding
+                        handle.write(json.dumps({"key": keys[index], "embedding": embedding}))
+                        handle.write("\n")
+        return [self._vectors[key] for key in keys]
+
+    def embed_documents(self, input: Sequence[str]) -> list[list[float]]:
+        return self(input)
+
+    def embed_query(self, input: str | Sequence[str]) -> list[list[float]]:
+        if isinstance(input, str):
+            return self([input])
+        return self(input)
+
+
+def _embedding_cache_settings() -> tuple[str, str] | None:
+    path = os.getenv(EMBEDDING_CACHE_ENV)
+    if not path:
+        return None
+    mode = (os.getenv(EMBEDDING_CACHE_MODE_ENV) or "record").strip().lower()
+    return path, mode
+
+
 def resolve_embedding_provider(config: RetrievalConfig) -> str:
     """Resolve embedding provider with sensible runtime fallback."""
 
@@ -350,7 +458,9 @@ def resolve_embedding_provider(config: RetrievalConfig) -> str:
             "embedding_provider must be one of: openai, hash, sbert, insurance_bert (or local)."
         )
 
-    if provider == "openai" and not os.getenv("OPENAI_API_KEY"):
+    cache = _embedding_cache_settings()
+    replaying = cache is not None and cache[1] == "replay"
+    if provider == "openai" and not os.getenv("OPENAI_API_KEY") and not replaying:
         return "hash"
     return provider
 
@@ -381,17 +491,21 @@ def _build_embedding_function(config: RetrievalConfig) -> tuple[Any, str]:
             "OpenAI embeddings require chromadb OpenAI embedding dependencies."
         ) from exc
 
-    return (
-        OpenAIEmbeddingFunction(
-            api_key=os.environ["OPENAI_API_KEY"],
-            model_name=_resolve_embedding_model_name(
-                raw_model=config.embedding_model,
-                expected_providers="openai",
-                default_model="text-embedding-3-small",
-            ),
-        ),
-        provider,
+    model_name = _resolve_embedding_model_name(
+        raw_model=config.embedding_model,
+        expected_providers="openai",
+        default_model="text-embedding-3-small",
     )
+    cache = _embedding_cache_settings()
+    inner = None
+    if cache is None or cache[1] != "replay":
+        inner = OpenAIEmbeddingFunction(
+            api_key=os.environ["OPENAI_API_KEY"], model_name=model_name
+        )
+    if cache is None:
+        return inner, provider
+    path, mode = cache
+    return CachedEmbeddingFunction(path, model_name, inner=inner, mode=mode), provider
 
 
 class ChromaRetriever:
@@ -539,6 +653,12 @@ class ChromaRetriever:
             texts=texts,
             metadatas=metadatas,
         ):
+            metrics.observe(
+                "appealpilot_embedding_batch_size",
+                len(batch_texts),
+                provider=self.embedding_provider,
+                operation="upsert",
+            )
             self.collection.upsert(
                 ids=batch_ids,
                 documents=batch_texts,
@@ -546,37 +666,104 @@ class ChromaRetriever:
             )
         return len(ids)
 
+    @property
+    def embedding_signature(self) -> dict[str, Any]:
+        """Provider, model and dimensions; vectors are comparable only when these match."""
+
+        get_config = getattr(self._embedding_function, "get_config", None)
+        config = get_config() if callable(get_config) else {}
+        return {
+            "provider": self.embedding_provider,
+            "model": config.get("model_name"),
+            "dimensions": config.get("dimensions"),
+        }
+
+    def embed_queries(self, query_texts: Sequence[str]) -> list[list[float]]:
+        """Embed queries exactly as `query_many` would, for callers that reuse the vectors."""
+
+        if not query_texts:
+            return []
+        metrics.observe(
+            "appealpilot_embedding_batch_size",
+            len(query_texts),
+            provider=self.embedding_provider,
+            operation="query",
+        )
+        embed = getattr(self._embedding_function, "embed_query", self._embedding_function)
+        return [[float(value) for value in vector] for vector in embed(list(query_texts))]
+
     def query(
         self,
         query_text: str,
         top_k: int | None = None,
         where: Mapping[str, Any] | None = None,
+        query_embedding: Sequence[float] | None = None,
     ) -> list[RetrievedDocument]:
         """Run vector search and return normalized result objects."""
 
+        return self.query_many(
+            [query_text],
+            top_k=top_k,
+            where=where,
+            query_embeddings=[query_embedding] if query_embedding is not None else None,
+        )[0]
+
+    def query_many(
+        self,
+        query_texts: Sequence[str],
+        top_k: int | None = None,
+        where: Mapping[str, Any] | None = None,
+        query_embeddings: Sequence[Sequence[float]] | None = None,
+    ) -> list[list[RetrievedDocument]]:
+        """Search several queries in one call (queries are embedded as one batch).
+
+        Pass `query_embeddings` (from `embed_queries`) to skip embedding the texts again.
+        """
+
+        if not query_texts:
+            return []
         n_results = top_k or self.config.top_k
+        if query_embeddings is None:
+            metrics.observe(
+                "appealpilot_embedding_batch_size",
+                len(query_texts),
+                provider=self.embedding_provider,
+                operation="query",
+            )
+            search: dict[str, Any] = {"query_texts": list(query_texts)}
+        else:
+            if len(query_embeddings) != len(query_texts):
+                raise RetrievalConfigError("query_embeddings must match query_texts one to one.")
+            search = {"query_embeddings": [list(vector) for vector in query_embeddings]}
         query_result = self.collection.query(
-            query_texts=[query_text],
+            **search,
             n_results=n_results,
             where=dict(where) if where else None,
         )
 
-        ids = (query_result.get("ids") or [[]])[0]
-        docs = (query_result.get("documents") or [[]])[0]
-        metas = (query_result.get("metadatas") or [[]])[0]
-        distances = (query_result.get("distances") or [[]])[0]
-
-        results: list[RetrievedDocument] = []
-        for index, doc_id in enumerate(ids):
-            text = docs[index] if index < len(docs) else ""
-            metadata = metas[index] if index < len(metas) and metas[index] else {}
-            distance = distances[index] if index < len(distances) else None
-            results.append(
-                RetrievedDocument(
-                    doc_id=doc_id,
-                    text=text,
-                    metadata=metadata,
-                    distance=distance,
+        def column(name: str, index: int) -> list[Any]:
+            values = query_result.get(name) or []
+            return list(values[index] or []) if index < len(values) else []
+
+        batches: list[list[RetrievedDocument]] = []
+        for query_index in range(len(query_texts)):
+            ids = column("ids", query_index)
+            docs = column("documents", query_index)
+            metas = column("metadatas", query_index)
+            distances = column("distances", query_index)
+
+            results: list[RetrievedDocument] = []
+            for index, doc_id in enumerate(ids):
+                text = docs[index] if index < len(docs) else ""
+                metadata = metas[index] if index < len(metas) and metas[index] else {}
+                distance = distances[index] if index < len(distances) else None
+                results.append(
+                    RetrievedDocument(
+                        doc_id=doc_id,
+                        text=text,
+                        metadata=metadata,
+                        distance=distance,
+                    )
                 )
-            )
-        return results
+            batches.append(results)
+        return batches
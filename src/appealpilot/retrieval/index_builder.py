@@ -5,12 +5,19 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Mapping
 
+from appealpilot.models.model_a_centroid import (
+    build_category_centroids,
+    category_centroids_path,
+)
+from appealpilot.profiling import profile_call
+
 from .chroma_retriever import ChromaRetriever, build_retrieval_config
 from .dfs_ingest import load_dfs_documents
 
 DEFAULT_DFS_XLSX = Path("data/raw/dfs_external_appeals/ny_dfs_external_appeals_all_years.xlsx")
 
 
+@profile_call("retrieval.rebuild_index")
 def rebuild_retrieval_index(
     xlsx_path: Path = DEFAULT_DFS_XLSX,
     limit: int | None = None,
@@ -18,7 +25,10 @@ def rebuild_retrieval_index(
     settings_path: Path | None = None,
     overrides: Mapping[str, Any] | None = None,
 ) -> dict[str, Any]:
-    """Build or refresh the retrieval collection and return build stats."""
+    """Build or refresh the retrieval collection and return build stats.
+
+    Also writes the per-category embedding centroids used by the Model A fallback.
+    """
 
     config = build_retrieval_config(
         settings_path=settings_path or Path("src/appealpilot/config/settings.yaml"),
@@ -42,11 +52,21 @@ def rebuild_retrieval_index(
     documents = load_dfs_documents(xlsx_path=xlsx_path, limit=limit)
     inserted = retriever.upsert_documents(documents)
 
+    centroids_path = category_centroids_path(config.persist_directory, config.collection_name)
+    centroids = build_category_centroids(retriever)
+    if centroids is not None:
+        centroids.save(centroids_path)
+    else:
+        centroids_path.unlink(missing_ok=True)
+
     return {
         "embedding_provider": retriever.embedding_provider,
         "collection_name": config.collection_name,
         "documents_upserted": inserted,
         "collection_size": retriever.count(),
         "persist_directory": config.persist_directory,
+        "category_centroids": (
+            dict(zip(centroids.categories, centroids.counts)) if centroids else {}
+        ),
         "xlsx_path": str(xlsx_path),
     }
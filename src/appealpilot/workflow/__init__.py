@@ -1,5 +1,42 @@
 """Workflow orchestration for end-to-end denial appeal generation."""
 
-from .appeal_pipeline import AppealPipeline, AppealPipelineConfig, run_pipeline_once
+from .appeal_pipeline import (
+    AppealPipeline,
+    AppealPipelineConfig,
+    coalescing_stats,
+    run_generation_request,
+    run_pipeline_once,
+    stream_generation_request,
+    summarize_packet,
+)
+from .batch_generation import BatchAppealRunner
+from .bulk_runner import BulkRunConfig, BulkRunError, load_bulk_cases, run_bulk
+from .job_queue import (
+    AppealJobQueue,
+    AppealJobWorkerPool,
+    JobQueueConfig,
+    JobQueueError,
+    build_job_queue_config,
+    run_appeal_job,
+)
 
-__all__ = ["AppealPipeline", "AppealPipelineConfig", "run_pipeline_once"]
+__all__ = [
+    "AppealPipeline",
+    "AppealPipelineConfig",
+    "run_pipeline_once",
+    "run_generation_request",
+    "stream_generation_request",
+    "summarize_packet",
+    "coalescing_stats",
+    "BatchAppealRunner",
+    "BulkRunConfig",
+    "BulkRunError",
+    "load_bulk_cases",
+    "run_bulk",
+    "AppealJobQueue",
+    "AppealJobWorkerPool",
+    "JobQueueConfig",
+    "JobQueueError",
+    "build_job_queue_config",
+    "run_appeal_job",
+]
@@ -2,24 +2,42 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import os
-from dataclasses import dataclass
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping, Sequence
+from typing import Any, Iterator, Mapping, Sequence
 
-from appealpilot.domain import AppealPacket, EvidenceItem
+from appealpilot import metrics
+from appealpilot.profiling import profile_call
+from appealpilot.domain import AppealPacket, DenialClassification, EvidenceItem, ParsedDenial
 from appealpilot.ingest import parse_denial_text
 from appealpilot.models import (
     ModelCGenerator,
     ModelCResponseError,
     TemplateModelCGenerator,
     build_model_c_config,
+    build_model_a_config,
+    build_model_c_router_config,
     classify_denial_reason,
+    default_model_c_router,
+    default_response_cache,
 )
+from appealpilot.models.model_a_centroid import category_centroids_path, load_category_centroids
 from appealpilot.retrieval import ChromaRetriever, build_retrieval_config
 
+from .deadline import Deadline, generation_executor
+from .evidence_compression import (
+    EvidenceCompressionConfig,
+    build_evidence_compression_config,
+    compress_evidence,
+)
+from .instrumentation import Trace
+from .single_flight import SingleFlight, build_request_key
+
 ATTACHMENT_GUIDANCE: dict[str, tuple[str, ...]] = {
     "medical_necessity": (
         "Provider progress note",
@@ -49,6 +67,20 @@ class AppealPipelineConfig:
     output_root: str = "outputs/appeals"
     top_k: int = 5
     generation_runtime: str = "auto"  # auto | aisuite | template
+    coalesce_requests: bool = True
+    # End-to-end budget; past it the template packet is returned. None disables.
+    latency_budget_seconds: float | None = None
+
+
+# Shared across pipeline instances so API handlers that build a pipeline per
+# request still coalesce identical concurrent runs.
+PIPELINE_SINGLE_FLIGHT: SingleFlight[AppealPacket] = SingleFlight()
+
+
+def coalescing_stats() -> dict[str, int]:
+    """Return executed/coalesced counters for the shared single-flight group."""
+
+    return PIPELINE_SINGLE_FLIGHT.stats()
 
 
 class AppealPipeline:
@@ -58,10 +90,24 @@ class AppealPipeline:
         self,
         config: AppealPipelineConfig | None = None,
         retrieval_overrides: Mapping[str, Any] | None = None,
+        compression_config: EvidenceCompressionConfig | None = None,
     ):
         self.config = config or AppealPipelineConfig()
         self.retrieval_config = build_retrieval_config(overrides=retrieval_overrides)
         self.retriever = ChromaRetriever(self.retrieval_config)
+        self.compression_config = compression_config or build_evidence_compression_config()
+        self.model_a_config = build_model_a_config()
+        self.category_centroids = (
+            load_category_centroids(
+                category_centroids_path(
+                    self.retrieval_config.persist_directory,
+                    self.retrieval_config.collection_name,
+                ),
+                self.retriever.embedding_signature,
+            )
+            if self.model_a_config.embedding_fallback
+            else None
+        )
 
     def _build_query_text(
         self,
@@ -112,40 +158,221 @@ class AppealPipeline:
         runtime = self.config.generation_runtime
         if runtime == "template":
             return TemplateModelCGenerator()
-        if runtime == "aisuite":
-            return ModelCGenerator()
 
         model_c_config = build_model_c_config()
+        router_config = build_model_c_router_config()
+        if runtime == "auto":
+            # Only route to providers whose API key is configured.
+            available = tuple(
+                model
+                for model in router_config.models
+                if f"{model.split(':', maxsplit=1)[0].upper()}_API_KEY" in os.environ
+            )
+            router_config = replace(router_config, models=available)
+        if router_config.enabled:
+            return default_model_c_router(
+                router_config, model_c_config, cache=default_response_cache()
+            )
+        if runtime == "aisuite":
+            return ModelCGenerator(config=model_c_config, cache=default_response_cache())
+
         if model_c_config.provider in {"openai", "groq"}:
             key_name = (
                 "OPENAI_API_KEY" if model_c_config.provider == "openai" else "GROQ_API_KEY"
             )
             if key_name in os.environ:
-                return ModelCGenerator(config=model_c_config)
+                return ModelCGenerator(config=model_c_config, cache=default_response_cache())
         return TemplateModelCGenerator()
 
+    @profile_call("pipeline.run")
     def run(
         self,
-        denial_text: str,
+        denial_text: str | ParsedDenial,
         chart_notes: str | None = None,
         top_k: int | None = None,
         additional_instructions: str | None = None,
+        latency_budget_seconds: float | None = None,
     ) -> AppealPacket:
-        parsed = parse_denial_text(denial_text)
-        classification = classify_denial_reason(parsed.denial_reason_text)
-
-        query_text = self._build_query_text(
-            denial_reason=parsed.denial_reason_text,
-            denial_category=classification.category,
-            payer=parsed.payer,
-            codes=parsed.cpt_hcpcs_codes,
-            chart_notes=chart_notes,
+        """Run the pipeline, coalescing identical concurrent requests.
+
+        Requests whose inputs differ only in whitespace share one run, so a
+        coalesced caller's `chart_notes_excerpt` reflects the leader's raw
+        text. Coalesced callers receive a deep copy of the leader's packet.
+
+        `latency_budget_seconds` (default: the config's) bounds the whole run;
+        if Model C has not answered when it runs out, the speculatively built
+        template packet is returned with `fallback_reason="deadline_exceeded"`.
+
+        `denial_text` may also be an already parsed denial, e.g. from
+        `parse_denial_file` for documents too large to load whole.
+        """
+
+        budget = (
+            latency_budget_seconds
+            if latency_budget_seconds is not None
+            else self.config.latency_budget_seconds
         )
+        deadline = Deadline.start(budget)
+        if not self.config.coalesce_requests:
+            return self._run_uncoalesced(
+                denial_text, chart_notes, top_k, additional_instructions, deadline
+            )
 
-        raw_results = self.retriever.query(
-            query_text=query_text,
+        key = build_request_key(
+            denial_text=(
+                denial_text
+                if isinstance(denial_text, str)
+                else json.dumps(asdict(denial_text), sort_keys=True)
+            ),
+            chart_notes=chart_notes,
             top_k=top_k or self.config.top_k,
+            generation_runtime=self.config.generation_runtime,
+            retrieval=asdict(self.retrieval_config),
+            evidence_compression=asdict(self.compression_config),
+            additional_instructions=additional_instructions,
+            latency_budget_seconds=budget,
+        )
+        packet, shared = PIPELINE_SINGLE_FLIGHT.do(
+            key,
+            lambda: self._run_uncoalesced(
+                denial_text, chart_notes, top_k, additional_instructions, deadline
+            ),
+        )
+        return copy.deepcopy(packet) if shared else packet
+
+    def _prepare(
+        self,
+        denial_text: str | ParsedDenial,
+        chart_notes: str | None,
+        top_k: int | None,
+        additional_instructions: str | None,
+        trace: Trace | None = None,
+    ) -> tuple[dict[str, Any], Any, list[EvidenceItem], dict[str, Any], dict[str, Any] | None]:
+        """Run parse/classify/retrieve and build the Model C payload.
+
+        Also returns evidence compression stats (None when compression is off).
+        """
+
+        trace = trace or Trace()
+        parsed, classification, query_text = self._plan_case(denial_text, chart_notes, trace)
+        (classification,), embeddings = self._embedding_fallback(
+            [classification], [query_text], trace
+        )
+        with trace.span("retrieve", top_k=top_k or self.config.top_k) as span:
+            reuse = {"query_embedding": embeddings[0]} if embeddings else {}
+            raw_results = self.retriever.query(
+                query_text=query_text,
+                top_k=top_k or self.config.top_k,
+                **reuse,
+            )
+            span["result_count"] = len(raw_results)
+        return self._assemble_case(
+            parsed,
+            classification,
+            query_text,
+            raw_results,
+            chart_notes,
+            additional_instructions,
+            trace,
         )
+
+    def _plan_case(
+        self,
+        denial_text: str | ParsedDenial,
+        chart_notes: str | None,
+        trace: Trace | None = None,
+    ) -> tuple[ParsedDenial, DenialClassification, str]:
+        """Parse (unless already parsed) and classify the denial and build its retrieval query."""
+
+        trace = trace or Trace()
+        if isinstance(denial_text, ParsedDenial):
+            parsed = denial_text
+        else:
+            with trace.span("parse", denial_chars=len(denial_text)):
+                parsed = parse_denial_text(denial_text)
+        with trace.span("classify") as span:
+            classification = classify_denial_reason(parsed.denial_reason_text)
+            span["category"] = classification.category
+        with trace.span("query_build") as span:
+            query_text = self._build_query_text(
+                denial_reason=parsed.denial_reason_text,
+                denial_category=classification.category,
+                payer=parsed.payer,
+                codes=parsed.cpt_hcpcs_codes,
+                chart_notes=chart_notes,
+            )
+            span["query_chars"] = len(query_text)
+        return parsed, classification, query_text
+
+    def _embedding_fallback(
+        self,
+        classifications: Sequence[DenialClassification],
+        query_texts: Sequence[str],
+        trace: Trace | None = None,
+    ) -> tuple[list[DenialClassification], list[list[float]] | None]:
+        """Reclassify `other` cases by nearest category centroid.
+
+        The query texts are embedded once, as retrieval would. The vectors are
+        returned so they can be handed to `query_many`. Returns None in place
+        of the vectors when no case needed the fallback.
+        """
+
+        pending = [
+            index
+            for index, classification in enumerate(classifications)
+            if classification.category == "other"
+        ]
+        if self.category_centroids is None or not pending:
+            return list(classifications), None
+        with (trace or Trace()).span("classify_embedding", cases=len(pending)) as span:
+            embeddings = self.retriever.embed_queries(query_texts)
+            fallbacks = self.category_centroids.classify_many(
+                [embeddings[index] for index in pending],
+                min_similarity=self.model_a_config.centroid_min_similarity,
+            )
+            updated = list(classifications)
+            for index, fallback in zip(pending, fallbacks):
+                if fallback is not None:
+                    updated[index] = fallback
+            span["reclassified"] = sum(fallback is not None for fallback in fallbacks)
+            if len(classifications) == 1:
+                span["category"] = updated[0].category
+        return updated, embeddings
+
+    def _assemble_case(
+        self,
+        parsed: ParsedDenial,
+        classification: DenialClassification,
+        query_text: str,
+        raw_results: Sequence[Any],
+        chart_notes: str | None,
+        additional_instructions: str | None,
+        trace: Trace | None = None,
+    ) -> tuple[dict[str, Any], Any, list[EvidenceItem], dict[str, Any], dict[str, Any] | None]:
+        """Build the `_prepare` tuple from a planned case and its retrieval results."""
+
+        with (trace or Trace()).span("evidence") as span:
+            prepared = self._build_prepared(
+                parsed,
+                classification,
+                query_text,
+                raw_results,
+                chart_notes,
+                additional_instructions,
+            )
+            span["evidence_count"] = len(prepared[2])
+            span.update(prepared[4] or {})
+        return prepared
+
+    def _build_prepared(
+        self,
+        parsed: ParsedDenial,
+        classification: DenialClassification,
+        query_text: str,
+        raw_results: Sequence[Any],
+        chart_notes: str | None,
+        additional_instructions: str | None,
+    ) -> tuple[dict[str, Any], Any, list[EvidenceItem], dict[str, Any], dict[str, Any] | None]:
         evidence_items = self._normalize_evidence(raw_results)
         attachments = self._build_required_attachments(classification.category)
 
@@ -160,43 +387,228 @@ class AppealPipeline:
             "generated_at_utc": datetime.now(timezone.utc).isoformat(),
         }
 
-        generator = self._select_generator()
+        retrieved_evidence = [
+            {
+                "source_id": item.source_id,
+                "snippet": item.snippet,
+                "metadata": dict(item.metadata),
+                "distance": item.distance,
+            }
+            for item in evidence_items
+        ]
+        compression = None
+        if self.compression_config.enabled and retrieved_evidence:
+            retrieved_evidence, compression = compress_evidence(
+                query_text,
+                retrieved_evidence,
+                [result.text for result in raw_results],
+                self.compression_config,
+            )
+
         generator_payload = {
             "case_summary": case_summary,
-            "retrieved_evidence": [
-                {
-                    "source_id": item.source_id,
-                    "snippet": item.snippet,
-                    "metadata": dict(item.metadata),
-                    "distance": item.distance,
-                }
-                for item in evidence_items
-            ],
+            "retrieved_evidence": retrieved_evidence,
             "required_attachments": attachments,
             "additional_instructions": additional_instructions,
         }
-        try:
-            generated = generator.generate(**generator_payload)
-        except ModelCResponseError as exc:
-            fallback_generator = TemplateModelCGenerator()
-            generated = fallback_generator.generate(**generator_payload)
-            generated["fallback_reason"] = str(exc)
-            source_config = getattr(generator, "config", None)
-            source_model = getattr(source_config, "model", "unknown")
-            source_provider = getattr(source_config, "provider", "unknown")
-            generated["fallback_from"] = {
-                "provider": source_provider,
-                "model": source_model,
-            }
+        return case_summary, classification, evidence_items, generator_payload, compression
+
+    @staticmethod
+    def _template_fallback(
+        generator: Any,
+        generator_payload: Mapping[str, Any],
+        exc: Exception | str,
+        template: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        generated = template or TemplateModelCGenerator().generate(**generator_payload)
+        generated["fallback_reason"] = str(exc)
+        source_config = getattr(generator, "config", None)
+        source_model = getattr(source_config, "model", "unknown")
+        source_provider = getattr(source_config, "provider", "unknown")
+        generated["fallback_from"] = {
+            "provider": source_provider,
+            "model": source_model,
+        }
+        routing = getattr(exc, "routing", None)
+        if routing is not None:
+            generated["routing"] = routing
+        return generated
+
+    def _run_uncoalesced(
+        self,
+        denial_text: str | ParsedDenial,
+        chart_notes: str | None,
+        top_k: int | None,
+        additional_instructions: str | None,
+        deadline: Deadline | None = None,
+    ) -> AppealPacket:
+        deadline = deadline or Deadline.start(None)
+        trace = Trace()
+        return self._complete_packet(
+            self._prepare(denial_text, chart_notes, top_k, additional_instructions, trace),
+            deadline,
+            trace,
+        )
+
+    def _complete_packet(
+        self,
+        prepared: tuple[
+            dict[str, Any], Any, list[EvidenceItem], dict[str, Any], dict[str, Any] | None
+        ],
+        deadline: Deadline,
+        trace: Trace | None = None,
+    ) -> AppealPacket:
+        """Run Model C (with template fallback) on a `_prepare` result."""
+
+        trace = trace or Trace()
+        case_summary, classification, evidence_items, generator_payload, compression = prepared
+        with trace.span("generate", prompt_chars=_payload_chars(generator_payload)) as span:
+            generator = self._select_generator()
+            if deadline.budget_seconds is None:
+                try:
+                    generated = generator.generate(**generator_payload)
+                except ModelCResponseError as exc:
+                    generated = self._template_fallback(generator, generator_payload, exc)
+            else:
+                generated = self._generate_within_deadline(
+                    generator, generator_payload, deadline
+                )
+            span.update(_generation_attributes(generated))
+            _record_generation_outcome(generated)
+        if compression is not None:
+            generated["evidence_compression"] = compression
 
         return AppealPacket(
             case_summary=case_summary,
             classification=classification,
             evidence_items=evidence_items,
             generated_output=generated,
+            timings=trace.finish(),
         )
 
+    def _generate_within_deadline(
+        self,
+        generator: Any,
+        generator_payload: Mapping[str, Any],
+        deadline: Deadline,
+    ) -> dict[str, Any]:
+        """Race Model C against the remaining budget with a template packet ready."""
+
+        if isinstance(generator, TemplateModelCGenerator):
+            return generator.generate(**generator_payload)
+
+        future = None
+        if not deadline.expired():
+            future = generation_executor().submit(generator.generate, **generator_payload)
+        # Built while the LLM call is in flight; it costs microseconds.
+        template = TemplateModelCGenerator().generate(**generator_payload)
+
+        try:
+            if future is None:
+                raise FutureTimeoutError()
+            generated = future.result(timeout=deadline.remaining())
+        except ModelCResponseError as exc:
+            generated = self._template_fallback(generator, generator_payload, exc, template)
+        except FutureTimeoutError:
+            # A started call cannot be interrupted; it finishes in the background
+            # and still populates the response cache for the next identical request.
+            if future is not None:
+                future.cancel()
+            generated = self._template_fallback(
+                generator, generator_payload, "deadline_exceeded", template
+            )
+        generated["deadline"] = {
+            "budget_seconds": deadline.budget_seconds,
+            "elapsed_seconds": round(deadline.elapsed(), 4),
+        }
+        return generated
+
+    def run_stream(
+        self,
+        denial_text: str,
+        chart_notes: str | None = None,
+        top_k: int | None = None,
+        additional_instructions: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield progress events while generating; the last event carries the packet.
+
+        Events are `context` (classification and case summary), Model C `delta`
+        and `section` events as the output streams in, an optional `fallback`
+        when the template replaces a failed stream, and finally `complete` with
+        the `AppealPacket`. Streaming runs are not coalesced.
+        """
+
+        trace = Trace("appeal_pipeline_stream")
+        case_summary, classification, evidence_items, generator_payload, compression = (
+            self._prepare(denial_text, chart_notes, top_k, additional_instructions, trace)
+        )
+        yield {
+            "event": "context",
+            "case_summary": case_summary,
+            "classification": {
+                "category": classification.category,
+                "confidence": classification.confidence,
+                "matched_terms": list(classification.matched_terms),
+            },
+            "evidence_count": len(evidence_items),
+        }
+
+        generator = self._select_generator()
+        generated: dict[str, Any] | None = None
+        # Includes time the consumer spends between events, as the client sees it.
+        with trace.span("generate", prompt_chars=_payload_chars(generator_payload)) as span:
+            try:
+                if hasattr(generator, "generate_stream"):
+                    for event in generator.generate_stream(**generator_payload):
+                        if event["event"] == "complete":
+                            generated = event["result"]
+                        else:
+                            yield event
+                else:
+                    generated = generator.generate(**generator_payload)
+                    for key, value in (generated.get("output") or {}).items():
+                        yield {"event": "section", "section": key, "value": value}
+            except ModelCResponseError as exc:
+                generated = self._template_fallback(generator, generator_payload, exc)
+                yield {"event": "fallback", "reason": str(exc)}
+                for key, value in (generated.get("output") or {}).items():
+                    yield {"event": "section", "section": key, "value": value}
+            generated = generated or {}
+            span.update(_generation_attributes(generated))
+            _record_generation_outcome(generated)
+
+        if compression is not None:
+            generated["evidence_compression"] = compression
+        yield {
+            "event": "complete",
+            "packet": AppealPacket(
+                case_summary=case_summary,
+                classification=classification,
+                evidence_items=evidence_items,
+                generated_output=generated,
+                timings=trace.finish(),
+            ),
+        }
+
     def export_packet(self, packet: AppealPacket, output_dir: Path | None = None) -> Path:
+        """Write packet artifacts; `timings.json` gets the run's stages plus `export`."""
+
+        export_trace = Trace("export_packet")
+        with export_trace.span("export"):
+            target_dir = self._write_packet_files(packet, output_dir)
+        export_timings = export_trace.finish()["stages"]["export"]
+        if packet.timings:
+            # The packet is frozen but its timings dict is not: record export in place.
+            packet.timings.setdefault("stages", {})["export"] = export_timings
+            packet.timings["total_seconds"] = round(
+                float(packet.timings.get("total_seconds") or 0.0) + export_timings["seconds"], 6
+            )
+            (target_dir / "timings.json").write_text(
+                json.dumps(packet.timings, indent=2, ensure_ascii=True, default=str) + "\n"
+            )
+        return target_dir
+
+    def _write_packet_files(self, packet: AppealPacket, output_dir: Path | None) -> Path:
         target_dir = output_dir or Path(self.config.output_root) / datetime.now(
             timezone.utc
         ).strftime("%Y%m%dT%H%M%SZ")
@@ -277,17 +689,143 @@ class AppealPipeline:
 
 
 def run_pipeline_once(
-    denial_text: str,
+    denial_text: str | ParsedDenial,
     chart_notes: str | None = None,
     top_k: int = 5,
     generation_runtime: str = "auto",
     output_dir: Path | None = None,
     retrieval_overrides: Mapping[str, Any] | None = None,
+    latency_budget_seconds: float | None = None,
 ) -> tuple[AppealPacket, Path]:
     pipeline = AppealPipeline(
         config=AppealPipelineConfig(top_k=top_k, generation_runtime=generation_runtime),
         retrieval_overrides=retrieval_overrides,
     )
-    packet = pipeline.run(denial_text=denial_text, chart_notes=chart_notes, top_k=top_k)
+    packet = pipeline.run(
+        denial_text=denial_text,
+        chart_notes=chart_notes,
+        top_k=top_k,
+        latency_budget_seconds=latency_budget_seconds,
+    )
     export_dir = pipeline.export_packet(packet=packet, output_dir=output_dir)
     return packet, export_dir
+
+
+def run_generation_request(
+    request: Mapping[str, Any],
+    include_generated_output: bool = False,
+) -> dict[str, Any]:
+    """Run a `/generate`-shaped request mapping and summarize the packet.
+
+    Shared by the synchronous API handler and background job workers so both
+    paths resolve overrides and report results identically.
+    """
+
+    output_dir = Path(request["output_dir"]) if request.get("output_dir") else None
+    packet, export_dir = run_pipeline_once(
+        denial_text=request["denial_text"],
+        chart_notes=request.get("chart_notes") or "",
+        top_k=int(request.get("top_k") or 5),
+        generation_runtime=request.get("generation_runtime") or "auto",
+        output_dir=output_dir,
+        retrieval_overrides=_request_retrieval_overrides(request),
+        latency_budget_seconds=request.get("latency_budget_seconds"),
+    )
+
+    return summarize_packet(packet, export_dir, include_generated_output)
+
+
+def stream_generation_request(request: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
+    """Streaming counterpart of `run_generation_request` yielding JSON-safe events.
+
+    The final `complete` event carries the export summary plus `generated_output`.
+    """
+
+    top_k = int(request.get("top_k") or 5)
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(
+            top_k=top_k,
+            generation_runtime=request.get("generation_runtime") or "auto",
+        ),
+        retrieval_overrides=_request_retrieval_overrides(request),
+    )
+    for event in pipeline.run_stream(
+        denial_text=request["denial_text"],
+        chart_notes=request.get("chart_notes") or "",
+        top_k=top_k,
+    ):
+        if event["event"] != "complete":
+            yield event
+            continue
+        output_dir = Path(request["output_dir"]) if request.get("output_dir") else None
+        export_dir = pipeline.export_packet(packet=event["packet"], output_dir=output_dir)
+        yield {
+            "event": "complete",
+            **summarize_packet(event["packet"], export_dir, include_generated_output=True),
+        }
+
+
+def _request_retrieval_overrides(request: Mapping[str, Any]) -> dict[str, Any] | None:
+    retrieval_overrides: dict[str, Any] = {}
+    if request.get("embedding_provider"):
+        retrieval_overrides["embedding_provider"] = request["embedding_provider"]
+    if request.get("collection_name"):
+        retrieval_overrides["collection_name"] = request["collection_name"]
+    return retrieval_overrides or None
+
+
+def summarize_packet(
+    packet: AppealPacket,
+    export_dir: Path,
+    include_generated_output: bool = False,
+) -> dict[str, Any]:
+    """Compact, JSON-serializable summary of an exported packet."""
+
+    summary = {
+        "export_dir": str(export_dir),
+        "classification": {
+            "category": packet.classification.category,
+            "confidence": packet.classification.confidence,
+            "matched_terms": list(packet.classification.matched_terms),
+        },
+        "evidence_count": len(packet.evidence_items),
+        "generator_provider": packet.generated_output.get("provider"),
+        "generator_model": packet.generated_output.get("model"),
+        "fallback_reason": packet.generated_output.get("fallback_reason"),
+        "timings": packet.timings,
+    }
+    if include_generated_output:
+        summary["generated_output"] = packet.generated_output
+    return summary
+
+
+def _payload_chars(generator_payload: Mapping[str, Any]) -> int:
+    """Serialized size of the case data sent to Model C (prompt size proxy)."""
+
+    return len(json.dumps(generator_payload, ensure_ascii=True, default=str))
+
+
+def _record_generation_outcome(generated: Mapping[str, Any]) -> None:
+    if generated.get("fallback_reason") is not None:
+        outcome = "fallback"
+    elif generated.get("provider") == "template":
+        outcome = "template"
+    else:
+        outcome = "aisuite"
+    metrics.inc("appealpilot_generations_total", outcome=outcome)
+
+
+def _generation_attributes(generated: Mapping[str, Any]) -> dict[str, Any]:
+    usage = generated.get("usage") or {}
+    routing = generated.get("routing") or {}
+    attributes = {
+        "provider": generated.get("provider"),
+        "model": generated.get("model"),
+        "cache_hit": bool(generated.get("cache_hit")),
+        "fallback_reason": generated.get("fallback_reason"),
+        "attempts": len(routing.get("attempts") or []) or None,
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "cached_prompt_tokens": usage.get("cached_prompt_tokens"),
+    }
+    return {key: value for key, value in attributes.items() if value is not None}
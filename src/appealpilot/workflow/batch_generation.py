@@ -0,0 +1,194 @@
+"""Bulk appeal generation through provider batch jobs.
+
+A batch run lives in one directory:
+
+- `requests.jsonl`: the provider batch input, one chat request per case
+- `cases.jsonl`: what is needed to rebuild each `AppealPacket` later
+  (case summary, classification, evidence, Model C payload)
+- `batch.json`: the submitted batch id and model
+
+Parsing, classification and retrieval run at prepare time. Collection can
+happen hours later, possibly in another process. Cases whose batch line failed
+or never came back get the template packet, as the interactive path would.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from appealpilot.domain import AppealPacket, DenialClassification, EvidenceItem
+from appealpilot.models import ModelCGenerator, ModelCResponseError
+from appealpilot.models.model_c_batch import (
+    BatchProvider,
+    BatchStatus,
+    batch_request_line,
+    parse_batch_result,
+    wait_for_batch,
+    write_batch_file,
+)
+
+from .appeal_pipeline import AppealPipeline, summarize_packet
+
+DEFAULT_BATCH_ROOT = "data/interim/batches"
+REQUESTS_FILE = "requests.jsonl"
+CASES_FILE = "cases.jsonl"
+BATCH_FILE = "batch.json"
+
+
+def _read_jsonl(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class BatchAppealRunner:
+    """Prepare, submit and collect a batch of appeal cases."""
+
+    def __init__(
+        self,
+        pipeline: AppealPipeline,
+        generator: ModelCGenerator,
+        provider: BatchProvider,
+    ):
+        self.pipeline = pipeline
+        self.generator = generator
+        self.provider = provider
+
+    def prepare(self, cases: Sequence[Mapping[str, Any]], batch_dir: Path | None = None) -> Path:
+        """Run parse/classify/retrieve per case and write the batch input files.
+
+        Each case mapping takes `denial_text` plus optional `case_id`,
+        `chart_notes`, `top_k` and `additional_instructions`. `case_id` (default
+        `case-00001`, ...) becomes the batch `custom_id` and export directory.
+        """
+
+        batch_dir = batch_dir or Path(DEFAULT_BATCH_ROOT) / datetime.now(timezone.utc).strftime(
+            "%Y%m%dT%H%M%SZ"
+        )
+        batch_dir.mkdir(parents=True, exist_ok=True)
+
+        request_lines: list[dict[str, Any]] = []
+        manifest: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        for index, case in enumerate(cases, start=1):
+            custom_id = str(case.get("case_id") or f"case-{index:05d}")
+            if custom_id in seen:
+                raise ValueError(f"Duplicate batch case_id {custom_id!r}.")
+            seen.add(custom_id)
+
+            case_summary, classification, evidence_items, generator_payload, compression = (
+                self.pipeline._prepare(
+                    case["denial_text"],
+                    case.get("chart_notes"),
+                    case.get("top_k"),
+                    case.get("additional_instructions"),
+                )
+            )
+            _, body = self.generator.build_chat_request(**generator_payload)
+            request_lines.append(batch_request_line(custom_id, body))
+            manifest.append(
+                {
+                    "custom_id": custom_id,
+                    "case_summary": case_summary,
+                    "classification": asdict(classification),
+                    "evidence_items": [asdict(item) for item in evidence_items],
+                    "generator_payload": generator_payload,
+                    "evidence_compression": compression,
+                }
+            )
+
+        write_batch_file(batch_dir / REQUESTS_FILE, request_lines)
+        write_batch_file(batch_dir / CASES_FILE, manifest)
+        return batch_dir
+
+    def submit(self, batch_dir: Path) -> str:
+        batch_id = self.provider.submit(batch_dir / REQUESTS_FILE)
+        (batch_dir / BATCH_FILE).write_text(
+            json.dumps(
+                {
+                    "batch_id": batch_id,
+                    "model": self.generator.config.model,
+                    "submitted_at_utc": datetime.now(timezone.utc).isoformat(),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        return batch_id
+
+    def status(self, batch_dir: Path) -> BatchStatus:
+        return self.provider.status(self._batch_id(batch_dir))
+
+    def collect(
+        self,
+        batch_dir: Path,
+        output_root: Path | None = None,
+        poll_interval_seconds: float = 60.0,
+        timeout_seconds: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Wait for the batch, export one packet per case and return their summaries.
+
+        Packets go to `output_root/<custom_id>` (default: the pipeline's output root).
+        """
+
+        batch_id = self._batch_id(batch_dir)
+        status = wait_for_batch(self.provider, batch_id, poll_interval_seconds, timeout_seconds)
+        results = {
+            line.get("custom_id"): line
+            for line in (self.provider.results(batch_id) if status.done else [])
+        }
+        output_root = output_root or Path(self.pipeline.config.output_root)
+
+        summaries: list[dict[str, Any]] = []
+        for case in _read_jsonl(batch_dir / CASES_FILE):
+            packet = self._build_packet(case, results.get(case["custom_id"]), status)
+            export_dir = self.pipeline.export_packet(packet, output_root / case["custom_id"])
+            summaries.append(
+                {"custom_id": case["custom_id"], **summarize_packet(packet, export_dir)}
+            )
+        return summaries
+
+    def _batch_id(self, batch_dir: Path) -> str:
+        path = batch_dir / BATCH_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"Batch {batch_dir} has not been submitted yet.")
+        return json.loads(path.read_text())["batch_id"]
+
+    def _build_packet(
+        self,
+        case: Mapping[str, Any],
+        result: Mapping[str, Any] | None,
+        status: BatchStatus,
+    ) -> AppealPacket:
+        generator_payload = case["generator_payload"]
+        if result is None:
+            error: str | None = f"No batch result (batch status: {status.status})."
+        else:
+            content, usage, error = parse_batch_result(result)
+        generated: dict[str, Any] | None = None
+        if error is None:
+            payload, _ = self.generator.build_chat_request(**generator_payload)
+            try:
+                generated = self.generator.finalize_completion(content or "", usage, payload)
+            except ModelCResponseError as exc:
+                error = str(exc)
+        if generated is None:
+            generated = AppealPipeline._template_fallback(
+                self.generator, generator_payload, error or "batch request failed"
+            )
+        generated["batch"] = {"batch_id": status.batch_id, "custom_id": case["custom_id"]}
+        if case.get("evidence_compression") is not None:
+            generated["evidence_compression"] = case["evidence_compression"]
+
+        return AppealPacket(
+            case_summary=case["case_summary"],
+            classification=DenialClassification(
+                category=case["classification"]["category"],
+                confidence=case["classification"]["confidence"],
+                matched_terms=tuple(case["classification"].get("matched_terms") or ()),
+            ),
+            evidence_items=[EvidenceItem(**item) for item in case["evidence_items"]],
+            generated_output=generated,
+        )
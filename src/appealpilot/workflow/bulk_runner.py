@@ -0,0 +1,281 @@
+"""Bulk appeal generation across a pool of worker processes.
+
+Each worker process builds one `AppealPipeline` (retriever, embedding model,
+clients) when it starts and reuses it for every chunk of cases it is given.
+Within a chunk, cases are parsed and classified, retrieved with one batched
+query, then generated and exported concurrently on threads (Model C calls are
+I/O-bound). Completed case ids are appended to a checkpoint file as chunks
+finish, so rerunning the same input skips work that was already exported.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Sequence
+
+from appealpilot.benchmarks.stats import summarize_latencies
+
+from .appeal_pipeline import AppealPipeline, AppealPipelineConfig
+from .deadline import Deadline
+from .instrumentation import Trace
+
+BULK_STAGES = ("parse_classify", "retrieve", "generate", "export")
+CHECKPOINT_FILE = "bulk_checkpoint.jsonl"
+CHART_NOTES_SUFFIX = ".chart.txt"
+
+
+class BulkRunError(ValueError):
+    """Raised when bulk input or configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class BulkRunConfig:
+    """Worker layout for a bulk run."""
+
+    workers: int = 4
+    # Cases per task: one batched retrieval query and one generation fan-out.
+    chunk_size: int = 16
+    generation_concurrency: int = 4
+    top_k: int = 5
+    generation_runtime: str = "auto"
+    output_root: str = "outputs/appeals/bulk"
+    # Defaults to `<output_root>/bulk_checkpoint.jsonl`.
+    checkpoint_path: str | None = None
+
+    def validate(self) -> None:
+        if self.workers < 1:
+            raise BulkRunError("workers must be >= 1.")
+        if self.chunk_size < 1:
+            raise BulkRunError("chunk_size must be >= 1.")
+        if self.generation_concurrency < 1:
+            raise BulkRunError("generation_concurrency must be >= 1.")
+        if self.top_k < 1:
+            raise BulkRunError("top_k must be >= 1.")
+
+    @property
+    def checkpoint(self) -> Path:
+        return Path(self.checkpoint_path or Path(self.output_root) / CHECKPOINT_FILE)
+
+
+def load_bulk_cases(path: Path) -> list[dict[str, Any]]:
+    """Read cases from a JSONL file or a directory of denial `.txt` files.
+
+    JSONL lines carry `denial_text` and optional `case_id`, `chart_notes` and
+    `additional_instructions`. In a directory, each `<name>.txt` is one denial
+    (case id `<name>`) with optional chart notes in `<name>.chart.txt`.
+    """
+
+    cases: list[dict[str, Any]] = []
+    if path.is_dir():
+        for denial_path in sorted(path.glob("*.txt")):
+            if denial_path.name.endswith(CHART_NOTES_SUFFIX):
+                continue
+            notes_path = denial_path.with_name(denial_path.stem + CHART_NOTES_SUFFIX)
+            cases.append(
+                {
+                    "case_id": denial_path.stem,
+                    "denial_text": denial_path.read_text(),
+                    "chart_notes": notes_path.read_text() if notes_path.exists() else None,
+                }
+            )
+    elif path.exists():
+        for index, line in enumerate(path.read_text().splitlines(), start=1):
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            if not case.get("denial_text"):
+                raise BulkRunError(f"{path}:{index} has no denial_text.")
+            case["case_id"] = str(case.get("case_id") or f"case-{index:05d}")
+            cases.append(case)
+    else:
+        raise BulkRunError(f"Bulk input not found: {path}")
+
+    seen: set[str] = set()
+    for case in cases:
+        if case["case_id"] in seen:
+            raise BulkRunError(f"Duplicate case_id {case['case_id']!r}.")
+        seen.add(case["case_id"])
+    return cases
+
+
+def read_checkpoint(path: Path) -> dict[str, dict[str, Any]]:
+    """Return completed case records keyed by case id (empty if no checkpoint)."""
+
+    if not path.exists():
+        return {}
+    records: dict[str, dict[str, Any]] = {}
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A run killed mid-write leaves a partial last line; that case reruns.
+            continue
+        records[record["case_id"]] = record
+    return records
+
+
+_WORKER_PIPELINE: AppealPipeline | None = None
+
+
+def _init_worker(config: BulkRunConfig, retrieval_overrides: Mapping[str, Any] | None) -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = AppealPipeline(
+        config=AppealPipelineConfig(
+            output_root=config.output_root,
+            top_k=config.top_k,
+            generation_runtime=config.generation_runtime,
+            coalesce_requests=False,
+        ),
+        retrieval_overrides=retrieval_overrides,
+    )
+
+
+def _run_chunk(cases: Sequence[Mapping[str, Any]], config: BulkRunConfig) -> list[dict[str, Any]]:
+    pipeline = _WORKER_PIPELINE
+    if pipeline is None:
+        raise RuntimeError("Bulk worker used before initialization.")
+
+    planned = []
+    for case in cases:
+        trace = Trace("bulk_case")
+        started = time.perf_counter()
+        plan = pipeline._plan_case(case["denial_text"], case.get("chart_notes"), trace)
+        planned.append((case, plan, time.perf_counter() - started, trace))
+
+    query_texts = [query_text for _, (_, _, query_text), _, _ in planned]
+    started = time.perf_counter()
+    classifications, embeddings = pipeline._embedding_fallback(
+        [classification for _, (_, classification, _), _, _ in planned], query_texts
+    )
+    reuse = {"query_embeddings": embeddings} if embeddings else {}
+    raw_results = pipeline.retriever.query_many(query_texts, top_k=config.top_k, **reuse)
+    # One query serves the whole chunk; each case is charged an equal share.
+    retrieve_seconds = (time.perf_counter() - started) / len(planned)
+    planned = [
+        (case, (parsed, classification, query_text), plan_seconds, trace)
+        for (case, (parsed, _, query_text), plan_seconds, trace), classification in zip(
+            planned, classifications
+        )
+    ]
+
+    def finish(item: tuple[Any, Any, float, Trace], results: Sequence[Any]) -> dict[str, Any]:
+        case, (parsed, classification, query_text), plan_seconds, trace = item
+        trace.record(
+            "retrieve", retrieve_seconds, result_count=len(results), batch_size=len(planned)
+        )
+        started = time.perf_counter()
+        prepared = pipeline._assemble_case(
+            parsed,
+            classification,
+            query_text,
+            results,
+            case.get("chart_notes"),
+            case.get("additional_instructions"),
+            trace,
+        )
+        packet = pipeline._complete_packet(prepared, Deadline.start(None), trace)
+        generated_at = time.perf_counter()
+        export_dir = pipeline.export_packet(
+            packet, Path(config.output_root) / str(case["case_id"])
+        )
+        return {
+            "case_id": case["case_id"],
+            "export_dir": str(export_dir),
+            "category": classification.category,
+            "generator_provider": packet.generated_output.get("provider"),
+            "fallback_reason": packet.generated_output.get("fallback_reason"),
+            "timings": {
+                "parse_classify": round(plan_seconds, 6),
+                "retrieve": round(retrieve_seconds, 6),
+                "generate": round(generated_at - started, 6),
+                "export": round(time.perf_counter() - generated_at, 6),
+            },
+        }
+
+    with ThreadPoolExecutor(max_workers=config.generation_concurrency) as executor:
+        return list(executor.map(finish, planned, raw_results))
+
+
+def _chunks(cases: Sequence[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    for start in range(0, len(cases), size):
+        yield list(cases[start:start + size])
+
+
+def run_bulk(
+    cases: Sequence[dict[str, Any]],
+    config: BulkRunConfig | None = None,
+    retrieval_overrides: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run every case not already in the checkpoint and summarize the run.
+
+    With `workers=1` chunks run in this process (no pool start-up cost).
+    """
+
+    config = config or BulkRunConfig()
+    config.validate()
+    checkpoint = config.checkpoint
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    completed = read_checkpoint(checkpoint)
+    pending = [case for case in cases if case["case_id"] not in completed]
+
+    records: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    with checkpoint.open("a", encoding="utf-8") as handle:
+
+        def record(chunk_records: Sequence[dict[str, Any]]) -> None:
+            for item in chunk_records:
+                handle.write(json.dumps(item, ensure_ascii=True) + "\n")
+            handle.flush()
+            records.extend(chunk_records)
+
+        chunks = list(_chunks(pending, config.chunk_size))
+        if len(chunks) == 1 or (chunks and config.workers == 1):
+            _init_worker(config, retrieval_overrides)
+            for chunk in chunks:
+                record(_run_chunk(chunk, config))
+        elif chunks:
+            # Spawned, not forked: Chroma and embedding libraries run native
+            # threads that do not survive fork().
+            with ProcessPoolExecutor(
+                max_workers=min(config.workers, len(chunks)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config, retrieval_overrides),
+            ) as executor:
+                futures = [executor.submit(_run_chunk, chunk, config) for chunk in chunks]
+                for future in as_completed(futures):
+                    record(future.result())
+
+    return summarize_bulk_run(
+        records, time.perf_counter() - started, skipped=len(cases) - len(pending)
+    )
+
+
+def summarize_bulk_run(
+    records: Sequence[Mapping[str, Any]],
+    wall_seconds: float,
+    skipped: int = 0,
+) -> dict[str, Any]:
+    """Throughput plus p50/p95 seconds per stage for the cases run this time."""
+
+    stages = {}
+    for stage in BULK_STAGES:
+        latencies = summarize_latencies(
+            [float(item["timings"][stage]) for item in records if stage in item["timings"]]
+        )
+        stages[stage] = {"p50": latencies["p50"], "p95": latencies["p95"]}
+    return {
+        "completed": len(records),
+        "skipped": skipped,
+        "fallbacks": sum(1 for item in records if item.get("fallback_reason")),
+        "wall_seconds": round(wall_seconds, 4),
+        "cases_per_second": round(len(records) / wall_seconds, 4) if wall_seconds > 0 else 0.0,
+        "stages": stages,
+    }
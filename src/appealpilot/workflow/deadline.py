@@ -0,0 +1,48 @@
+"""Per-request latency budgets propagated through pipeline stages."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Monotonic deadline; a `None` budget never expires."""
+
+    budget_seconds: float | None
+    started_at: float
+
+    @classmethod
+    def start(cls, budget_seconds: float | None) -> "Deadline":
+        if budget_seconds is not None and budget_seconds <= 0:
+            raise ValueError("latency_budget_seconds must be > 0.")
+        return cls(budget_seconds=budget_seconds, started_at=time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float | None:
+        if self.budget_seconds is None:
+            return None
+        return max(0.0, self.budget_seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def generation_executor() -> ThreadPoolExecutor:
+    """Shared pool for budgeted LLM calls; calls that miss the deadline finish here."""
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="model-c-deadline")
+        return _EXECUTOR
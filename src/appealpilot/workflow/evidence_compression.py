@@ -0,0 +1,267 @@
+"""Query-aware evidence compression for the Model C prompt.
+
+Retrieved DFS documents are `field: value` lines (see `retrieval.dfs_ingest`).
+Each line, or each sentence of a long line, is scored by IDF-weighted overlap
+with the retrieval query. The best segments of every item are kept within a
+shared token budget and rendered back in document order.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
+
+CHARS_PER_TOKEN_ESTIMATE = 4
+# Outcome lines are what makes a precedent useful; keep them whenever they fit.
+PINNED_FIELDS = frozenset({"decision", "determination"})
+LONG_SEGMENT_TOKENS = 48
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+")
+_FIELD_LINE = re.compile(r"^([a-z][a-z0-9 ]{0,40}):\s*(.*)$")
+_STOPWORDS = frozenset(
+    {
+        "and", "are", "but", "for", "from", "has", "have", "not", "that", "the",
+        "this", "was", "were", "with", "which", "who", "will", "his", "her",
+        "their", "its", "been", "had", "any", "all", "denial", "reason",
+    }
+)
+
+
+class EvidenceCompressionConfigError(ValueError):
+    """Raised when evidence compression configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class EvidenceCompressionConfig:
+    """Token budget for retrieved evidence sent to Model C."""
+
+    enabled: bool = True
+    # Shared across all retrieved items; unused share flows to later items.
+    token_budget: int = 1200
+    min_item_tokens: int = 40
+
+    def validate(self) -> None:
+        if self.token_budget < 1:
+            raise EvidenceCompressionConfigError("evidence token_budget must be >= 1.")
+        if self.min_item_tokens < 1:
+            raise EvidenceCompressionConfigError("evidence min_item_tokens must be >= 1.")
+
+
+def _to_bool(value: Any, fallback: bool) -> bool:
+    if value is None or value == "":
+        return fallback
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _to_int(value: Any, fallback: int) -> int:
+    if value is None or value == "":
+        return fallback
+    return int(value)
+
+
+def _load_compression_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise EvidenceCompressionConfigError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+    section = loaded.get("evidence_compression", {}) or {}
+    if not isinstance(section, dict):
+        raise EvidenceCompressionConfigError(
+            "`evidence_compression` in settings.yaml must be a mapping."
+        )
+    return section
+
+
+def build_evidence_compression_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> EvidenceCompressionConfig:
+    """Build config from settings.yaml + env vars + explicit overrides."""
+
+    base = _load_compression_from_settings(settings_path)
+    env = {
+        "enabled": os.getenv("EVIDENCE_COMPRESSION_ENABLED"),
+        "token_budget": os.getenv("EVIDENCE_TOKEN_BUDGET"),
+    }
+    merged = {**base, **{key: value for key, value in env.items() if value not in (None, "")}}
+    if overrides:
+        merged.update(overrides)
+
+    config = EvidenceCompressionConfig(
+        enabled=_to_bool(merged.get("enabled"), True),
+        token_budget=_to_int(merged.get("token_budget"), 1200),
+        min_item_tokens=_to_int(merged.get("min_item_tokens"), 40),
+    )
+    config.validate()
+    return config
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE) if text else 0
+
+
+def _terms(text: str) -> set[str]:
+    return {
+        term
+        for term in _TOKEN_PATTERN.findall(text.lower())
+        if len(term) > 2 and term not in _STOPWORDS
+    }
+
+
+@dataclass(frozen=True)
+class _Segment:
+    field: str
+    text: str
+    position: int
+    terms: frozenset[str]
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + 1
+
+
+def _segments(text: str) -> list[_Segment]:
+    segments: list[_Segment] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _FIELD_LINE.match(line)
+        field, value = (match.group(1), match.group(2)) if match else ("", line)
+        pieces = (
+            _SENTENCE_BOUNDARY.split(value)
+            if estimate_tokens(value) > LONG_SEGMENT_TOKENS
+            else [value]
+        )
+        for piece in pieces:
+            piece = piece.strip()
+            if piece:
+                segments.append(
+                    _Segment(field, piece, len(segments), frozenset(_terms(piece)))
+                )
+    return segments
+
+
+def _render(segments: Sequence[_Segment]) -> str:
+    lines: list[str] = []
+    current_field: str | None = None
+    for segment in sorted(segments, key=lambda item: item.position):
+        if lines and segment.field == current_field:
+            lines[-1] += " " + segment.text
+            continue
+        lines.append(f"{segment.field}: {segment.text}" if segment.field else segment.text)
+        current_field = segment.field
+    return "\n".join(lines)
+
+
+def _truncate(text: str, tokens: int) -> str:
+    limit = tokens * CHARS_PER_TOKEN_ESTIMATE
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return cut[: cut.rfind(" ")] if " " in cut else cut
+
+
+def _select(
+    segments: Sequence[_Segment],
+    query_terms: set[str],
+    idf: Mapping[str, float],
+    budget: int,
+) -> list[_Segment]:
+    def score(segment: _Segment) -> float:
+        return sum(idf[term] for term in segment.terms & query_terms)
+
+    ranked = sorted(
+        segments,
+        key=lambda item: (item.field not in PINNED_FIELDS, -score(item), item.position),
+    )
+    selected: list[_Segment] = []
+    used = 0
+    for segment in ranked:
+        if segment.field not in PINNED_FIELDS and score(segment) <= 0:
+            break
+        if used + segment.tokens <= budget:
+            selected.append(segment)
+            used += segment.tokens
+    return selected
+
+
+def compress_evidence(
+    query_text: str,
+    evidence: Sequence[Mapping[str, Any]],
+    texts: Sequence[str],
+    config: EvidenceCompressionConfig,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Return compressed evidence payload items plus token-count stats.
+
+    `evidence` holds the uncompressed Model C payload items and `texts` the full
+    retrieved document text for each. Metadata values already present in the
+    kept snippet are dropped from the compressed items.
+    """
+
+    query_terms = _terms(query_text)
+    item_segments = [_segments(text) for text in texts]
+    all_segments = [segment for segments in item_segments for segment in segments]
+    document_frequency: dict[str, int] = {}
+    for segment in all_segments:
+        for term in segment.terms & query_terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    idf = {
+        term: math.log(1 + len(all_segments) / count)
+        for term, count in document_frequency.items()
+    }
+
+    compressed: list[dict[str, Any]] = []
+    remaining = config.token_budget
+    for index, (item, text, segments) in enumerate(zip(evidence, texts, item_segments)):
+        share = max(config.min_item_tokens, remaining // (len(evidence) - index))
+        selected = _select(segments, query_terms, idf, share)
+        snippet = (
+            _render(selected)
+            if selected
+            else _truncate(text.strip(), share)
+        )
+        remaining = max(0, remaining - estimate_tokens(snippet))
+        metadata = {
+            key: value
+            for key, value in dict(item.get("metadata") or {}).items()
+            if str(value) not in snippet
+        }
+        compressed.append(
+            {
+                "source_id": item.get("source_id"),
+                "snippet": snippet,
+                "metadata": metadata,
+                "distance": item.get("distance"),
+            }
+        )
+
+    stats = {
+        "token_budget": config.token_budget,
+        "evidence_tokens_before": _payload_tokens(evidence),
+        "evidence_tokens_after": _payload_tokens(compressed),
+    }
+    return compressed, stats
+
+
+def _payload_tokens(items: Sequence[Mapping[str, Any]]) -> int:
+    return estimate_tokens(json.dumps(list(items), ensure_ascii=True, default=str))
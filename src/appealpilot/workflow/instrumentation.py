@@ -0,0 +1,174 @@
+"""Lightweight per-stage timing for pipeline runs.
+
+A `Trace` collects one entry per stage (monotonic seconds plus size
+attributes such as evidence count or prompt characters). `Trace.as_dict()` is
+what gets attached to `AppealPacket.timings` and written to `timings.json`.
+
+Finished traces are also handed to an optional span exporter. Set one with
+`set_span_exporter(...)`, or set `APPEALPILOT_TRACE_EXPORTER=otel` to emit
+OpenTelemetry spans through whatever tracer provider the process configured
+(needs `opentelemetry-api`).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from appealpilot import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTER_ENV = "APPEALPILOT_TRACE_EXPORTER"
+
+
+class InstrumentationError(RuntimeError):
+    """Raised when a requested span exporter cannot be set up."""
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start_ns: int
+    seconds: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Stage timings for one pipeline run."""
+
+    def __init__(self, name: str = "appeal_pipeline"):
+        self.name = name
+        self.started_at_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: list[SpanRecord] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """Time a stage; the yielded dict takes size attributes set inside the block."""
+
+        attrs = dict(attributes)
+        start_ns = time.time_ns()
+        started = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as exc:
+            attrs["error"] = type(exc).__name__
+            raise
+        finally:
+            record = SpanRecord(name, start_ns, time.perf_counter() - started, attrs)
+            with self._lock:
+                self.spans.append(record)
+
+    def record(self, name: str, seconds: float, **attributes: Any) -> None:
+        """Add a stage timed elsewhere (e.g. a share of a batched call)."""
+
+        start_ns = time.time_ns() - int(seconds * 1e9)
+        with self._lock:
+            self.spans.append(SpanRecord(name, start_ns, seconds, dict(attributes)))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> dict[str, Any]:
+        """`{"total_seconds", "stages": {name: {"seconds", **attributes}}}` in stage order."""
+
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "total_seconds": round(self.elapsed(), 6),
+            "stages": {
+                span.name: {"seconds": round(span.seconds, 6), **span.attributes}
+                for span in spans
+            },
+        }
+
+    def finish(self) -> dict[str, Any]:
+        """Record stage histograms, run the configured exporter, return `as_dict()`."""
+
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            metrics.observe("appealpilot_pipeline_stage_seconds", span.seconds, stage=span.name)
+        exporter = current_span_exporter()
+        if exporter is not None:
+            try:
+                exporter(self)
+            except Exception:  # noqa: BLE001 - telemetry must never fail a run
+                logger.warning("Span exporter failed for trace %s.", self.name, exc_info=True)
+        return self.as_dict()
+
+
+SpanExporter = Callable[[Trace], None]
+
+
+class OpenTelemetrySpanExporter:
+    """Replay a finished `Trace` as an OpenTelemetry span tree.
+
+    Spans are created after the fact with their recorded start/end times, so
+    the pipeline itself never depends on OpenTelemetry.
+    """
+
+    def __init__(self, tracer_name: str = "appealpilot", tracer_provider: Any | None = None):
+        try:
+            from opentelemetry import trace as otel_trace
+        except ImportError as exc:
+            raise InstrumentationError(
+                "opentelemetry-api is required for the otel exporter. "
+                "Install with `pip install opentelemetry-api opentelemetry-sdk`."
+            ) from exc
+        self._otel_trace = otel_trace
+        self._tracer = otel_trace.get_tracer(tracer_name, tracer_provider=tracer_provider)
+
+    def __call__(self, trace: Trace) -> None:
+        total_ns = int(trace.elapsed() * 1e9)
+        root = self._tracer.start_span(trace.name, start_time=trace.started_at_ns)
+        context = self._otel_trace.set_span_in_context(root)
+        for span in list(trace.spans):
+            child = self._tracer.start_span(
+                span.name,
+                context=context,
+                start_time=span.start_ns,
+                attributes={
+                    key: value
+                    for key, value in span.attributes.items()
+                    if isinstance(value, (str, bool, int, float))
+                },
+            )
+            child.end(end_time=span.start_ns + int(span.seconds * 1e9))
+        root.end(end_time=trace.started_at_ns + total_ns)
+
+
+_EXPORTER_LOCK = threading.Lock()
+_EXPORTER: SpanExporter | None = None
+_EXPORTER_RESOLVED = False
+
+
+def set_span_exporter(exporter: SpanExporter | None) -> None:
+    """Install (or with None, remove) the process-wide span exporter."""
+
+    global _EXPORTER, _EXPORTER_RESOLVED
+    with _EXPORTER_LOCK:
+        _EXPORTER = exporter
+        _EXPORTER_RESOLVED = True
+
+
+def current_span_exporter() -> SpanExporter | None:
+    """Return the installed exporter, resolving `APPEALPILOT_TRACE_EXPORTER` once."""
+
+    global _EXPORTER, _EXPORTER_RESOLVED
+    with _EXPORTER_LOCK:
+        if not _EXPORTER_RESOLVED:
+            name = (os.getenv(TRACE_EXPORTER_ENV) or "").strip().lower()
+            if name in {"otel", "opentelemetry"}:
+                _EXPORTER = OpenTelemetrySpanExporter()
+            elif name not in {"", "none"}:
+                raise InstrumentationError(f"Unknown {TRACE_EXPORTER_ENV} value {name!r}.")
+            _EXPORTER_RESOLVED = True
+        return _EXPORTER
@@ -0,0 +1,509 @@
+"""Durable SQLite-backed job queue for long-running appeal generation."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping
+
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[1] / "config" / "settings.yaml"
+DEFAULT_JOBS_DB_PATH = "data/interim/jobs/appeal_jobs.sqlite3"
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+TERMINAL_JOB_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS appeal_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    submitted_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_expires_at REAL,
+    run_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS appeal_jobs_status_available
+    ON appeal_jobs (status, available_at);
+"""
+
+
+class JobQueueError(RuntimeError):
+    """Raised when the job queue is misconfigured or a job transition is invalid."""
+
+
+@dataclass(frozen=True)
+class JobQueueConfig:
+    """Runtime config for the appeal job queue and its workers."""
+
+    db_path: str = DEFAULT_JOBS_DB_PATH
+    workers: int = 2
+    embedded_workers: int = 1
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 2.0
+    poll_interval_seconds: float = 0.5
+    lease_seconds: float = 600.0
+
+    def validate(self) -> None:
+        if not self.db_path:
+            raise JobQueueError("jobs db_path is required.")
+        if self.workers < 1:
+            raise JobQueueError("jobs workers must be >= 1.")
+        if self.embedded_workers < 0:
+            raise JobQueueError("jobs embedded_workers must be >= 0.")
+        if self.max_attempts < 1:
+            raise JobQueueError("jobs max_attempts must be >= 1.")
+        if self.retry_backoff_seconds < 0:
+            raise JobQueueError("jobs retry_backoff_seconds must be >= 0.")
+        if self.poll_interval_seconds <= 0:
+            raise JobQueueError("jobs poll_interval_seconds must be > 0.")
+        if self.lease_seconds <= 0:
+            raise JobQueueError("jobs lease_seconds must be > 0.")
+
+
+def _to_int(value: Any, fallback: int) -> int:
+    if value is None or value == "":
+        return fallback
+    return int(value)
+
+
+def _to_float(value: Any, fallback: float) -> float:
+    if value is None or value == "":
+        return fallback
+    return float(value)
+
+
+def _load_jobs_from_settings(settings_path: Path) -> dict[str, Any]:
+    if not settings_path.exists():
+        return {}
+
+    try:
+        import yaml
+    except ImportError as exc:
+        raise JobQueueError(
+            "PyYAML is required to read settings.yaml. Install with `pip install PyYAML`."
+        ) from exc
+
+    loaded = yaml.safe_load(settings_path.read_text()) or {}
+    if not isinstance(loaded, dict):
+        return {}
+
+    jobs = loaded.get("jobs", {})
+    if jobs is None:
+        return {}
+    if not isinstance(jobs, dict):
+        raise JobQueueError("`jobs` in settings.yaml must be a mapping.")
+    return jobs
+
+
+def build_job_queue_config(
+    settings_path: Path = DEFAULT_SETTINGS_PATH,
+    overrides: Mapping[str, Any] | None = None,
+) -> JobQueueConfig:
+    """Build job queue config from settings, env vars, and explicit overrides.
+
+    Precedence is settings.yaml < env vars < explicit overrides, so CLI flags
+    (e.g. `run_job_workers.py --workers`) win over the environment.
+    """
+
+    base = _load_jobs_from_settings(settings_path)
+    explicit = dict(overrides or {})
+
+    def _value(key: str, env_name: str) -> Any:
+        if key in explicit:
+            return explicit[key]
+        return os.getenv(env_name, base.get(key))
+
+    config = JobQueueConfig(
+        db_path=_value("db_path", "APPEALPILOT_JOBS_DB_PATH") or DEFAULT_JOBS_DB_PATH,
+        workers=_to_int(_value("workers", "APPEALPILOT_JOB_WORKERS"), 2),
+        embedded_workers=_to_int(
+            _value("embedded_workers", "APPEALPILOT_JOB_EMBEDDED_WORKERS"), 1
+        ),
+        max_attempts=_to_int(_value("max_attempts", "APPEALPILOT_JOB_MAX_ATTEMPTS"), 3),
+        retry_backoff_seconds=_to_float(
+            _value("retry_backoff_seconds", "APPEALPILOT_JOB_RETRY_BACKOFF_SECONDS"), 2.0
+        ),
+        poll_interval_seconds=_to_float(
+            _value("poll_interval_seconds", "APPEALPILOT_JOB_POLL_INTERVAL_SECONDS"), 0.5
+        ),
+        lease_seconds=_to_float(_value("lease_seconds", "APPEALPILOT_JOB_LEASE_SECONDS"), 600.0),
+    )
+    config.validate()
+    return config
+
+
+def _row_to_job(row: sqlite3.Row) -> dict[str, Any]:
+    submitted_at = row["submitted_at"]
+    started_at = row["started_at"]
+    finished_at = row["finished_at"]
+    return {
+        "job_id": row["job_id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "max_attempts": row["max_attempts"],
+        "cancel_requested": bool(row["cancel_requested"]),
+        "worker_id": row["worker_id"],
+        "error": row["error"],
+        "payload": json.loads(row["payload"]),
+        "timings": {
+            "submitted_at": submitted_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "queue_wait_seconds": (started_at - submitted_at) if started_at else None,
+            "run_seconds": row["run_seconds"],
+            "total_seconds": (finished_at - submitted_at) if finished_at else None,
+        },
+    }
+
+
+class AppealJobQueue:
+    """SQLite-backed queue shared by API handlers and worker processes.
+
+    Running jobs are leased to a single worker; `complete`, `fail` and
+    `heartbeat` only take effect while that worker still holds the lease.
+    """
+
+    def __init__(self, config: JobQueueConfig | None = None):
+        self.config = config or build_job_queue_config()
+        self.config.validate()
+        Path(self.config.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.config.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(self, payload: Mapping[str, Any], max_attempts: int | None = None) -> str:
+        """Persist a new job and return its id."""
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO appeal_jobs "
+                "(job_id, status, payload, max_attempts, submitted_at, available_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (
+                    job_id,
+                    json.dumps(dict(payload), ensure_ascii=True),
+                    max_attempts or self.config.max_attempts,
+                    now,
+                    now,
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM appeal_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def get_result(self, job_id: str) -> Any:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT result FROM appeal_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        return json.loads(row["result"])
+
+    def claim(self, worker_id: str) -> dict[str, Any] | None:
+        """Atomically lease the oldest available job (or an expired lease).
+
+        Expired leases that already used every attempt (e.g. the worker was
+        OOM-killed on its last try) are failed instead of leased again.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE appeal_jobs SET status = 'failed', finished_at = ?, "
+                "lease_expires_at = NULL, "
+                "error = COALESCE(error, 'Worker lease expired after final attempt.') "
+                "WHERE status = 'running' AND lease_expires_at < ? "
+                "AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = conn.execute(
+                "SELECT job_id FROM appeal_jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY available_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE appeal_jobs SET status = 'running', worker_id = ?, "
+                "attempts = attempts + 1, started_at = ?, lease_expires_at = ? "
+                "WHERE job_id = ?",
+                (worker_id, now, now + self.config.lease_seconds, row["job_id"]),
+            )
+            claimed = conn.execute(
+                "SELECT * FROM appeal_jobs WHERE job_id = ?", (row["job_id"],)
+            ).fetchone()
+        return _row_to_job(claimed)
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; returns False once the worker no longer owns the job."""
+
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE appeal_jobs SET lease_expires_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (time.time() + self.config.lease_seconds, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> str | None:
+        """Store a job result; a cancel requested mid-run wins over the result.
+
+        Returns the new status, or None when `worker_id` lost the lease.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT cancel_requested, started_at FROM appeal_jobs "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return None
+            status = "cancelled" if row["cancel_requested"] else "succeeded"
+            conn.execute(
+                "UPDATE appeal_jobs SET status = ?, result = ?, finished_at = ?, "
+                "run_seconds = ?, lease_expires_at = NULL "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (
+                    status,
+                    None if status == "cancelled" else json.dumps(result, ensure_ascii=True),
+                    now,
+                    now - (row["started_at"] or now),
+                    job_id,
+                    worker_id,
+                ),
+            )
+        return status
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str | None:
+        """Record a failed attempt and requeue with backoff while attempts remain.
+
+        Returns the new status, or None when `worker_id` lost the lease.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts, cancel_requested, started_at "
+                "FROM appeal_jobs WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return None
+
+            run_seconds = now - (row["started_at"] or now)
+            if row["cancel_requested"]:
+                status = "cancelled"
+            elif row["attempts"] < row["max_attempts"]:
+                status = "queued"
+            else:
+                status = "failed"
+
+            if status == "queued":
+                backoff = self.config.retry_backoff_seconds * row["attempts"]
+                conn.execute(
+                    "UPDATE appeal_jobs SET status = 'queued', error = ?, available_at = ?, "
+                    "run_seconds = ?, lease_expires_at = NULL, worker_id = NULL "
+                    "WHERE job_id = ?",
+                    (error, now + backoff, run_seconds, job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE appeal_jobs SET status = ?, error = ?, finished_at = ?, "
+                    "run_seconds = ?, lease_expires_at = NULL WHERE job_id = ?",
+                    (status, error, now, run_seconds, job_id),
+                )
+        return status
+
+    def cancel(self, job_id: str) -> str | None:
+        """Cancel a queued job, or flag a running job so its result is discarded."""
+
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT status FROM appeal_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            status = row["status"]
+            if status == "queued":
+                conn.execute(
+                    "UPDATE appeal_jobs SET status = 'cancelled', cancel_requested = 1, "
+                    "finished_at = ? WHERE job_id = ?",
+                    (now, job_id),
+                )
+                return "cancelled"
+            if status == "running":
+                conn.execute(
+                    "UPDATE appeal_jobs SET cancel_requested = 1 WHERE job_id = ?",
+                    (job_id,),
+                )
+            return status
+
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depth, status counts, and timing aggregates."""
+
+        now = time.time()
+        with self._connection() as conn:
+            counts = {status: 0 for status in JOB_STATUSES}
+            for row in conn.execute(
+                "SELECT status, COUNT(*) AS total FROM appeal_jobs GROUP BY status"
+            ):
+                counts[row["status"]] = row["total"]
+            queued = conn.execute(
+                "SELECT COUNT(*) AS ready, MIN(submitted_at) AS oldest "
+                "FROM appeal_jobs WHERE status = 'queued' AND available_at <= ?",
+                (now,),
+            ).fetchone()
+            finished = conn.execute(
+                "SELECT COUNT(*) AS total, AVG(run_seconds) AS avg_run, "
+                "AVG(started_at - submitted_at) AS avg_wait, SUM(attempts - 1) AS retries "
+                "FROM appeal_jobs WHERE status IN ('succeeded', 'failed')"
+            ).fetchone()
+
+        return {
+            "queue_depth": counts["queued"],
+            "ready_depth": queued["ready"],
+            "oldest_ready_age_seconds": (now - queued["oldest"]) if queued["oldest"] else 0.0,
+            "status_counts": counts,
+            "finished_jobs": finished["total"],
+            "retries": finished["retries"] or 0,
+            "avg_run_seconds": finished["avg_run"],
+            "avg_queue_wait_seconds": finished["avg_wait"],
+        }
+
+
+def run_appeal_job(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Run one queued generation request through the appeal pipeline."""
+
+    from .appeal_pipeline import run_generation_request
+
+    return run_generation_request(payload, include_generated_output=True)
+
+
+class AppealJobWorkerPool:
+    """Thread pool that drains the job queue independently of HTTP handlers."""
+
+    def __init__(
+        self,
+        queue: AppealJobQueue,
+        workers: int | None = None,
+        handler: Callable[[Mapping[str, Any]], Any] = run_appeal_job,
+    ):
+        self.queue = queue
+        self.workers = workers if workers is not None else queue.config.workers
+        self.handler = handler
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work_loop,
+                args=(f"{self._worker_prefix}:{index}",),
+                name=f"appeal-job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def run_once(self, worker_id: str | None = None) -> bool:
+        """Claim and process a single job; return False when the queue is idle."""
+
+        worker_id = worker_id or f"{self._worker_prefix}:inline"
+        job = self.queue.claim(worker_id)
+        if job is None:
+            return False
+        job_id = job["job_id"]
+        if job["cancel_requested"]:
+            self.queue.complete(job_id, worker_id, None)
+            return True
+
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job_id, worker_id, stop_heartbeat),
+            name=f"appeal-job-heartbeat-{job_id[:8]}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            result = self.handler(job["payload"])
+        except Exception as exc:
+            stop_heartbeat.set()
+            self.queue.fail(job_id, worker_id, f"{type(exc).__name__}: {exc}")
+        else:
+            stop_heartbeat.set()
+            self.queue.complete(job_id, worker_id, result)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join(timeout=5)
+        return True
+
+    def _heartbeat_loop(self, job_id: str, worker_id: str, stop: threading.Event) -> None:
+        interval = self.queue.config.lease_seconds / 3
+        while not stop.wait(interval):
+            if not self.queue.heartbeat(job_id, worker_id):
+                return
+
+    def _work_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            if not self.run_once(worker_id):
+                self._stop.wait(self.queue.config.poll_interval_seconds)
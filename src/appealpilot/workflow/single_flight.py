@@ -0,0 +1,106 @@
+"""Single-flight request coalescing for identical concurrent pipeline runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from threading import Event, Lock
+from typing import Any, Callable, Generic, Mapping, TypeVar
+
+_WHITESPACE = re.compile(r"\s+")
+
+T = TypeVar("T")
+
+
+def normalize_request_text(text: str | None) -> str:
+    """Collapse whitespace so trivially reformatted resubmissions share a key."""
+
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def build_request_key(
+    *,
+    denial_text: str,
+    chart_notes: str | None,
+    top_k: int,
+    generation_runtime: str,
+    retrieval: Mapping[str, Any],
+    evidence_compression: Mapping[str, Any] | None = None,
+    additional_instructions: str | None = None,
+    latency_budget_seconds: float | None = None,
+) -> str:
+    """Hash normalized pipeline inputs into a stable coalescing key."""
+
+    canonical = json.dumps(
+        {
+            "denial_text": normalize_request_text(denial_text),
+            "chart_notes": normalize_request_text(chart_notes),
+            "additional_instructions": normalize_request_text(additional_instructions),
+            "top_k": int(top_k),
+            "generation_runtime": generation_runtime,
+            "retrieval": dict(retrieval),
+            "evidence_compression": dict(evidence_compression or {}),
+            "latency_budget_seconds": latency_budget_seconds,
+        },
+        sort_keys=True,
+        ensure_ascii=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _InFlightCall(Generic[T]):
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one computation per key; concurrent callers share its outcome."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[str, _InFlightCall[T]] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Return `(result, shared)` where `shared` marks a coalesced caller."""
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Compare the single-pass denial parser with the original separate scans.
+
+    PYTHONPATH=src python src/scripts/benchmark_denial_parser.py --count 100000
+
+Checks that both give identical results on every letter, then prints
+throughput on a batch of `--count` letters (cycled from `--distinct` seeded
+synthetic letters) for each letter size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from appealpilot.benchmarks import synthetic_denial_letters
+from appealpilot.domain import ParsedDenial
+from appealpilot.ingest import parse_many
+from appealpilot.ingest.denial_parser import (
+    CPT_PATTERN,
+    DEADLINE_PATTERN,
+    DENIAL_REASON_PATTERN,
+    HCPCS_PATTERN,
+    KNOWN_PAYERS,
+)
+
+
+def separate_scan_parse(raw_text: str) -> ParsedDenial:
+    """The original implementation: payer substring loop plus one regex scan per field."""
+
+    text = raw_text.strip()
+    lowered = text.lower()
+    payer = next((name for name in KNOWN_PAYERS if name.lower() in lowered), None)
+    codes = sorted(set(CPT_PATTERN.findall(text)) | set(HCPCS_PATTERN.findall(text)))
+    reason_match = DENIAL_REASON_PATTERN.search(text)
+    return ParsedDenial(
+        raw_text=text,
+        payer=payer,
+        cpt_hcpcs_codes=tuple(codes),
+        denial_reason_text=reason_match.group(1).strip() if reason_match else text[:400],
+        deadline_hints=tuple(
+            dict.fromkeys(match.group(0).strip() for match in DEADLINE_PATTERN.finditer(text))
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=1_000)
+    parser.add_argument("--letter-sizes", type=int, nargs="+", default=[1_000, 4_000])
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    for size in args.letter_sizes:
+        letters = [item.text for item in synthetic_denial_letters(args.distinct, size, args.seed)]
+        batch = [letters[index % len(letters)] for index in range(args.count)]
+
+        started = time.perf_counter()
+        expected = [separate_scan_parse(text) for text in batch]
+        before = time.perf_counter() - started
+        started = time.perf_counter()
+        results = parse_many(batch)
+        after = time.perf_counter() - started
+        assert results == expected, "single-pass parser diverged from the separate scans"
+        print(
+            f"{args.count} letters x {size}c  {before:.2f}s -> {after:.2f}s  "
+            f"({args.count / after:,.0f} letters/s, {before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Compare the compiled Model A classifier with the original per-term regex scan.
+
+    PYTHONPATH=src python src/scripts/benchmark_model_a.py --batch-size 100000
+    PYTHONPATH=src python src/scripts/benchmark_model_a.py --linear-model data/interim/model_a/linear.npz
+
+Checks that both give identical results on every input, then prints per-call
+latency on long letters and throughput on a large batch of denial reasons.
+With `--linear-model`, also times the trained model's single-text and batch
+inference against the keyword baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from appealpilot.benchmarks import summarize_latencies, synthetic_denial_letters
+from appealpilot.domain import DenialClassification
+from appealpilot.ingest import parse_denial_text
+from appealpilot.models import classify_denial_reason, classify_many
+from appealpilot.models import LinearModelAClassifier
+from appealpilot.models.model_a_classifier import TAXONOMY, classify_with_keywords
+
+
+def per_term_classify(text: str) -> DenialClassification:
+    """The pre-compilation implementation: one `re.search` per term per call."""
+
+    best_category, best_score, best_terms = "other", 0, ()
+    for category, terms in TAXONOMY.items():
+        matched = tuple(term for term in terms if re.search(re.escape(term), text, re.IGNORECASE))
+        if len(matched) > best_score:
+            best_category, best_score, best_terms = category, len(matched), matched
+    confidence = min(1.0, 0.35 + (0.2 * best_score)) if best_score > 0 else 0.3
+    return DenialClassification(best_category, confidence, best_terms)
+
+
+def _latencies(func, texts) -> dict[str, float]:
+    values = []
+    for text in texts:
+        started = time.perf_counter()
+        func(text)
+        values.append(time.perf_counter() - started)
+    return summarize_latencies(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--letter-sizes", type=int, nargs="+", default=[1_000, 4_000, 16_000, 64_000]
+    )
+    parser.add_argument("--letters", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--linear-model", type=Path)
+    args = parser.parse_args()
+
+    for size in args.letter_sizes:
+        letters = [item.text for item in synthetic_denial_letters(args.letters, size, args.seed)]
+        assert classify_many(letters) == [per_term_classify(text) for text in letters]
+        before = _latencies(per_term_classify, letters)
+        after = _latencies(classify_denial_reason, letters)
+        print(
+            f"letters {size:>6}c  p50 {before['p50'] * 1e6:9.1f} -> {after['p50'] * 1e6:8.1f} us  "
+            f"p95 {before['p95'] * 1e6:9.1f} -> {after['p95'] * 1e6:8.1f} us"
+        )
+
+    reasons = [
+        parse_denial_text(item.text).denial_reason_text
+        for item in synthetic_denial_letters(1_000, 1_000, args.seed)
+    ]
+    batch = [reasons[index % len(reasons)] for index in range(args.batch_size)]
+    started = time.perf_counter()
+    expected = [per_term_classify(text) for text in batch]
+    before = time.perf_counter() - started
+    started = time.perf_counter()
+    results = classify_many(batch)
+    after = time.perf_counter() - started
+    assert results == expected
+    print(
+        f"batch {args.batch_size}  {before:.2f}s -> {after:.2f}s  "
+        f"({args.batch_size / after:,.0f} reasons/s, {before / after:.1f}x)"
+    )
+
+    if args.linear_model:
+        started = time.perf_counter()
+        model = LinearModelAClassifier.load(args.linear_model)
+        print(f"linear model load {time.perf_counter() - started:.3f}s")
+        keyword = _latencies(classify_with_keywords, reasons)
+        linear = _latencies(model.classify, reasons)
+        print(
+            f"single reason  keyword p50 {keyword['p50'] * 1e6:7.1f} us  "
+            f"linear p50 {linear['p50'] * 1e6:7.1f} us"
+        )
+        started = time.perf_counter()
+        for text in batch:
+            classify_with_keywords(text)
+        keyword_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        model.classify_many(batch)
+        linear_seconds = time.perf_counter() - started
+        print(
+            f"batch {args.batch_size}  keyword {args.batch_size / keyword_seconds:,.0f}/s  "
+            f"linear {args.batch_size / linear_seconds:,.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
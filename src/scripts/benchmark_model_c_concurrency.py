@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark Model C throughput under concurrency against the local stub server.
+
+Compares a fresh client per request (previous behavior) with the shared client
+plus the async, provider-capped `agenerate` path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from appealpilot.benchmarks import StubLLMServer, StubLLMServerConfig, summarize_latencies
+from appealpilot.models import ModelCConfig, ModelCGenerator, build_aisuite_client
+
+CASE_SUMMARY = {
+    "payer": "Aetna",
+    "cpt_hcpcs_codes": ["72148"],
+    "denial_reason_text": "Not medically necessary.",
+    "denial_category": "medical_necessity",
+}
+EVIDENCE = [
+    {"source_id": f"DFS-{idx}", "snippet": "lumbar MRI overturned after failed PT " * 8}
+    for idx in range(5)
+]
+
+
+def _run_fresh_clients(config: ModelCConfig, requests: int, concurrency: int) -> dict:
+    def _one(_: int) -> float:
+        started = time.perf_counter()
+        ModelCGenerator(config=config, client=build_aisuite_client()).generate(
+            case_summary=CASE_SUMMARY, retrieved_evidence=EVIDENCE
+        )
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(_one, range(requests)))
+    return summarize_latencies(latencies, time.perf_counter() - started)
+
+
+async def _run_shared_async(config: ModelCConfig, requests: int) -> dict:
+    generator = ModelCGenerator(config=config)
+
+    async def _one() -> float:
+        started = time.perf_counter()
+        await generator.agenerate(case_summary=CASE_SUMMARY, retrieved_evidence=EVIDENCE)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(_one() for _ in range(requests)))
+    return summarize_latencies(list(latencies), time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--model", default="openai:gpt-4o-mini")
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        StubLLMServerConfig(
+            latency_seconds=args.latency_ms / 1000.0,
+            tokens_per_second=args.tokens_per_second,
+        )
+    ).start()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    config = ModelCConfig(model=args.model, max_in_flight=args.concurrency)
+
+    try:
+        results = {
+            "fresh_client_threads": _run_fresh_clients(config, args.requests, args.concurrency),
+            "shared_client_async": asyncio.run(_run_shared_async(config, args.requests)),
+            "stub_max_in_flight": server.max_in_flight,
+        }
+    finally:
+        server.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark the full vs slim Model C output contract against the stub server.
+
+The slim contract drops the checklist and citation excerpts from the completion,
+so the comparison isolates the completion-token (and generation time) savings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from appealpilot.benchmarks import StubLLMServer, StubLLMServerConfig, summarize_latencies
+from appealpilot.models import ModelCConfig, ModelCGenerator, build_aisuite_client
+
+CASE_SUMMARY = {
+    "payer": "Aetna",
+    "cpt_hcpcs_codes": ["72148"],
+    "denial_reason_text": "Not medically necessary.",
+    "denial_category": "medical_necessity",
+    "chart_notes_excerpt": "Failed 8 weeks of PT; persistent radicular pain. " * 4,
+}
+EVIDENCE = [
+    {"source_id": f"DFS-{idx}", "snippet": "lumbar MRI overturned after failed PT " * 8}
+    for idx in range(5)
+]
+ATTACHMENTS = [
+    "Provider progress note",
+    "Prior failed conservative therapy documentation",
+    "Relevant imaging or diagnostic report",
+]
+
+
+def _run_contract(contract: str, model: str, requests: int, concurrency: int) -> dict:
+    generator = ModelCGenerator(
+        config=ModelCConfig(model=model, output_contract=contract, max_in_flight=64),
+        client=build_aisuite_client(),
+    )
+    completion_tokens: list[int] = []
+
+    def _one(_: int) -> float:
+        started = time.perf_counter()
+        result = generator.generate(
+            case_summary=CASE_SUMMARY,
+            retrieved_evidence=EVIDENCE,
+            required_attachments=ATTACHMENTS,
+        )
+        completion_tokens.append(int(result["usage"].get("completion_tokens") or 0))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(_one, range(requests)))
+    summary = summarize_latencies(latencies, time.perf_counter() - started)
+    summary["mean_completion_tokens"] = (
+        sum(completion_tokens) / len(completion_tokens) if completion_tokens else 0.0
+    )
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--model", default="openai:gpt-4o-mini")
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        StubLLMServerConfig(
+            latency_seconds=args.latency_ms / 1000.0,
+            tokens_per_second=args.tokens_per_second,
+        )
+    ).start()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    try:
+        full = _run_contract("full", args.model, args.requests, args.concurrency)
+        slim = _run_contract("slim", args.model, args.requests, args.concurrency)
+    finally:
+        server.stop()
+
+    print(
+        json.dumps(
+            {
+                "full": full,
+                "slim": slim,
+                "completion_token_savings": (
+                    1 - slim["mean_completion_tokens"] / full["mean_completion_tokens"]
+                    if full["mean_completion_tokens"]
+                    else None
+                ),
+                "p50_speedup": full["p50"] / slim["p50"] if slim["p50"] else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Measure provider prefix-cache savings on repeated Model C traffic with the stub server.
+
+Requests cycle over a few distinct cases (re-generations, retries, job replays).
+The stub simulates OpenAI-style prefix caching plus a prefill cost for uncached
+prompt tokens, so the run reports cached-token share and time-to-first-token
+with caching on vs. off.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from appealpilot.benchmarks import StubLLMServer, StubLLMServerConfig, summarize_latencies
+from appealpilot.models import ModelCConfig, ModelCGenerator, build_aisuite_client
+
+EVIDENCE = [
+    {"source_id": f"DFS-{idx}", "snippet": "lumbar MRI overturned after failed PT " * 20}
+    for idx in range(5)
+]
+
+
+def _case(idx: int) -> dict:
+    return {
+        "payer": ["Aetna", "Cigna", "UnitedHealthcare"][idx],
+        "cpt_hcpcs_codes": ["72148"],
+        "denial_reason_text": "Not medically necessary.",
+        "denial_category": "medical_necessity",
+        "chart_notes_excerpt": f"Case {idx}: failed 8 weeks of PT; persistent radicular pain. " * 6,
+    }
+
+
+def _run(cache_min_tokens: int, args: argparse.Namespace) -> dict:
+    server = StubLLMServer(
+        StubLLMServerConfig(
+            latency_seconds=args.latency_ms / 1000.0,
+            tokens_per_second=args.tokens_per_second,
+            prompt_tokens_per_second=args.prompt_tokens_per_second,
+            prefix_cache_min_tokens=cache_min_tokens,
+        )
+    ).start()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    generator = ModelCGenerator(
+        config=ModelCConfig(model=args.model), client=build_aisuite_client()
+    )
+
+    ttfts: list[float] = []
+    prompt_tokens = cached_tokens = 0
+    started = time.perf_counter()
+    try:
+        for idx in range(args.requests):
+            # Like the pipeline, every request carries a fresh timestamp.
+            case_summary = {
+                **_case(idx % args.cases),
+                "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            }
+            request_started = time.perf_counter()
+            first_event = None
+            for event in generator.generate_stream(
+                case_summary=case_summary, retrieved_evidence=EVIDENCE
+            ):
+                if first_event is None:
+                    first_event = time.perf_counter() - request_started
+                if event["event"] == "complete":
+                    usage = event["result"]["usage"]
+            ttfts.append(first_event or 0.0)
+            prompt_tokens += int(usage.get("prompt_tokens") or 0)
+            cached_tokens += int(usage.get("cached_prompt_tokens") or 0)
+    finally:
+        server.stop()
+
+    summary = summarize_latencies(ttfts, time.perf_counter() - started)
+    summary["cached_prompt_share"] = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    summary["mean_prompt_tokens"] = prompt_tokens / args.requests
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=24)
+    parser.add_argument("--cases", type=int, default=3, choices=(1, 2, 3))
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--model", default="openai:gpt-4o-mini")
+    args = parser.parse_args()
+
+    uncached = _run(10**9, args)
+    cached = _run(1024, args)
+    print(
+        json.dumps(
+            {
+                "ttft_no_prefix_cache": uncached,
+                "ttft_prefix_cache": cached,
+                "p50_ttft_speedup": uncached["p50"] / cached["p50"] if cached["p50"] else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
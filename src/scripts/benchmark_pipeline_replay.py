@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Offline `AppealPipeline` throughput benchmark driven by a Model C cassette.
+
+Record once against a real provider (or the stub server), then replay with the
+recorded latencies so runs are reproducible:
+
+  OPENAI_API_KEY=... PYTHONPATH=src python src/scripts/benchmark_pipeline_replay.py \
+    --cassette data/interim/cassettes/model_c.jsonl --record --requests 1 \
+    --denial-text-file docs/examples/denial_sample.txt
+  PYTHONPATH=src python src/scripts/benchmark_pipeline_replay.py \
+    --cassette data/interim/cassettes/model_c.jsonl --requests 64 --concurrency 8 \
+    --denial-text-file docs/examples/denial_sample.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from appealpilot.benchmarks import summarize_latencies
+from appealpilot.config.key_loader import load_local_keys
+from appealpilot.workflow import AppealPipeline, AppealPipelineConfig
+
+
+def main() -> None:
+    load_local_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cassette", type=Path, required=True)
+    parser.add_argument("--record", action="store_true", help="Call the provider and record.")
+    parser.add_argument("--denial-text-file", type=Path, required=True)
+    parser.add_argument("--chart-notes-file", type=Path)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--collection-name")
+    parser.add_argument(
+        "--embedding-provider",
+        choices=["openai", "hash", "sbert", "insurance_bert", "local"],
+        default="hash",
+    )
+    args = parser.parse_args()
+
+    os.environ["MODEL_C_CASSETTE"] = str(args.cassette)
+    os.environ["MODEL_C_CASSETTE_MODE"] = "record" if args.record else "replay"
+    os.environ["MODEL_C_CASSETTE_LATENCY_SCALE"] = str(args.latency_scale)
+
+    denial_text = args.denial_text_file.read_text()
+    chart_notes = args.chart_notes_file.read_text() if args.chart_notes_file else ""
+    retrieval_overrides = {"embedding_provider": args.embedding_provider}
+    if args.collection_name:
+        retrieval_overrides["collection_name"] = args.collection_name
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(
+            top_k=args.top_k, generation_runtime="aisuite", coalesce_requests=False
+        ),
+        retrieval_overrides=retrieval_overrides,
+    )
+
+    fallbacks: dict[str, int] = {}
+
+    def _one(_: int) -> float:
+        started = time.perf_counter()
+        packet = pipeline.run(denial_text=denial_text, chart_notes=chart_notes, top_k=args.top_k)
+        reason = packet.generated_output.get("fallback_reason")
+        if reason:
+            fallbacks[reason] = fallbacks.get(reason, 0) + 1
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(_one, range(args.requests)))
+    summary = summarize_latencies(latencies, time.perf_counter() - started)
+    summary["fallbacks"] = fallbacks
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,7 @@ def main() -> None:
     print(f"Collection: {result['collection_name']}")
     print(f"Documents upserted: {result['documents_upserted']}")
     print(f"Collection size: {result['collection_size']}")
+    print(f"Category centroids: {result['category_centroids'] or 'none'}")
 
 
 if __name__ == "__main__":
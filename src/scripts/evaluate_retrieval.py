@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare embedding providers on recall@k / MRR vs. build time, size and query latency.
+
+    PYTHONPATH=src python src/scripts/evaluate_retrieval.py \
+      --xlsx data/raw/dfs_external_appeals/ny_dfs_external_appeals_all_years.xlsx --limit 5000
+
+Without `--xlsx` a seeded synthetic corpus is used (pipeline smoke test only;
+its families are trivially separable). Record OpenAI embeddings once with
+`--embedding-cache PATH --embedding-cache-mode record`, then rerun with `replay`
+to evaluate them offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from appealpilot.benchmarks import synthetic_dfs_documents
+from appealpilot.benchmarks.retrieval_eval import (
+    DEFAULT_VARIANTS,
+    RetrievalEvalConfig,
+    run_retrieval_eval,
+)
+from appealpilot.config.key_loader import load_local_keys
+from appealpilot.retrieval import load_dfs_documents
+from appealpilot.retrieval.chroma_retriever import (
+    EMBEDDING_CACHE_ENV,
+    EMBEDDING_CACHE_MODE_ENV,
+    EMBEDDING_CACHE_MODES,
+)
+
+
+def main() -> None:
+    load_local_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--xlsx", type=Path)
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--synthetic", type=int, default=1_000, help="Corpus size without --xlsx.")
+    parser.add_argument("--variants", nargs="+", default=list(DEFAULT_VARIANTS))
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--max-queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--work-dir", default="data/interim/retrieval_eval")
+    parser.add_argument("--embedding-cache", type=Path)
+    parser.add_argument("--embedding-cache-mode", choices=EMBEDDING_CACHE_MODES, default="record")
+    parser.add_argument("--output", type=Path, default=Path("outputs/retrieval_eval.json"))
+    args = parser.parse_args()
+
+    if args.embedding_cache:
+        os.environ[EMBEDDING_CACHE_ENV] = str(args.embedding_cache)
+        os.environ[EMBEDDING_CACHE_MODE_ENV] = args.embedding_cache_mode
+
+    if args.xlsx:
+        documents = load_dfs_documents(args.xlsx, limit=args.limit)
+    else:
+        documents = synthetic_dfs_documents(args.synthetic, seed=args.seed)
+
+    results = run_retrieval_eval(
+        documents,
+        RetrievalEvalConfig(
+            variants=tuple(args.variants),
+            k_values=tuple(args.k),
+            max_queries=args.max_queries,
+            seed=args.seed,
+            work_dir=args.work_dir,
+        ),
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    print(f"documents={results['documents']} queries={results['queries']}")
+    recall_columns = [f"recall@{k}" for k in args.k]
+    print(
+        f"{'variant':<16}"
+        + "".join(f"{name:>11}" for name in [*recall_columns, "mrr"])
+        + f"{'build s':>10}{'size MB':>10}{'p50 ms':>9}{'p95 ms':>9}"
+    )
+    for variant, row in results["variants"].items():
+        print(
+            f"{variant:<16}"
+            + "".join(f"{row[name]:>11.3f}" for name in [*recall_columns, "mrr"])
+            + f"{row['build_seconds']:>10.2f}{row['index_bytes'] / 1e6:>10.1f}"
+            + f"{row['query_p50_seconds'] * 1000:>9.2f}{row['query_p95_seconds'] * 1000:>9.2f}"
+        )
+    for variant, reason in results["skipped"].items():
+        print(f"{variant:<16} skipped: {reason}")
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
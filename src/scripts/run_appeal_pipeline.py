@@ -7,6 +7,7 @@ import argparse
 from pathlib import Path
 
 from appealpilot.config.key_loader import load_local_keys
+from appealpilot.ingest.denial_stream import parse_denial_file
 from appealpilot.workflow import run_pipeline_once
 
 
@@ -33,9 +34,18 @@ def main() -> None:
         "--embedding-provider",
         choices=["openai", "hash", "sbert", "insurance_bert", "local"],
     )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Read the whole --denial-text-file instead of stopping once key fields are found.",
+    )
     args = parser.parse_args()
 
-    denial_text = _read_text_arg(args.denial_text_file, args.denial_text)
+    if not args.denial_text and args.denial_text_file and args.denial_text_file.exists():
+        # Streamed in chunks, so multi-hundred-page packets never sit in memory whole.
+        denial_text = parse_denial_file(args.denial_text_file, stop_early=not args.full_scan)
+    else:
+        denial_text = _read_text_arg(args.denial_text_file, args.denial_text)
     chart_notes = ""
     if args.chart_notes or args.chart_notes_file:
         chart_notes = _read_text_arg(args.chart_notes_file, args.chart_notes)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Generate appeal packets for many cases through a provider batch job.
+
+Submit (returns immediately, prints the batch directory):
+    PYTHONPATH=src python src/scripts/run_batch_appeals.py --cases cases.jsonl
+
+Collect later (waits until the batch finishes, then exports packets):
+    PYTHONPATH=src python src/scripts/run_batch_appeals.py --collect data/interim/batches/<run>
+
+`cases.jsonl` holds one object per line with `denial_text` and optional
+`case_id`, `chart_notes`, `top_k`, `additional_instructions`. `--provider local`
+runs the batch in-process through the regular chat client (e.g. against
+`run_llm_stub_server.py`) and always waits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from appealpilot.config.key_loader import load_local_keys
+from appealpilot.models import (
+    LocalBatchProvider,
+    ModelCGenerator,
+    OpenAICompatibleBatchProvider,
+    build_model_c_config,
+)
+from appealpilot.workflow import AppealPipeline, AppealPipelineConfig, BatchAppealRunner
+
+
+def main() -> None:
+    load_local_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=Path, help="JSONL file of cases to prepare and submit.")
+    parser.add_argument("--collect", type=Path, help="Batch directory to collect.")
+    parser.add_argument("--batch-dir", type=Path)
+    parser.add_argument("--output-root", type=Path)
+    parser.add_argument("--provider", choices=["auto", "openai", "groq", "local"], default="auto")
+    parser.add_argument("--wait", action="store_true", help="Collect right after submitting.")
+    parser.add_argument("--poll-interval", type=float, default=60.0)
+    parser.add_argument("--timeout", type=float)
+    parser.add_argument("--collection-name")
+    parser.add_argument(
+        "--embedding-provider",
+        choices=["openai", "hash", "sbert", "insurance_bert", "local"],
+    )
+    args = parser.parse_args()
+    if bool(args.cases) == bool(args.collect):
+        parser.error("Pass exactly one of --cases or --collect.")
+
+    retrieval_overrides = {}
+    if args.collection_name:
+        retrieval_overrides["collection_name"] = args.collection_name
+    if args.embedding_provider:
+        retrieval_overrides["embedding_provider"] = args.embedding_provider
+
+    model_c_config = build_model_c_config()
+    generator = ModelCGenerator(config=model_c_config)
+    provider_name = model_c_config.provider if args.provider == "auto" else args.provider
+    if provider_name == "local":
+        provider = LocalBatchProvider(generator.client, provider=model_c_config.provider)
+    else:
+        provider = OpenAICompatibleBatchProvider(provider_name)
+    runner = BatchAppealRunner(
+        AppealPipeline(config=AppealPipelineConfig(), retrieval_overrides=retrieval_overrides or None),
+        generator,
+        provider,
+    )
+
+    batch_dir = args.collect
+    if args.cases:
+        cases = [
+            json.loads(line) for line in args.cases.read_text().splitlines() if line.strip()
+        ]
+        batch_dir = runner.prepare(cases, args.batch_dir)
+        batch_id = runner.submit(batch_dir)
+        print(f"Submitted {len(cases)} case(s) as {batch_id}; batch directory: {batch_dir}")
+        if not (args.wait or provider_name == "local"):
+            return
+
+    summaries = runner.collect(
+        batch_dir,
+        output_root=args.output_root,
+        poll_interval_seconds=args.poll_interval,
+        timeout_seconds=args.timeout,
+    )
+    fallbacks = sum(1 for summary in summaries if summary["fallback_reason"])
+    for summary in summaries:
+        print(f"{summary['custom_id']}: {summary['export_dir']}")
+    print(f"Exported {len(summaries)} packet(s), {fallbacks} template fallback(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Run the synthetic end-to-end benchmark suite or gate on a baseline.
+
+    PYTHONPATH=src python src/scripts/run_benchmark_suite.py run \
+      --output outputs/benchmarks/current.json
+    PYTHONPATH=src python src/scripts/run_benchmark_suite.py compare \
+      outputs/benchmarks/baseline.json outputs/benchmarks/current.json --threshold 0.2
+
+`compare` exits with status 1 when any metric regressed past the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from appealpilot.benchmarks.suite import (
+    BENCHMARK_RUNTIMES,
+    DEFAULT_COMPARE_METRICS,
+    BenchmarkSuiteConfig,
+    compare_results,
+    load_results,
+    run_benchmark_suite,
+    write_results,
+)
+
+
+def _run(args: argparse.Namespace) -> int:
+    results = run_benchmark_suite(
+        BenchmarkSuiteConfig(
+            corpus_size=args.corpus_size,
+            denial_sizes=tuple(args.denial_sizes),
+            iterations=args.iterations,
+            pipeline_iterations=args.pipeline_iterations,
+            classify_batch_size=args.classify_batch_size,
+            parse_batch_size=args.parse_batch_size,
+            providers=tuple(args.providers),
+            runtimes=tuple(args.runtimes),
+            top_k=args.top_k,
+            cassette_path=args.cassette,
+            replay_latency_scale=args.replay_latency_scale,
+            seed=args.seed,
+            work_dir=args.work_dir,
+        )
+    )
+    write_results(results, args.output)
+    for name, summary in results["benchmarks"].items():
+        print(
+            f"{name:<42} p50={summary['p50'] * 1000:9.3f} ms  p95={summary['p95'] * 1000:9.3f} ms  "
+            f"p99={summary['p99'] * 1000:9.3f} ms  {summary['throughput_per_second']:10.1f}/s"
+        )
+    for name, reason in results["skipped"].items():
+        print(f"{name:<42} skipped: {reason}")
+    print(f"wrote {args.output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    regressions = compare_results(
+        load_results(args.baseline),
+        load_results(args.current),
+        threshold=args.threshold,
+        metrics=tuple(args.metrics),
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression.describe()}")
+    if not regressions:
+        print(f"No regressions past {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write results JSON.")
+    run.add_argument("--output", type=Path, default=Path("outputs/benchmarks/results.json"))
+    run.add_argument("--corpus-size", type=int, default=500)
+    run.add_argument("--denial-sizes", type=int, nargs="+", default=[1_000, 4_000, 16_000])
+    run.add_argument("--iterations", type=int, default=200)
+    run.add_argument("--pipeline-iterations", type=int, default=25)
+    run.add_argument("--classify-batch-size", type=int, default=100_000)
+    run.add_argument("--parse-batch-size", type=int, default=100_000)
+    run.add_argument("--providers", nargs="+", default=["hash", "sbert"])
+    run.add_argument(
+        "--runtimes", nargs="+", choices=BENCHMARK_RUNTIMES, default=list(BENCHMARK_RUNTIMES)
+    )
+    run.add_argument("--top-k", type=int, default=5)
+    run.add_argument("--cassette", help="Replay this cassette instead of recording one.")
+    run.add_argument("--replay-latency-scale", type=float, default=1.0)
+    run.add_argument("--seed", type=int, default=13)
+    run.add_argument("--work-dir", default="data/interim/benchmarks")
+    run.set_defaults(handler=_run)
+
+    compare = commands.add_parser("compare", help="Fail when current regressed vs baseline.")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.2)
+    compare.add_argument("--metrics", nargs="+", default=list(DEFAULT_COMPARE_METRICS))
+    compare.set_defaults(handler=_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
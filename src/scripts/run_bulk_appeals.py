@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Run the appeal pipeline over a directory or JSONL file of denials.
+
+    PYTHONPATH=src python src/scripts/run_bulk_appeals.py --input denials/ --workers 4
+
+Rerunning with the same `--output-root` skips cases already in the checkpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from appealpilot.config.key_loader import load_local_keys
+from appealpilot.workflow import BulkRunConfig, load_bulk_cases, run_bulk
+
+
+def main() -> None:
+    load_local_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=Path, required=True, help="Directory of .txt denials or JSONL.")
+    parser.add_argument("--output-root", default="outputs/appeals/bulk")
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--generation-concurrency", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--generation-runtime", choices=["auto", "aisuite", "template"], default="auto")
+    parser.add_argument("--collection-name")
+    parser.add_argument(
+        "--embedding-provider",
+        choices=["openai", "hash", "sbert", "insurance_bert", "local"],
+    )
+    args = parser.parse_args()
+
+    retrieval_overrides = {}
+    if args.collection_name:
+        retrieval_overrides["collection_name"] = args.collection_name
+    if args.embedding_provider:
+        retrieval_overrides["embedding_provider"] = args.embedding_provider
+
+    cases = load_bulk_cases(args.input)
+    summary = run_bulk(
+        cases,
+        BulkRunConfig(
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            generation_concurrency=args.generation_concurrency,
+            top_k=args.top_k,
+            generation_runtime=args.generation_runtime,
+            output_root=args.output_root,
+            checkpoint_path=args.checkpoint,
+        ),
+        retrieval_overrides=retrieval_overrides or None,
+    )
+
+    print(
+        f"completed={summary['completed']} skipped={summary['skipped']} "
+        f"fallbacks={summary['fallbacks']} wall={summary['wall_seconds']:.2f}s "
+        f"throughput={summary['cases_per_second']:.2f} cases/s"
+    )
+    for stage, latencies in summary["stages"].items():
+        print(f"  {stage:<15} p50={latencies['p50'] * 1000:8.1f} ms  p95={latencies['p95'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
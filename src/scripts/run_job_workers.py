@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Run appeal job workers against the shared SQLite job queue."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from appealpilot.config.key_loader import load_local_keys
+from appealpilot.workflow import AppealJobQueue, AppealJobWorkerPool, build_job_queue_config
+
+
+def main() -> None:
+    load_local_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--db-path")
+    parser.add_argument("--metrics-interval", type=float, default=30.0)
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.workers is not None:
+        overrides["workers"] = args.workers
+    if args.db_path:
+        overrides["db_path"] = args.db_path
+
+    queue = AppealJobQueue(build_job_queue_config(overrides=overrides or None))
+    pool = AppealJobWorkerPool(queue)
+    pool.start()
+    print(f"Started {pool.workers} worker(s) on {queue.config.db_path}")
+
+    try:
+        while True:
+            time.sleep(args.metrics_interval)
+            metrics = queue.metrics()
+            print(
+                f"queue_depth={metrics['queue_depth']} "
+                f"running={metrics['status_counts']['running']} "
+                f"succeeded={metrics['status_counts']['succeeded']} "
+                f"failed={metrics['status_counts']['failed']}"
+            )
+    except KeyboardInterrupt:
+        pool.stop(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
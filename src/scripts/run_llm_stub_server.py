@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Run a local OpenAI-compatible stub server for offline Model C benchmarks.
+
+Example:
+  PYTHONPATH=src python src/scripts/run_llm_stub_server.py --port 8787 --latency-ms 400
+  OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8787/v1 \
+    PYTHONPATH=src python src/scripts/run_appeal_pipeline.py ... --generation-runtime aisuite
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from appealpilot.benchmarks import StubLLMServer, StubLLMServerConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument(
+        "--prompt-tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Prefill rate for uncached prompt tokens (0 = free).",
+    )
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        StubLLMServerConfig(
+            host=args.host,
+            port=args.port,
+            latency_seconds=args.latency_ms / 1000.0,
+            tokens_per_second=args.tokens_per_second,
+            prompt_tokens_per_second=args.prompt_tokens_per_second,
+        )
+    )
+    print(f"Stub LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Train the hashed n-gram Model A and write its `.npz` artifact.
+
+    PYTHONPATH=src python src/scripts/train_model_a.py \
+      --dfs-xlsx data/raw/dfs_external_appeals/ny_dfs_external_appeals_all_years.xlsx \
+      --labeled-jsonl data/interim/model_a/denials.jsonl
+
+Labeled JSONL lines are `{"text": ..., "category": ...}`. DFS records are
+labeled from their coverage type. A held-out split is scored against the
+keyword baseline. Enable the model with `APPEALPILOT_MODEL_A_BACKEND=linear`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+
+from appealpilot.benchmarks import synthetic_denial_letters
+from appealpilot.ingest import parse_denial_text
+from appealpilot.models import HashedNgramFeaturizer, LinearModelAClassifier
+from appealpilot.models.model_a_classifier import classify_with_keywords
+from appealpilot.models.model_a_linear import dfs_training_examples, load_labeled_jsonl
+from appealpilot.retrieval import load_dfs_documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dfs-xlsx", type=Path)
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--labeled-jsonl", type=Path, nargs="*", default=[])
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Add N synthetic labeled denial reasons."
+    )
+    parser.add_argument("--output", type=Path, default=Path("data/interim/model_a/linear.npz"))
+    parser.add_argument("--dimensions", type=int, default=2**16)
+    parser.add_argument("--max-ngram", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--learning-rate", type=float, default=1.0)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    examples: list[tuple[str, str]] = []
+    if args.dfs_xlsx:
+        examples.extend(dfs_training_examples(load_dfs_documents(args.dfs_xlsx, limit=args.limit)))
+    for path in args.labeled_jsonl:
+        examples.extend(load_labeled_jsonl(path))
+    if args.synthetic:
+        examples.extend(
+            (parse_denial_text(item.text).denial_reason_text, item.category)
+            for item in synthetic_denial_letters(args.synthetic, seed=args.seed)
+        )
+    if not examples:
+        parser.error("No training data: pass --dfs-xlsx, --labeled-jsonl or --synthetic.")
+
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout)) if args.holdout > 0 else len(examples)
+    train, holdout = examples[:split], examples[split:]
+    model = LinearModelAClassifier.train(
+        [text for text, _ in train],
+        [label for _, label in train],
+        featurizer=HashedNgramFeaturizer(dimensions=args.dimensions, max_ngram=args.max_ngram),
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        seed=args.seed,
+    )
+    model.save(args.output)
+    print(f"trained on {len(train)} examples, classes={list(model.classes)}")
+    print(f"wrote {args.output} ({args.output.stat().st_size / 1024:.1f} KiB)")
+
+    if holdout:
+        texts = [text for text, _ in holdout]
+        linear = model.classify_many(texts)
+        keyword = [classify_with_keywords(text) for text in texts]
+        for name, predictions in (("linear", linear), ("keyword", keyword)):
+            correct = sum(
+                prediction.category == label
+                for prediction, (_, label) in zip(predictions, holdout)
+            )
+            print(f"holdout accuracy {name:<8} {correct / len(holdout):.3f} (n={len(holdout)})")
+
+
+if __name__ == "__main__":
+    main()
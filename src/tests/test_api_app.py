@@ -14,6 +14,13 @@ def test_health_endpoint() -> None:
     assert response.json()["status"] == "ok"
 
 
+def test_pipeline_stats_endpoint() -> None:
+    response = client.get("/pipeline/stats")
+    assert response.status_code == 200
+    assert set(response.json()["coalescing"]) == {"executed", "coalesced", "in_flight"}
+    assert {"attempts", "repaired", "failed", "success_rate"} <= set(response.json()["json_repair"])
+
+
 def test_classify_endpoint() -> None:
     response = client.post(
         "/classify",
@@ -25,3 +32,79 @@ def test_classify_endpoint() -> None:
     body = response.json()
     assert "classification" in body
     assert body["classification"]["category"] in {"medical_necessity", "other"}
+
+
+def test_job_endpoints_submit_status_and_cancel(tmp_path, monkeypatch) -> None:
+    from appealpilot.api import app as app_module
+    from appealpilot.workflow import AppealJobQueue, JobQueueConfig
+
+    queue = AppealJobQueue(JobQueueConfig(db_path=str(tmp_path / "jobs.sqlite3")))
+    monkeypatch.setattr(app_module, "_JOB_QUEUE", queue)
+
+    submitted = client.post(
+        "/jobs",
+        json={"denial_text": "Denial Reason: not medically necessary.", "top_k": 2},
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    status = client.get(f"/jobs/{job_id}").json()
+    assert status["status"] == "queued"
+    assert client.get(f"/jobs/{job_id}/result").status_code == 409
+    assert client.get("/jobs/metrics").json()["queue_depth"] == 1
+
+    cancelled = client.post(f"/jobs/{job_id}/cancel").json()
+    assert cancelled["status"] == "cancelled"
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_generate_stream_endpoint_emits_server_sent_events(monkeypatch) -> None:
+    from appealpilot.api import app as app_module
+
+    def _fake_stream(request):
+        yield {"event": "delta", "section": "cover_letter", "text": "Dear"}
+        yield {"event": "complete", "export_dir": "out", "evidence_count": 0}
+
+    monkeypatch.setattr(app_module, "stream_generation_request", _fake_stream)
+    response = client.post("/generate/stream", json={"denial_text": "Denial Reason: x"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:2] == [
+        'event: delta\ndata: {"section": "cover_letter", "text": "Dear"}',
+        'event: complete\ndata: {"export_dir": "out", "evidence_count": 0}',
+    ]
+
+
+def test_metrics_endpoint_exposes_request_and_cache_metrics() -> None:
+    client.post("/classify", json={"denial_text": "Denial Reason: not medically necessary."})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'appealpilot_http_requests_total{method="POST",route="/classify",status="200"}'
+        in response.text
+    )
+    assert 'appealpilot_http_request_duration_seconds_bucket{route="/classify",le="+Inf"}' in (
+        response.text
+    )
+    assert 'appealpilot_cache_events_total{cache="single_flight",result="hit"}' in response.text
+
+
+def test_classify_upload_parses_raw_body_stream() -> None:
+    body = b"Payer: Cigna\nDenial Reason: Out of network provider.\nAppeal within 30 days.\n"
+    response = client.post(
+        "/classify/upload",
+        content=body + b"filler\n" * 5_000,
+        headers={"content-type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["payer"] == "Cigna"
+    assert payload["deadline_hints"] == ["within 30 days"]
+    assert payload["classification"]["category"] == "out_of_network"
+    assert payload["stopped_early"] is True
+    assert client.post("/classify/upload", content=b"").status_code == 400
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
 from pathlib import Path
 
 from appealpilot.models import ModelCResponseError
-from appealpilot.workflow.appeal_pipeline import AppealPipeline, AppealPipelineConfig
+from appealpilot.workflow.appeal_pipeline import (
+    AppealPipeline,
+    AppealPipelineConfig,
+    coalescing_stats,
+)
 from appealpilot.workflow import run_pipeline_once
 
 
@@ -67,3 +74,191 @@ def test_pipeline_falls_back_to_template_on_model_c_response_error(
     assert packet.generated_output["provider"] == "template"
     assert packet.generated_output["fallback_reason"] == "Model returned empty content."
     assert packet.generated_output["fallback_from"]["provider"] == "openai"
+
+
+class _CountingRetriever:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def query(self, query_text: str, top_k: int):
+        self.calls += 1
+        return []
+
+
+class _SlowGenerator:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        time.sleep(0.2)
+        return {"provider": "slow-stub", "cover_letter": "Please reconsider."}
+
+
+def test_concurrent_identical_runs_share_one_retrieval_and_generation(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(generation_runtime="template"),
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "pipeline_coalesce_collection",
+            "embedding_provider": "hash",
+        },
+    )
+    retriever = _CountingRetriever()
+    generator = _SlowGenerator()
+    pipeline.retriever = retriever
+    monkeypatch.setattr(pipeline, "_select_generator", lambda: generator)
+
+    before = coalescing_stats()
+    packets = []
+    threads = [
+        threading.Thread(
+            target=lambda: packets.append(
+                pipeline.run(
+                    denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.",
+                    chart_notes="Failed PT.",
+                    top_k=2,
+                )
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(packets) == 4
+    assert retriever.calls == 1
+    assert generator.calls == 1
+    assert coalescing_stats()["coalesced"] - before["coalesced"] == 3
+
+    packets[0].generated_output["cover_letter"] = "mutated"
+    assert {packet.generated_output["cover_letter"] for packet in packets[1:]} == {
+        "Please reconsider."
+    }
+
+
+def test_run_stream_yields_context_sections_and_packet(tmp_path: Path) -> None:
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(generation_runtime="template"),
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "pipeline_stream_collection",
+            "embedding_provider": "hash",
+        },
+    )
+
+    events = list(
+        pipeline.run_stream(
+            denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.\nCPT: 72148",
+            top_k=2,
+        )
+    )
+
+    assert events[0]["event"] == "context"
+    assert "cover_letter" in [event.get("section") for event in events]
+    assert events[-1]["event"] == "complete"
+    assert events[-1]["packet"].generated_output["provider"] == "template"
+
+
+class _HangingGenerator:
+    class config:  # noqa: N801
+        provider = "openai"
+        model = "openai:gpt-5-mini"
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.finished = threading.Event()
+
+    def generate(self, **kwargs):
+        time.sleep(self.delay)
+        self.finished.set()
+        return {"provider": "openai", "model": "openai:gpt-5-mini", "output": {}}
+
+
+def _deadline_pipeline(tmp_path: Path, monkeypatch, generator) -> AppealPipeline:
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(generation_runtime="aisuite", coalesce_requests=False),
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "pipeline_deadline_collection",
+            "embedding_provider": "hash",
+        },
+    )
+    monkeypatch.setattr(pipeline, "_select_generator", lambda: generator)
+    return pipeline
+
+
+def test_deadline_returns_template_when_model_c_hangs(tmp_path: Path, monkeypatch) -> None:
+    generator = _HangingGenerator(delay=1.0)
+    pipeline = _deadline_pipeline(tmp_path, monkeypatch, generator)
+
+    started = time.monotonic()
+    packet = pipeline.run(
+        denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.",
+        top_k=1,
+        latency_budget_seconds=0.2,
+    )
+
+    assert time.monotonic() - started < 0.8
+    assert packet.generated_output["provider"] == "template"
+    assert packet.generated_output["fallback_reason"] == "deadline_exceeded"
+    assert packet.generated_output["fallback_from"]["model"] == "openai:gpt-5-mini"
+    assert packet.generated_output["deadline"]["budget_seconds"] == 0.2
+    # The abandoned call keeps running so it can still populate the cache.
+    assert generator.finished.wait(timeout=2)
+
+
+def test_model_c_result_is_used_when_it_beats_the_deadline(tmp_path: Path, monkeypatch) -> None:
+    pipeline = _deadline_pipeline(tmp_path, monkeypatch, _HangingGenerator(delay=0.0))
+
+    packet = pipeline.run(
+        denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.",
+        top_k=1,
+        latency_budget_seconds=5.0,
+    )
+
+    assert packet.generated_output["provider"] == "openai"
+    assert "fallback_reason" not in packet.generated_output
+
+
+def test_response_errors_within_budget_still_fall_back(tmp_path: Path, monkeypatch) -> None:
+    pipeline = _deadline_pipeline(tmp_path, monkeypatch, _FailingGenerator())
+
+    packet = pipeline.run(
+        denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.",
+        top_k=1,
+        latency_budget_seconds=5.0,
+    )
+
+    assert packet.generated_output["fallback_reason"] == "Model returned empty content."
+
+
+def test_pipeline_records_stage_timings_and_writes_artifact(tmp_path: Path) -> None:
+    packet, exported = run_pipeline_once(
+        denial_text="Payer: Aetna\nDenial Reason: Not medically necessary.\nCPT: 72148",
+        chart_notes="Failed PT.",
+        top_k=2,
+        generation_runtime="template",
+        output_dir=tmp_path / "packet",
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "pipeline_timings_collection",
+            "embedding_provider": "hash",
+        },
+    )
+
+    stages = packet.timings["stages"]
+    assert list(stages) == [
+        "parse", "classify", "query_build", "retrieve", "evidence", "generate", "export",
+    ]
+    assert all(stage["seconds"] >= 0 for stage in stages.values())
+    assert stages["generate"]["provider"] == "template"
+    assert stages["generate"]["prompt_chars"] > 0
+    assert stages["retrieve"]["top_k"] == 2
+    written = json.loads((exported / "timings.json").read_text())
+    assert written["stages"]["export"]["seconds"] == stages["export"]["seconds"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from appealpilot.benchmarks.stub_llm_server import build_stub_appeal_output, load_prompt_payload
+from appealpilot.models.model_c_aisuite import ModelCConfig, ModelCGenerator
+from appealpilot.models.model_c_batch import LocalBatchProvider, parse_batch_result
+from appealpilot.workflow import AppealPipeline, AppealPipelineConfig, BatchAppealRunner
+
+
+class _BatchStubCompletions:
+    def __init__(self, fail_payer: str | None = None) -> None:
+        self.fail_payer = fail_payer
+        self.models: list[str] = []
+
+    def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        payload = load_prompt_payload(kwargs["messages"])
+        if self.fail_payer and payload["case_summary"].get("payer") == self.fail_payer:
+            raise RuntimeError("rate limited")
+        content = json.dumps(build_stub_appeal_output(payload))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120),
+        )
+
+
+def _runner(tmp_path: Path, completions: _BatchStubCompletions) -> BatchAppealRunner:
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(output_root=str(tmp_path / "appeals")),
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "batch_test_collection",
+            "embedding_provider": "hash",
+        },
+    )
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    generator = ModelCGenerator(config=ModelCConfig(model="openai:gpt-4o-mini"), client=client)
+    return BatchAppealRunner(pipeline, generator, LocalBatchProvider(client))
+
+
+_CASES = [
+    {"case_id": "aetna-1", "denial_text": "Payer: Aetna\nDenial Reason: Not medically necessary."},
+    {"case_id": "cigna-1", "denial_text": "Payer: Cigna\nDenial Reason: Experimental treatment."},
+]
+
+
+def test_batch_file_uses_provider_batch_format(tmp_path: Path) -> None:
+    runner = _runner(tmp_path, _BatchStubCompletions())
+    batch_dir = runner.prepare(_CASES, tmp_path / "batch")
+
+    lines = [json.loads(line) for line in (batch_dir / "requests.jsonl").read_text().splitlines()]
+    assert [line["custom_id"] for line in lines] == ["aetna-1", "cigna-1"]
+    assert {line["method"] for line in lines} == {"POST"}
+    assert {line["url"] for line in lines} == {"/v1/chat/completions"}
+    assert lines[0]["body"]["model"] == "gpt-4o-mini"
+    assert lines[0]["body"]["messages"][0]["role"] == "system"
+
+
+def test_batch_round_trip_exports_one_packet_per_case(tmp_path: Path) -> None:
+    completions = _BatchStubCompletions()
+    runner = _runner(tmp_path, completions)
+    batch_dir = runner.prepare(_CASES, tmp_path / "batch")
+    batch_id = runner.submit(batch_dir)
+
+    summaries = runner.collect(batch_dir, poll_interval_seconds=0.01, timeout_seconds=5)
+
+    assert runner.status(batch_dir).completed == 2
+    assert completions.models == ["openai:gpt-4o-mini"] * 2
+    assert [summary["custom_id"] for summary in summaries] == ["aetna-1", "cigna-1"]
+    assert all(summary["fallback_reason"] is None for summary in summaries)
+    packet = json.loads((tmp_path / "appeals" / "aetna-1" / "appeal_packet.json").read_text())
+    assert packet["provider"] == "openai"
+    assert packet["usage"]["completion_tokens"] == 20
+    assert packet["batch"] == {"batch_id": batch_id, "custom_id": "aetna-1"}
+    assert "Aetna" in packet["output"]["cover_letter"]
+
+
+def test_failed_batch_lines_fall_back_to_template(tmp_path: Path) -> None:
+    runner = _runner(tmp_path, _BatchStubCompletions(fail_payer="Cigna"))
+    batch_dir = runner.prepare(_CASES, tmp_path / "batch")
+    runner.submit(batch_dir)
+
+    summaries = {
+        summary["custom_id"]: summary
+        for summary in runner.collect(batch_dir, poll_interval_seconds=0.01, timeout_seconds=5)
+    }
+
+    assert summaries["aetna-1"]["generator_provider"] == "openai"
+    assert summaries["cigna-1"]["generator_provider"] == "template"
+    assert summaries["cigna-1"]["fallback_reason"] == "rate limited"
+
+
+def test_parse_batch_result_reports_http_errors() -> None:
+    line = {"custom_id": "x", "response": {"status_code": 429, "body": {}}, "error": None}
+
+    assert parse_batch_result(line) == (None, None, "batch request returned HTTP 429")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from appealpilot.benchmarks import synthetic_denial_letters, synthetic_dfs_documents
+from appealpilot.benchmarks.suite import (
+    BenchmarkConfigError,
+    BenchmarkSuiteConfig,
+    compare_results,
+    load_results,
+    run_benchmark_suite,
+    write_results,
+)
+from appealpilot.ingest import parse_denial_text
+from appealpilot.models import classify_denial_reason
+
+
+def test_synthetic_corpus_is_seeded_and_labelled() -> None:
+    first = synthetic_denial_letters(20, target_chars=2_000, seed=3)
+    assert first == synthetic_denial_letters(20, target_chars=2_000, seed=3)
+    assert all(1_800 <= len(denial.text) <= 2_200 for denial in first)
+    for denial in first:
+        parsed = parse_denial_text(denial.text)
+        assert parsed.payer == denial.payer
+        assert classify_denial_reason(parsed.denial_reason_text).category == denial.category
+
+    documents = synthetic_dfs_documents(5, seed=3)
+    assert len({document.doc_id for document in documents}) == 5
+    assert documents[0].text.startswith("case number: SYN-003-000000")
+
+
+def test_suite_runs_offline_and_skips_unavailable_providers(tmp_path: Path) -> None:
+    config = BenchmarkSuiteConfig(
+        corpus_size=40,
+        denial_sizes=(500,),
+        iterations=5,
+        pipeline_iterations=2,
+        classify_batch_size=50,
+        parse_batch_size=20,
+        providers=("hash", "no_such_provider"),
+        replay_latency_scale=0.0,
+        stub_latency_seconds=0.0,
+        work_dir=str(tmp_path / "work"),
+    )
+
+    results = run_benchmark_suite(config)
+
+    assert set(results["benchmarks"]) == {
+        "parse_denial_text[500c]",
+        "classify_denial_reason[500c]",
+        "classify_many[50]",
+        "parse_many[20x500c]",
+        "index_build[hash]",
+        "retriever.query[hash]",
+        "pipeline.run[template,hash]",
+        "export_packet",
+        "pipeline.run[replay,hash]",
+    }
+    assert "index_build[no_such_provider]" in results["skipped"]
+    assert results["benchmarks"]["pipeline.run[replay,hash]"]["fallbacks"] == 0
+    assert results["benchmarks"]["index_build[hash]"]["documents"] == 40
+    path = write_results(results, tmp_path / "results.json")
+    assert load_results(path)["benchmarks"] == results["benchmarks"]
+
+
+def test_compare_flags_latency_and_throughput_regressions() -> None:
+    def results(p95: float, throughput: float) -> dict:
+        summary = {"p50": 0.01, "p95": p95, "throughput_per_second": throughput}
+        return {"schema_version": 1, "benchmarks": {"pipeline": summary, "tiny": {"p95": 1e-6}}}
+
+    baseline = results(0.10, 100.0)
+    assert compare_results(baseline, results(0.11, 95.0), threshold=0.2) == []
+
+    regressions = compare_results(baseline, results(0.15, 70.0), threshold=0.2)
+    assert [(item.benchmark, item.metric) for item in regressions] == [
+        ("pipeline", "p95"),
+        ("pipeline", "throughput_per_second"),
+    ]
+    assert regressions[1].change == pytest.approx(0.3)
+
+    # Microsecond-scale jitter stays under the absolute floor.
+    noisy = {"schema_version": 1, "benchmarks": {"tiny": {"p95": 5e-6}}}
+    assert compare_results(baseline, noisy) == []
+
+
+def test_config_validation() -> None:
+    with pytest.raises(BenchmarkConfigError):
+        BenchmarkSuiteConfig(runtimes=("live",)).validate()
+    with pytest.raises(BenchmarkConfigError):
+        BenchmarkSuiteConfig(denial_sizes=()).validate()
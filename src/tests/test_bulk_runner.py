@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from appealpilot.workflow.bulk_runner import (
+    BULK_STAGES,
+    BulkRunConfig,
+    BulkRunError,
+    load_bulk_cases,
+    read_checkpoint,
+    run_bulk,
+)
+
+_RETRIEVAL = {"collection_name": "bulk_test_collection", "embedding_provider": "hash"}
+
+
+def _config(tmp_path: Path, **overrides) -> BulkRunConfig:
+    values = {
+        "workers": 1,
+        "chunk_size": 2,
+        "top_k": 2,
+        "generation_runtime": "template",
+        "output_root": str(tmp_path / "bulk"),
+    }
+    values.update(overrides)
+    return BulkRunConfig(**values)
+
+
+def _retrieval(tmp_path: Path) -> dict[str, str]:
+    return {**_RETRIEVAL, "persist_directory": str(tmp_path / "chroma")}
+
+
+def test_load_bulk_cases_from_directory_pairs_chart_notes(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("Payer: Aetna\nDenial Reason: Not medically necessary.")
+    (tmp_path / "a.chart.txt").write_text("Failed PT.")
+    (tmp_path / "b.txt").write_text("Payer: Cigna\nDenial Reason: Experimental.")
+
+    cases = load_bulk_cases(tmp_path)
+
+    assert [case["case_id"] for case in cases] == ["a", "b"]
+    assert cases[0]["chart_notes"] == "Failed PT."
+    assert cases[1]["chart_notes"] is None
+
+
+def test_load_bulk_cases_rejects_duplicate_ids(tmp_path: Path) -> None:
+    path = tmp_path / "cases.jsonl"
+    path.write_text(
+        "\n".join(json.dumps({"case_id": "x", "denial_text": "Denied."}) for _ in range(2))
+    )
+
+    with pytest.raises(BulkRunError):
+        load_bulk_cases(path)
+
+
+def test_bulk_run_exports_checkpoints_and_skips_finished_cases(tmp_path: Path) -> None:
+    cases = [
+        {"case_id": f"case-{index}", "denial_text": f"Payer: Aetna\nDenial Reason: Not medically necessary {index}."}
+        for index in range(5)
+    ]
+    config = _config(tmp_path)
+
+    summary = run_bulk(cases[:3], config, retrieval_overrides=_retrieval(tmp_path))
+
+    assert summary["completed"] == 3
+    assert set(summary["stages"]) == set(BULK_STAGES)
+    assert (tmp_path / "bulk" / "case-0" / "appeal_packet.json").exists()
+    assert set(read_checkpoint(config.checkpoint)) == {"case-0", "case-1", "case-2"}
+
+    rerun = run_bulk(cases, config, retrieval_overrides=_retrieval(tmp_path))
+
+    assert rerun["completed"] == 2
+    assert rerun["skipped"] == 3
+    assert len(read_checkpoint(config.checkpoint)) == 5
+
+
+def test_bulk_run_with_process_pool(tmp_path: Path) -> None:
+    cases = [
+        {"case_id": f"p-{index}", "denial_text": "Payer: Aetna\nDenial Reason: Experimental."}
+        for index in range(4)
+    ]
+
+    summary = run_bulk(
+        cases, _config(tmp_path, workers=2), retrieval_overrides=_retrieval(tmp_path)
+    )
+
+    assert summary["completed"] == 4
+    assert summary["fallbacks"] == 0
+    assert sorted(path.name for path in (tmp_path / "bulk").glob("p-*")) == [
+        "p-0", "p-1", "p-2", "p-3",
+    ]
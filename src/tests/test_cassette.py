@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from appealpilot.benchmarks.stub_llm_server import build_stub_appeal_output, load_prompt_payload
+from appealpilot.models.cassette import (
+    CassetteMissError,
+    RecordingClient,
+    ReplayClient,
+    build_cassette_client,
+)
+from appealpilot.models.model_c_aisuite import (
+    ModelCConfig,
+    ModelCGenerator,
+    ModelCResponseError,
+)
+
+
+class _ProviderCompletions:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        content = json.dumps(build_stub_appeal_output(load_prompt_payload(kwargs["messages"])))
+        usage = SimpleNamespace(
+            prompt_tokens=100,
+            completion_tokens=20,
+            total_tokens=120,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+        )
+        if kwargs.get("stream"):
+            return iter(
+                [
+                    SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 9]))],
+                        usage=None,
+                    )
+                    for i in range(0, len(content), 9)
+                ]
+                + [
+                    SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=None))],
+                        usage=usage,
+                    )
+                ]
+            )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage
+        )
+
+
+def _generate(client, generated_at: str = "2026-01-01T00:00:00Z", **kwargs):
+    generator = ModelCGenerator(config=ModelCConfig(model="openai:gpt-4o-mini"), client=client)
+    return generator.generate(
+        case_summary={"payer": "Aetna", "generated_at_utc": generated_at},
+        retrieved_evidence=[{"source_id": "DFS-1", "snippet": "overturned"}],
+        **kwargs,
+    )
+
+
+def test_replay_serves_recorded_response_for_a_later_identical_case(tmp_path: Path) -> None:
+    cassette = tmp_path / "model_c.jsonl"
+    provider = SimpleNamespace(chat=SimpleNamespace(completions=_ProviderCompletions()))
+    recorded = _generate(RecordingClient(provider, cassette))
+
+    replay = ReplayClient(cassette, latency_scale=0)
+    # A different timestamp still hits: volatile fields are not part of the key.
+    replayed = _generate(replay, generated_at="2026-02-01T00:00:00Z")
+
+    assert replayed["output"] == recorded["output"]
+    assert replayed["usage"]["cached_prompt_tokens"] == 64
+    assert replay.stats() == {"recordings": 1, "hits": 1, "misses": 0}
+
+
+def test_replay_sleeps_for_scaled_recorded_latency(tmp_path: Path) -> None:
+    cassette = tmp_path / "model_c.jsonl"
+    provider = SimpleNamespace(chat=SimpleNamespace(completions=_ProviderCompletions(delay=0.1)))
+    _generate(RecordingClient(provider, cassette))
+
+    started = time.perf_counter()
+    _generate(build_cassette_client(cassette, "replay", latency_scale=0.5))
+    elapsed = time.perf_counter() - started
+
+    assert 0.05 <= elapsed < 0.1
+
+
+def test_streamed_recording_replays_as_stream(tmp_path: Path) -> None:
+    cassette = tmp_path / "model_c.jsonl"
+    provider = SimpleNamespace(chat=SimpleNamespace(completions=_ProviderCompletions()))
+    generator = ModelCGenerator(
+        config=ModelCConfig(model="openai:gpt-4o-mini"),
+        client=RecordingClient(provider, cassette),
+    )
+    kwargs = {"case_summary": {"payer": "Aetna"}, "retrieved_evidence": []}
+    recorded = list(generator.generate_stream(**kwargs))
+
+    generator.client = ReplayClient(cassette, latency_scale=0)
+    replayed = list(generator.generate_stream(**kwargs))
+
+    def sections(events):
+        return [event["section"] for event in events if event["event"] == "section"]
+
+    assert sections(replayed) == sections(recorded)
+    assert any(event["event"] == "delta" for event in replayed)
+    assert replayed[-1]["result"]["output"] == recorded[-1]["result"]["output"]
+    assert json.loads(cassette.read_text().splitlines()[0])["first_token_seconds"] is not None
+
+
+def test_misses_and_recorded_errors_raise_response_errors(tmp_path: Path) -> None:
+    cassette = tmp_path / "model_c.jsonl"
+    provider = SimpleNamespace(chat=SimpleNamespace(completions=_ProviderCompletions(fail=True)))
+    with pytest.raises(RuntimeError):
+        _generate(RecordingClient(provider, cassette))
+
+    replay = ReplayClient(cassette, latency_scale=0)
+    with pytest.raises(ModelCResponseError, match="provider unavailable"):
+        _generate(replay)
+
+    generator = ModelCGenerator(
+        config=ModelCConfig(model="groq:llama-3.3-70b-versatile"), client=replay
+    )
+    with pytest.raises(CassetteMissError):
+        generator.generate(case_summary={}, retrieved_evidence=[])
+    assert replay.stats()["misses"] == 1
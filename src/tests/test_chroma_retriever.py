@@ -5,7 +5,11 @@ from pathlib import Path
 import pytest
 
 from appealpilot.retrieval.chroma_retriever import (
+    EMBEDDING_CACHE_ENV,
+    EMBEDDING_CACHE_MODE_ENV,
+    CachedEmbeddingFunction,
     ChromaRetriever,
+    EmbeddingCacheMissError,
     HashEmbeddingFunction,
     RetrievalConfig,
     build_retrieval_config,
@@ -85,3 +89,49 @@ def test_chroma_retriever_upsert_and_query(tmp_path: Path) -> None:
     assert len(results) == 1
     assert results[0].doc_id == "case-1"
 
+
+    batched = retriever.query_many(
+        ["medical necessity MRI denial", "insufficient documentation physical therapy"],
+        top_k=1,
+    )
+    assert [[item.doc_id for item in results] for results in batched] == [["case-1"], ["case-2"]]
+    assert retriever.query_many([]) == []
+
+
+def test_embedding_cache_records_then_replays_without_provider(
+    tmp_path: Path, monkeypatch
+) -> None:
+    cache_path = tmp_path / "embeddings.jsonl"
+    inner_calls: list[list[str]] = []
+
+    def inner(texts):
+        inner_calls.append(list(texts))
+        return HashEmbeddingFunction(dimensions=64)(texts)
+
+    recorder = CachedEmbeddingFunction(cache_path, "text-embedding-3-small", inner=inner)
+    first = recorder(["denied MRI", "denied PT"])
+    recorder(["denied MRI", "out of network"])
+    assert inner_calls == [["denied MRI", "denied PT"], ["out of network"]]
+    assert (recorder.hits, recorder.misses) == (1, 3)
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv(EMBEDDING_CACHE_ENV, str(cache_path))
+    monkeypatch.setenv(EMBEDDING_CACHE_MODE_ENV, "replay")
+    retriever = ChromaRetriever(
+        RetrievalConfig(
+            persist_directory=str(tmp_path / "chroma"),
+            collection_name="cached_openai",
+            embedding_provider="openai",
+        )
+    )
+    assert retriever.embedding_provider == "openai"
+    retriever.upsert_documents(
+        [
+            {"doc_id": "a", "text": "denied MRI", "metadata": {"payer": "Alpha"}},
+            {"doc_id": "b", "text": "denied PT", "metadata": {"payer": "Beta"}},
+        ]
+    )
+    assert retriever.query("denied MRI", top_k=1)[0].doc_id == "a"
+    assert retriever._embedding_function(["denied PT"])[0] == first[1]
+    with pytest.raises(EmbeddingCacheMissError):
+        retriever.query("never embedded", top_k=1)
@@ -1,4 +1,22 @@
-from appealpilot.ingest.denial_parser import parse_denial_text
+import random
+from pathlib import Path
+
+import pytest
+
+from appealpilot.domain import ParsedDenial
+from appealpilot.ingest.denial_parser import (
+    CPT_PATTERN,
+    DEADLINE_PATTERN,
+    DENIAL_REASON_PATTERN,
+    HCPCS_PATTERN,
+    KNOWN_PAYERS,
+    DenialParser,
+    DenialParserConfigError,
+    PayerEntry,
+    build_denial_parser_config,
+    parse_denial_text,
+    parse_many,
+)
 
 
 def test_parse_denial_text_extracts_core_fields() -> None:
@@ -17,3 +35,81 @@ def test_parse_denial_text_extracts_core_fields() -> None:
     assert "A9279" in parsed.cpt_hcpcs_codes
     assert "medically necessary" in parsed.denial_reason_text.lower()
     assert any("within 60 days" in hint.lower() for hint in parsed.deadline_hints)
+
+
+
+def _reference_parse(raw_text: str) -> ParsedDenial:
+    # The original separate-scan implementation, kept as the equivalence oracle.
+    text = raw_text.strip()
+    lowered = text.lower()
+    payer = next((name for name in KNOWN_PAYERS if name.lower() in lowered), None)
+    codes = sorted(set(CPT_PATTERN.findall(text)) | set(HCPCS_PATTERN.findall(text)))
+    reason_match = DENIAL_REASON_PATTERN.search(text)
+    return ParsedDenial(
+        raw_text=text,
+        payer=payer,
+        cpt_hcpcs_codes=tuple(codes),
+        denial_reason_text=reason_match.group(1).strip() if reason_match else text[:400],
+        deadline_hints=tuple(
+            dict.fromkeys(match.group(0).strip() for match in DEADLINE_PATTERN.finditer(text))
+        ),
+    )
+
+
+def test_single_pass_parser_matches_separate_scans() -> None:
+    fragments = [
+        "Payer: Blue Shield of Empire",
+        "HUMANA and aetna",
+        "Denial Reason: not covered 72148",
+        "reason for denial - see A9279.",
+        "Deadline: March 3, 2025 or 99213",
+        "DEADLINE - 30 days A1234/J0585",
+        "appeal WITHIN 180 DAYS",
+        "within  7\tdays",
+        "codes 123456 A12345 a1234 X1234y 00000",
+        "deadline:72148 ",
+        "Kelvin within 5 days é 12345",
+        "deadlıne: 1 day",
+        "",
+        "\n",
+    ]
+    rng = random.Random(3)
+    parser = DenialParser()
+    texts = [
+        rng.choice(["", " ", "\n"]).join(rng.choice(fragments) for _ in range(rng.randint(0, 6)))
+        for _ in range(2_000)
+    ]
+    assert parser.parse_many(texts) == [_reference_parse(text) for text in texts]
+    assert parse_many(texts[:50]) == [_reference_parse(text) for text in texts[:50]]
+
+
+def test_payer_aliases_resolve_in_list_order() -> None:
+    parser = DenialParser(
+        build_denial_parser_config(
+            settings_path=Path("missing.yaml"),
+            overrides={
+                "payers": [
+                    {"name": "UnitedHealthcare", "aliases": ["UHC", "United Healthcare"]},
+                    "Aetna",
+                ]
+            },
+        )
+    )
+
+    assert parser.parse("Plan: Aetna, administered by UHC").payer == "UnitedHealthcare"
+    assert parser.parse("Plan: aetna").payer == "Aetna"
+    assert parser.parse("Plan: Cigna").payer is None
+
+
+def test_denial_parser_config_from_payers_file(tmp_path: Path, monkeypatch) -> None:
+    payers = tmp_path / "payers.yaml"
+    payers.write_text("- name: Excellus\n  aliases: [Excellus BCBS]\n")
+    monkeypatch.setenv("APPEALPILOT_PAYERS_FILE", str(payers))
+
+    config = build_denial_parser_config(settings_path=tmp_path / "missing.yaml")
+    assert config.payers == (PayerEntry("Excellus", ("Excellus BCBS",)),)
+
+    monkeypatch.delenv("APPEALPILOT_PAYERS_FILE")
+    assert [entry.name for entry in build_denial_parser_config().payers] == list(KNOWN_PAYERS)
+    with pytest.raises(DenialParserConfigError):
+        build_denial_parser_config(overrides={"payers": [{"aliases": ["x"]}]})
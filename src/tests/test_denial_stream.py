@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from appealpilot.ingest.denial_parser import DenialParserConfigError, parse_denial_text
+from appealpilot.ingest.denial_stream import (
+    DenialStreamParser,
+    parse_denial_file,
+    parse_denial_stream,
+)
+
+_LINES = (
+    "Payer: Aetna",
+    "Member notice from Cigna regarding your claim.",
+    "Denial Reason: Not medically necessary for CPT 72148.",
+    "HCPCS A9279 and J1234 were reviewed.",
+    "Please submit an appeal within 60 days.",
+    "Appeal Deadline: March 3, 2026 for code 99213",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+    "Reference 12345-6789 / tracking A12345.",
+    "",
+)
+
+
+def _document(rng: random.Random, lines: int) -> str:
+    return "\n".join(rng.choice(_LINES) for _ in range(lines))
+
+
+def _chunks(text: str, rng: random.Random, largest: int) -> list[str]:
+    chunks, start = [], 0
+    while start < len(text):
+        size = rng.randint(1, largest)
+        chunks.append(text[start:start + size])
+        start += size
+    return chunks
+
+
+def test_full_scan_matches_parse_denial_text() -> None:
+    rng = random.Random(7)
+    for _ in range(60):
+        text = "  \n" + _document(rng, rng.randint(0, 400)) + "\n "
+        expected = parse_denial_text(text)
+        parsed = parse_denial_stream(
+            _chunks(text, rng, rng.choice((7, 300, 5_000))), overlap=256, stop_early=False
+        )
+        assert parsed.payer == expected.payer
+        assert parsed.cpt_hcpcs_codes == expected.cpt_hcpcs_codes
+        assert parsed.deadline_hints == expected.deadline_hints
+        assert parsed.denial_reason_text == expected.denial_reason_text[:4000]
+        assert parsed.raw_text == expected.raw_text[:4000]
+
+
+def test_buffer_stays_bounded() -> None:
+    rng = random.Random(3)
+    stream = DenialStreamParser(overlap=256, stop_early=False)
+    for chunk in _chunks(_document(rng, 20_000), rng, 1_000):
+        stream.feed(chunk)
+        assert len(stream._buffer) <= 2 * 256 + 1_000
+    assert stream.close().deadline_hints
+
+
+def test_stop_early_leaves_rest_unread() -> None:
+    consumed = []
+
+    def chunks():
+        yield "Payer: Humana\nDenial Reason: Out of network.\nAppeal within 30 days.\n"
+        for index in range(1_000):
+            consumed.append(index)
+            yield "filler line " * 100 + "\n"
+
+    parsed = parse_denial_stream(chunks(), overlap=256)
+
+    assert parsed.payer == "Humana"
+    assert parsed.denial_reason_text == "Out of network."
+    assert parsed.deadline_hints == ("within 30 days",)
+    assert len(consumed) < 10
+
+
+def test_parse_denial_file_reads_in_chunks(tmp_path) -> None:
+    path = tmp_path / "denial.txt"
+    text = _document(random.Random(11), 2_000)
+    path.write_text(text)
+
+    parsed = parse_denial_file(path, stop_early=False, chunk_chars=997)
+
+    assert parsed.cpt_hcpcs_codes == parse_denial_text(text).cpt_hcpcs_codes
+
+
+def test_overlap_must_cover_longest_payer_term() -> None:
+    with pytest.raises(DenialParserConfigError):
+        DenialStreamParser(overlap=16)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from appealpilot.retrieval.chroma_retriever import RetrievedDocument
+from appealpilot.workflow.appeal_pipeline import AppealPipeline, AppealPipelineConfig
+from appealpilot.workflow.evidence_compression import (
+    EvidenceCompressionConfig,
+    build_evidence_compression_config,
+    compress_evidence,
+    estimate_tokens,
+)
+
+QUERY = (
+    "denial category: medical_necessity\n"
+    "denial reason: Lumbar MRI not medically necessary.\n"
+    "payer: Aetna"
+)
+
+
+def _document(case_number: str, topic: str) -> str:
+    filler = " ".join(
+        f"Administrative note {idx} about claim routing and mailing addresses."
+        for idx in range(12)
+    )
+    return "\n".join(
+        [
+            f"case number: {case_number}",
+            f"treatment: {topic}",
+            "health plan: Aetna",
+            "decision: Overturned",
+            f"description: {filler} The reviewer found the {topic} medically necessary "
+            "after failed conservative therapy. " + filler,
+        ]
+    )
+
+
+def _evidence(texts: list[str]) -> list[dict]:
+    return [
+        {
+            "source_id": f"DFS-{idx}",
+            "snippet": text[:1600],
+            "metadata": {"health_plan": "Aetna", "decision_year": "2021"},
+            "distance": 0.1,
+        }
+        for idx, text in enumerate(texts)
+    ]
+
+
+def test_keeps_relevant_sentences_and_outcome_within_budget() -> None:
+    texts = [_document(f"DFS-{idx}", "lumbar MRI") for idx in range(5)]
+    config = EvidenceCompressionConfig(token_budget=400)
+
+    compressed, stats = compress_evidence(QUERY, _evidence(texts), texts, config)
+
+    snippet = compressed[0]["snippet"]
+    assert "decision: Overturned" in snippet
+    assert "medically necessary after failed conservative therapy" in snippet
+    assert "Administrative note" not in snippet
+    assert sum(estimate_tokens(item["snippet"]) for item in compressed) <= 400
+    # Values repeated in the snippet are not sent twice.
+    assert compressed[0]["metadata"] == {"decision_year": "2021"}
+    assert stats["evidence_tokens_after"] < stats["evidence_tokens_before"] / 2
+
+
+def test_unmatched_item_falls_back_to_leading_text() -> None:
+    texts = ["Unrelated dental claim routed to the wrong plan."]
+
+    compressed, _ = compress_evidence(
+        QUERY, _evidence(texts), texts, EvidenceCompressionConfig(token_budget=6, min_item_tokens=6)
+    )
+
+    assert compressed[0]["snippet"] == "Unrelated dental claim"
+
+
+def test_config_precedence(tmp_path: Path, monkeypatch) -> None:
+    settings = tmp_path / "settings.yaml"
+    settings.write_text("evidence_compression:\n  enabled: false\n  token_budget: 300\n")
+    monkeypatch.setenv("EVIDENCE_TOKEN_BUDGET", "600")
+
+    config = build_evidence_compression_config(settings_path=settings)
+    assert config.enabled is False
+    assert config.token_budget == 600
+
+    config = build_evidence_compression_config(
+        settings_path=settings, overrides={"token_budget": 900}
+    )
+    assert config.token_budget == 900
+
+
+class _StaticRetriever:
+    def query(self, query_text: str, top_k: int):
+        return [
+            RetrievedDocument(
+                doc_id=f"doc-{idx}",
+                text=_document(f"DFS-{idx}", "lumbar MRI"),
+                metadata={"case_number": f"DFS-{idx}"},
+                distance=0.2,
+            )
+            for idx in range(top_k)
+        ]
+
+
+def test_pipeline_records_compression_stats(tmp_path: Path) -> None:
+    pipeline = AppealPipeline(
+        config=AppealPipelineConfig(generation_runtime="template", coalesce_requests=False),
+        retrieval_overrides={
+            "persist_directory": str(tmp_path / "chroma"),
+            "collection_name": "pipeline_compression_collection",
+            "embedding_provider": "hash",
+        },
+        compression_config=EvidenceCompressionConfig(token_budget=300),
+    )
+    pipeline.retriever = _StaticRetriever()
+
+    packet = pipeline.run(
+        denial_text="Payer: Aetna\nDenial Reason: Lumbar MRI not medically necessary.",
+        top_k=3,
+    )
+
+    stats = packet.generated_output["evidence_compression"]
+    assert stats["token_budget"] == 300
+    assert stats["evidence_tokens_after"] < stats["evidence_tokens_before"]
+    # Exported evidence keeps the uncompressed snippet for reviewers.
+    assert "Administrative note" in packet.evidence_items[0].snippet
+    assert "Administrative note" not in packet.generated_output["output"]["citations"][0][
+        "source_excerpt"
+    ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from appealpilot.workflow.instrumentation import (
+    OpenTelemetrySpanExporter,
+    Trace,
+    set_span_exporter,
+)
+
+
+def test_trace_records_stages_in_order_with_attributes() -> None:
+    trace = Trace()
+    with trace.span("parse", denial_chars=42):
+        pass
+    with trace.span("generate") as span:
+        span["completion_tokens"] = 120
+    trace.record("retrieve", 0.25, batch_size=8)
+
+    timings = trace.as_dict()
+
+    assert list(timings["stages"]) == ["parse", "generate", "retrieve"]
+    assert timings["stages"]["parse"]["denial_chars"] == 42
+    assert timings["stages"]["generate"]["completion_tokens"] == 120
+    assert timings["stages"]["retrieve"] == {"seconds": 0.25, "batch_size": 8}
+
+
+def test_failed_stage_is_recorded_with_error() -> None:
+    trace = Trace()
+    with pytest.raises(KeyError):
+        with trace.span("retrieve"):
+            raise KeyError("boom")
+
+    assert trace.as_dict()["stages"]["retrieve"]["error"] == "KeyError"
+
+
+def test_finish_calls_exporter_and_survives_exporter_errors() -> None:
+    exported: list[Trace] = []
+
+    def failing(trace: Trace) -> None:
+        exported.append(trace)
+        raise RuntimeError("collector down")
+
+    set_span_exporter(failing)
+    try:
+        trace = Trace()
+        with trace.span("parse"):
+            pass
+        assert "parse" in trace.finish()["stages"]
+    finally:
+        set_span_exporter(None)
+    assert exported == [trace]
+
+
+def test_opentelemetry_exporter_emits_child_spans() -> None:
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    in_memory = pytest.importorskip("opentelemetry.sdk.trace.export.in_memory_span_exporter")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    memory = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+
+    trace = Trace()
+    with trace.span("retrieve") as span:
+        span["evidence_count"] = 3
+        span["routing"] = {"not": "scalar"}
+    OpenTelemetrySpanExporter(tracer_provider=provider)(trace)
+
+    spans = {span.name: span for span in memory.get_finished_spans()}
+    assert set(spans) == {"appeal_pipeline", "retrieve"}
+    assert spans["retrieve"].parent.span_id == spans["appeal_pipeline"].context.span_id
+    assert dict(spans["retrieve"].attributes) == {"evidence_count": 3}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from appealpilot.workflow.job_queue import (
+    AppealJobQueue,
+    AppealJobWorkerPool,
+    JobQueueConfig,
+    build_job_queue_config,
+)
+
+
+def _queue(tmp_path: Path, **overrides) -> AppealJobQueue:
+    params = {
+        "db_path": str(tmp_path / "jobs.sqlite3"),
+        "retry_backoff_seconds": 0.0,
+        **overrides,
+    }
+    return AppealJobQueue(JobQueueConfig(**params))
+
+
+def test_job_runs_to_success_with_timings(tmp_path: Path) -> None:
+    queue = _queue(tmp_path)
+    job_id = queue.submit({"denial_text": "Denial Reason: not medically necessary."})
+    pool = AppealJobWorkerPool(queue, handler=lambda payload: {"echo": payload["denial_text"]})
+
+    assert queue.metrics()["queue_depth"] == 1
+    assert pool.run_once() is True
+    assert pool.run_once() is False
+
+    job = queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    assert job["timings"]["run_seconds"] >= 0
+    assert queue.get_result(job_id) == {"echo": "Denial Reason: not medically necessary."}
+    assert queue.metrics()["queue_depth"] == 0
+
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, max_attempts=2)
+    job_id = queue.submit({"denial_text": "x"})
+
+    def _boom(payload):
+        raise RuntimeError("provider timeout")
+
+    pool = AppealJobWorkerPool(queue, handler=_boom)
+    pool.run_once()
+    assert queue.get(job_id)["status"] == "queued"
+
+    pool.run_once()
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert "provider timeout" in job["error"]
+    assert queue.metrics()["retries"] == 1
+
+
+def test_cancel_queued_and_running_jobs(tmp_path: Path) -> None:
+    queue = _queue(tmp_path)
+    queued_id = queue.submit({"denial_text": "a"})
+    assert queue.cancel(queued_id) == "cancelled"
+    assert queue.claim("worker") is None
+
+    running_id = queue.submit({"denial_text": "b"})
+    claimed = queue.claim("worker")
+    assert claimed["job_id"] == running_id
+    assert queue.cancel(running_id) == "running"
+    assert queue.complete(running_id, "worker", {"ignored": True}) == "cancelled"
+    assert queue.get_result(running_id) is None
+    assert queue.cancel("missing") is None
+
+
+def test_expired_lease_is_reclaimed_then_failed_when_attempts_exhausted(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, max_attempts=2, lease_seconds=0.05)
+    job_id = queue.submit({"denial_text": "x"})
+
+    assert queue.claim("crashed-1")["attempts"] == 1
+    time.sleep(0.1)
+    reclaimed = queue.claim("crashed-2")
+    assert reclaimed["job_id"] == job_id
+    assert reclaimed["attempts"] == 2
+
+    time.sleep(0.1)
+    assert queue.claim("worker-3") is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert "lease expired" in job["error"]
+
+
+def test_stale_worker_cannot_finish_a_reclaimed_job(tmp_path: Path) -> None:
+    queue = _queue(tmp_path, lease_seconds=0.05)
+    job_id = queue.submit({"denial_text": "x"})
+    queue.claim("slow-worker")
+    time.sleep(0.1)
+    queue.claim("fresh-worker")
+
+    assert queue.heartbeat(job_id, "slow-worker") is False
+    assert queue.complete(job_id, "slow-worker", {"stale": True}) is None
+    assert queue.fail(job_id, "slow-worker", "late error") is None
+    assert queue.get(job_id)["status"] == "running"
+
+    assert queue.heartbeat(job_id, "fresh-worker") is True
+    assert queue.complete(job_id, "fresh-worker", {"fresh": True}) == "succeeded"
+    assert queue.get_result(job_id) == {"fresh": True}
+
+
+def test_explicit_overrides_win_over_env(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("APPEALPILOT_JOB_WORKERS", "7")
+    monkeypatch.setenv("APPEALPILOT_JOBS_DB_PATH", str(tmp_path / "env.sqlite3"))
+
+    from_env = build_job_queue_config(settings_path=tmp_path / "missing.yaml")
+    assert from_env.workers == 7
+
+    explicit = build_job_queue_config(
+        settings_path=tmp_path / "missing.yaml",
+        overrides={"workers": 3, "db_path": str(tmp_path / "cli.sqlite3")},
+    )
+    assert explicit.workers == 3
+    assert explicit.db_path == str(tmp_path / "cli.sqlite3")
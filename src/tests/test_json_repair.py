@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from appealpilot.models.json_repair import JsonRepairError, repair_json_object
+
+
+def test_valid_object_needs_no_repair() -> None:
+    assert repair_json_object('{"a": 1}') == ({"a": 1}, [])
+
+
+def test_extracts_object_from_surrounding_prose() -> None:
+    parsed, repairs = repair_json_object('Here is the packet: {"a": "x}y"} Thanks!')
+
+    assert parsed == {"a": "x}y"}
+    assert repairs == ["extracted_object"]
+
+
+def test_removes_trailing_commas_outside_strings() -> None:
+    parsed, repairs = repair_json_object('{"a": [1, 2, ], "b": "keep, ]",}')
+
+    assert parsed == {"a": [1, 2], "b": "keep, ]"}
+    assert repairs == ["trailing_commas"]
+
+
+def test_truncated_output_drops_partial_element_and_closes_brackets() -> None:
+    text = (
+        '{"cover_letter": "Dear plan", "citations": '
+        '[{"claim": "a", "source_id": "D1"}, {"claim": "b", "sou'
+    )
+
+    parsed, repairs = repair_json_object(text)
+
+    assert parsed == {
+        "cover_letter": "Dear plan",
+        "citations": [{"claim": "a", "source_id": "D1"}],
+    }
+    assert repairs == ["closed_truncation"]
+
+
+def test_truncated_first_element_leaves_empty_array() -> None:
+    parsed, _ = repair_json_object('{"cover_letter": "Dear plan", "citations": [{"claim": "a"')
+
+    assert parsed == {"cover_letter": "Dear plan", "citations": []}
+
+
+def test_unrepairable_text_raises() -> None:
+    with pytest.raises(JsonRepairError):
+        repair_json_object("I cannot help with that.")
+    with pytest.raises(JsonRepairError):
+        repair_json_object('{"cover_letter": "never closed')
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from appealpilot.models.json_stream import JsonSectionStreamer
+
+PACKET = {
+    "cover_letter": 'Re: "urgent" appeal — café line\nnext',
+    "detailed_justification": "Because the records show failed therapy.",
+    "evidence_checklist": [{"item": "Note", "status": "missing", "notes": "a, b}"}],
+    "missing_information": [],
+    "citations": [{"claim": "c", "source_id": "DFS-1", "source_excerpt": "[x]"}],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 13, 4096])
+def test_sections_and_deltas_survive_any_chunking(chunk_size: int) -> None:
+    raw = "```json\n" + json.dumps(PACKET) + "\n```"
+    streamer = JsonSectionStreamer()
+    events = []
+    for start in range(0, len(raw), chunk_size):
+        events.extend(streamer.feed(raw[start:start + chunk_size]))
+
+    sections = [event["section"] for event in events if event["event"] == "section"]
+    cover_text = "".join(
+        event["text"]
+        for event in events
+        if event["event"] == "delta" and event["section"] == "cover_letter"
+    )
+
+    assert sections == list(PACKET)
+    assert cover_text == PACKET["cover_letter"]
+    assert streamer.sections == PACKET
+    assert streamer.complete
+
+
+def test_cover_letter_text_is_emitted_before_it_is_complete() -> None:
+    streamer = JsonSectionStreamer()
+    events = streamer.feed('{"cover_letter": "Dear plan, we appe')
+
+    assert events == [{"event": "delta", "section": "cover_letter", "text": "Dear plan, we appe"}]
+    assert streamer.sections == {}
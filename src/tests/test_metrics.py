@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from appealpilot import metrics
+
+
+def test_counters_and_histograms_render_in_prometheus_format() -> None:
+    metrics.reset()
+    metrics.inc("appealpilot_llm_tokens_total", 120, provider="openai", model="gpt", kind="prompt")
+    metrics.observe("appealpilot_pipeline_stage_seconds", 0.02, stage="retrieve")
+    metrics.observe("appealpilot_pipeline_stage_seconds", 3.0, stage="retrieve")
+
+    text = metrics.render_prometheus(metrics.snapshot())
+
+    assert "# TYPE appealpilot_llm_tokens_total counter" in text
+    assert (
+        'appealpilot_llm_tokens_total{kind="prompt",model="gpt",provider="openai"} 120' in text
+    )
+    assert 'appealpilot_pipeline_stage_seconds_bucket{stage="retrieve",le="0.025"} 1' in text
+    assert 'appealpilot_pipeline_stage_seconds_bucket{stage="retrieve",le="5"} 2' in text
+    assert 'appealpilot_pipeline_stage_seconds_bucket{stage="retrieve",le="+Inf"} 2' in text
+    assert 'appealpilot_pipeline_stage_seconds_count{stage="retrieve"} 2' in text
+
+
+def test_thread_shards_are_summed() -> None:
+    metrics.reset()
+
+    def work() -> None:
+        for _ in range(500):
+            metrics.inc("appealpilot_generations_total", outcome="template")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    key = json.dumps(["appealpilot_generations_total", [["outcome", "template"]]])
+    assert metrics.snapshot()["counters"][key] == 2000
+
+
+def test_shared_directory_aggregates_other_processes(tmp_path: Path, monkeypatch) -> None:
+    metrics.reset()
+    monkeypatch.setenv(metrics.METRICS_DIR_ENV, str(tmp_path))
+    key = json.dumps(["appealpilot_generations_total", [["outcome", "fallback"]]])
+    (tmp_path / "metrics-999999.json").write_text(
+        json.dumps({"counters": {key: 3.0}, "histograms": {}})
+    )
+    metrics.inc("appealpilot_generations_total", outcome="fallback")
+
+    assert metrics.collect()["counters"][key] == 4.0
+    assert any(path.name != "metrics-999999.json" for path in tmp_path.glob("metrics-*.json"))
+
+
+def test_collectors_contribute_at_scrape_time() -> None:
+    metrics.reset()
+
+    def samples():
+        yield "appealpilot_cache_events_total", {"cache": "demo", "result": "hit"}, 7
+
+    metrics.register_collector(samples)
+
+    assert 'appealpilot_cache_events_total{cache="demo",result="hit"} 7' in (
+        metrics.render_prometheus(metrics.snapshot())
+    )
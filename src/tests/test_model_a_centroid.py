@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from appealpilot.models.model_a_centroid import (
+    CategoryCentroids,
+    build_category_centroids,
+    category_centroids_path,
+    load_category_centroids,
+)
+from appealpilot.retrieval import ChromaRetriever, RetrievalDocument, build_retrieval_config
+from appealpilot.workflow.appeal_pipeline import AppealPipeline, AppealPipelineConfig
+
+pytest.importorskip("chromadb")
+
+OVERRIDES = {"collection_name": "centroid_test", "embedding_provider": "hash"}
+
+
+def _documents() -> list[RetrievalDocument]:
+    rows = [
+        ("proton beam therapy remains investigational unproven", "Experimental/Investigational"),
+        ("gene therapy trial unproven investigational protocol", "Experimental/Investigational"),
+        ("lumbar fusion surgery not required for back pain", "Medical Necessity"),
+        ("inpatient stay not required for back pain recovery", "Medical Necessity"),
+        ("routine physical therapy visit", "Other"),
+    ]
+    return [
+        RetrievalDocument(doc_id=f"case-{index}", text=text, metadata={"coverage_type": coverage})
+        for index, (text, coverage) in enumerate(rows)
+    ]
+
+
+def _build_index(tmp_path: Path) -> ChromaRetriever:
+    retriever = ChromaRetriever(
+        build_retrieval_config(
+            overrides={**OVERRIDES, "persist_directory": str(tmp_path / "chroma")}
+        )
+    )
+    retriever.upsert_documents(_documents())
+    centroids = build_category_centroids(retriever, page_size=2)
+    centroids.save(category_centroids_path(tmp_path / "chroma", OVERRIDES["collection_name"]))
+    return retriever
+
+
+def test_centroids_classify_with_floor_and_round_trip(tmp_path: Path) -> None:
+    centroids = CategoryCentroids(
+        signature={"provider": "hash", "model": None, "dimensions": 2},
+        categories=("a", "b"),
+        vectors=np.asarray([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32),
+        counts=(3, 4),
+    )
+    first, second, below = centroids.classify_many(
+        [[2.0, 0.1], [0.0, 5.0], [-1.0, -1.0]], min_similarity=0.0
+    )
+    assert first.category == "a" and first.confidence > 0.99
+    assert second.category == "b"
+    assert below is None
+
+    path = centroids.save(tmp_path / "centroids.json")
+    loaded = load_category_centroids(path, centroids.signature)
+    assert loaded.categories == ("a", "b") and loaded.counts == (3, 4)
+    assert load_category_centroids(path, {**centroids.signature, "dimensions": 3}) is None
+    assert load_category_centroids(tmp_path / "missing.json", centroids.signature) is None
+
+
+def test_build_category_centroids_labels_by_coverage_type(tmp_path: Path) -> None:
+    retriever = _build_index(tmp_path)
+    centroids = load_category_centroids(
+        category_centroids_path(tmp_path / "chroma", OVERRIDES["collection_name"]),
+        retriever.embedding_signature,
+    )
+
+    assert centroids.categories == ("experimental_investigational", "medical_necessity")
+    assert centroids.counts == (2, 2)
+    assert np.allclose(np.linalg.norm(centroids.vectors, axis=1), 1.0)
+
+
+def test_pipeline_falls_back_to_centroids_only_without_keyword_match(tmp_path: Path) -> None:
+    _build_index(tmp_path)
+    pipeline = AppealPipeline(
+        AppealPipelineConfig(generation_runtime="template", coalesce_requests=False),
+        retrieval_overrides={**OVERRIDES, "persist_directory": str(tmp_path / "chroma")},
+    )
+    embedded: list[list[str]] = []
+    embed_queries = pipeline.retriever.embed_queries
+    pipeline.retriever.embed_queries = lambda texts: embedded.append(list(texts)) or (
+        embed_queries(texts)
+    )
+
+    packet = pipeline.run("Denial Reason: proton beam therapy gene therapy protocol was declined.")
+    assert packet.classification.category == "experimental_investigational"
+    assert packet.classification.matched_terms == ()
+    assert len(embedded) == 1
+
+    packet = pipeline.run("Denial Reason: not medically necessary.")
+    assert packet.classification.category == "medical_necessity"
+    assert packet.classification.matched_terms
+    assert len(embedded) == 1
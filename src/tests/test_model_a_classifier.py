@@ -1,4 +1,13 @@
-from appealpilot.models.model_a_classifier import classify_denial_reason
+import random
+import re
+
+from appealpilot.domain import DenialClassification
+from appealpilot.models.model_a_classifier import (
+    TAXONOMY,
+    _CompiledTaxonomy,
+    classify_denial_reason,
+    classify_many,
+)
 
 
 def test_classifier_detects_medical_necessity() -> None:
@@ -14,3 +23,47 @@ def test_classifier_falls_back_to_other() -> None:
     result = classify_denial_reason("Reason: generic denial with no category cues.")
     assert result.category == "other"
     assert result.confidence == 0.3
+
+
+def _reference_classify(text: str, taxonomy=TAXONOMY) -> DenialClassification:
+    # The original per-term implementation, kept as the equivalence oracle.
+    best = ("other", 0, ())
+    for category, terms in taxonomy.items():
+        matched = tuple(term for term in terms if re.search(re.escape(term), text, re.IGNORECASE))
+        if len(matched) > best[1]:
+            best = (category, len(matched), matched)
+    confidence = min(1.0, 0.35 + (0.2 * best[1])) if best[1] > 0 else 0.3
+    return DenialClassification(category=best[0], confidence=confidence, matched_terms=best[2])
+
+
+def test_compiled_classifier_matches_reference_implementation() -> None:
+    rng = random.Random(5)
+    fragments = [term for terms in TAXONOMY.values() for term in terms] + [
+        "PRIOR AUTHORIZATION REQUIRED",  # overlapping terms
+        "Out-Of-Network",
+        "not medically necessary",
+        "experimental and unproven",
+        "ſtrange Kelvin K café naïve",  # non-ASCII forces the regex path
+        "outof network",
+        "records not",
+        "lorem ipsum",
+    ]
+    texts = [
+        " ".join(rng.choice(fragments) for _ in range(rng.randint(0, 6))) for _ in range(500)
+    ]
+    texts += ["", "İnvestigational", "timely fılıng", "MEDİCAL NECESSITY"]
+
+    assert classify_many(texts) == [_reference_classify(text) for text in texts]
+
+
+def test_compiled_taxonomy_credits_prefix_terms_at_same_position() -> None:
+    taxonomy = {"a": ("prior auth", "prior authorization"), "b": ("authorization",)}
+    compiled = _CompiledTaxonomy(taxonomy)
+
+    for text in ("PRIOR AUTHORIZATION", "prıor authorization é"):
+        assert compiled.hits(text) == {
+            term
+            for terms in taxonomy.values()
+            for term in terms
+            if re.search(re.escape(term), text, re.IGNORECASE)
+        }
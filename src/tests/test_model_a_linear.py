@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from appealpilot.models import classify_denial_reason, classify_many
+from appealpilot.models.model_a_classifier import (
+    ModelAConfigError,
+    build_model_a_config,
+    reset_model_a_classifier,
+    set_model_a_classifier,
+)
+from appealpilot.models.model_a_linear import (
+    HashedNgramFeaturizer,
+    LinearModelAClassifier,
+    _sparse_dot,
+    dfs_training_examples,
+    load_labeled_jsonl,
+)
+from appealpilot.retrieval import RetrievalDocument
+
+TRAINING = [
+    ("The service is not medically necessary per our clinical criteria.", "medical_necessity"),
+    ("Medical necessity was not established for this admission.", "medical_necessity"),
+    ("This treatment is experimental and investigational.", "experimental_investigational"),
+    ("Unproven therapy under clinical trial protocols is excluded.", "experimental_investigational"),
+    ("The provider is out of network for this plan.", "out_of_network"),
+    ("Non-participating provider; no in-network exception applies.", "out_of_network"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend():
+    reset_model_a_classifier()
+    yield
+    reset_model_a_classifier()
+
+
+def _train() -> LinearModelAClassifier:
+    texts, labels = zip(*(TRAINING * 5))
+    return LinearModelAClassifier.train(
+        texts, labels, featurizer=HashedNgramFeaturizer(dimensions=2**10), epochs=30
+    )
+
+
+def test_sparse_dot_matches_dense_with_empty_rows() -> None:
+    weights = np.arange(12, dtype=np.float32).reshape(6, 2)
+    indptr = np.asarray([0, 0, 2, 2, 3])
+    indices = np.asarray([1, 4, 5])
+    data = np.asarray([0.5, 2.0, 1.0], dtype=np.float32)
+    dense = np.zeros((4, 6), dtype=np.float32)
+    dense[1, 1], dense[1, 4], dense[3, 5] = 0.5, 2.0, 1.0
+
+    assert np.allclose(_sparse_dot(indptr, indices, data, weights), dense @ weights)
+
+
+def test_linear_model_trains_and_round_trips(tmp_path: Path) -> None:
+    model = _train()
+    texts = [text for text, _ in TRAINING]
+
+    predictions = model.classify_many(texts)
+    assert [item.category for item in predictions] == [label for _, label in TRAINING]
+    assert "not medically necessary" in predictions[0].matched_terms
+
+    path = model.save(tmp_path / "model" / "linear.npz")
+    loaded = LinearModelAClassifier.load(path)
+    assert loaded.classes == model.classes
+    assert [item.category for item in loaded.classify_many(texts)] == [
+        item.category for item in predictions
+    ]
+    assert loaded.classify(texts[2]).category == "experimental_investigational"
+
+
+def test_load_missing_artifact_raises(tmp_path: Path) -> None:
+    with pytest.raises(ModelAConfigError):
+        LinearModelAClassifier.load(tmp_path / "missing.npz")
+
+
+def test_installed_classifier_drives_module_functions() -> None:
+    model = _train()
+    set_model_a_classifier(model)
+    text = "Coverage is denied: the plan considers this care not medically necessary."
+
+    assert classify_denial_reason(text) == model.classify(text)
+    assert classify_many([text, text]) == model.classify_many([text, text])
+
+
+def test_linear_backend_loads_artifact_from_env(tmp_path: Path, monkeypatch) -> None:
+    path = _train().save(tmp_path / "linear.npz")
+    monkeypatch.setenv("APPEALPILOT_MODEL_A_BACKEND", "linear")
+    monkeypatch.setenv("APPEALPILOT_MODEL_A_PATH", str(path))
+
+    config = build_model_a_config(settings_path=tmp_path / "missing.yaml")
+    assert config.backend == "linear"
+    assert classify_denial_reason("Provider is out of network.").category == "out_of_network"
+
+
+def test_build_model_a_config_rejects_unknown_backend(tmp_path: Path) -> None:
+    with pytest.raises(ModelAConfigError):
+        build_model_a_config(settings_path=tmp_path / "missing.yaml", overrides={"backend": "bert"})
+
+
+def test_training_example_loaders(tmp_path: Path) -> None:
+    documents = [
+        RetrievalDocument(
+            doc_id="1",
+            text="coverage type: Experimental/Investigational\ntreatment: proton therapy",
+            metadata={"coverage_type": "Experimental/Investigational"},
+        ),
+        RetrievalDocument(doc_id="2", text="treatment: mri", metadata={"coverage_type": "Other"}),
+    ]
+    assert dfs_training_examples(documents) == [
+        ("treatment: proton therapy", "experimental_investigational")
+    ]
+
+    labeled = tmp_path / "labeled.jsonl"
+    labeled.write_text('{"text": "not medically necessary", "category": "medical_necessity"}\n\n')
+    assert load_labeled_jsonl(labeled) == [("not medically necessary", "medical_necessity")]
+    labeled.write_text('{"text": "missing label"}\n')
+    with pytest.raises(ModelAConfigError):
+        load_labeled_jsonl(labeled)
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
 
+from appealpilot.models.json_repair import json_repair_stats
+from appealpilot.benchmarks.stub_llm_server import (
+    build_stub_appeal_output,
+    load_prompt_payload,
+)
 from appealpilot.models.model_c_aisuite import (
     ModelCConfig,
     ModelCGenerator,
+    ModelCResponseError,
+    SLIM_OUTPUT_CONTRACT,
+    _usage_as_dict,
+    expand_slim_output,
     run_model_c_passthrough,
 )
 
@@ -32,6 +45,38 @@ class _StubClient:
         self.chat = SimpleNamespace(completions=_StubCompletions())
 
 
+class _StreamingStubCompletions:
+    def __init__(self, content: str, supports_stream: bool = True) -> None:
+        self.content = content
+        self.supports_stream = supports_stream
+        self.calls: list[dict[str, object]] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            if not self.supports_stream:
+                raise RuntimeError("streaming not supported")
+            return iter(
+                [
+                    SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=self.content[i:i + 7]))],
+                        usage=None,
+                    )
+                    for i in range(0, len(self.content), 7)
+                ]
+                + [
+                    SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=None))],
+                        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=4, total_tokens=7),
+                    )
+                ]
+            )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(prompt_tokens=3, completion_tokens=4, total_tokens=7),
+        )
+
+
 class _StructuredStubCompletions:
     def __init__(self) -> None:
         self.calls: list[dict[str, object]] = []
@@ -171,3 +216,284 @@ def test_passthrough_requires_prompt() -> None:
             model="openai:gpt-4o-mini",
             client=_StubClient(),
         )
+
+
+def test_sync_and_async_calls_share_one_provider_cap() -> None:
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class _SlowCompletions:
+        def create(self, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return _StubCompletions().create(**kwargs)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=_SlowCompletions()))
+    generator = ModelCGenerator(
+        config=ModelCConfig(model="capped:test-model", max_in_flight=2),
+        client=client,
+    )
+    # The first config seen for a provider fixes its cap; a later config with a
+    # larger limit must share that pool rather than get its own.
+    generator.generate(case_summary={}, retrieved_evidence=[])
+    loose_generator = ModelCGenerator(
+        config=ModelCConfig(model="capped:test-model", max_in_flight=10),
+        client=client,
+    )
+
+    async def _run_async():
+        return await asyncio.gather(
+            *(generator.agenerate(case_summary={}, retrieved_evidence=[]) for _ in range(4))
+        )
+
+    threads = [
+        threading.Thread(
+            target=loose_generator.generate,
+            kwargs={"case_summary": {}, "retrieved_evidence": []},
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    results = asyncio.run(_run_async())
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert all(item["output"]["cover_letter"] == "ok" for item in results)
+    assert state["peak"] <= 2
+
+
+@pytest.mark.parametrize("supports_stream", [True, False])
+def test_generate_stream_emits_sections_then_complete(supports_stream: bool) -> None:
+    content = '{"cover_letter": "Dear plan", "detailed_justification": "Because.", "citations": []}'
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_StreamingStubCompletions(content, supports_stream))
+    )
+    generator = ModelCGenerator(config=ModelCConfig(model="groq:llama-3.3-70b-versatile"), client=client)
+
+    events = list(generator.generate_stream(case_summary={}, retrieved_evidence=[]))
+
+    sections = [event["section"] for event in events if event["event"] == "section"]
+    assert sections == ["cover_letter", "detailed_justification", "citations"]
+    assert events[-1]["event"] == "complete"
+    assert events[-1]["result"]["output"]["cover_letter"] == "Dear plan"
+    assert events[-1]["result"]["usage"]["total_tokens"] == 7
+    if supports_stream:
+        assert events[0]["event"] == "delta"
+        assert len(client.chat.completions.calls) == 1
+
+
+class _SectionStubCompletions:
+    def __init__(self, drop_key: str | None = None) -> None:
+        self.drop_key = drop_key
+        self.payloads: list[dict] = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        payload = load_prompt_payload(kwargs["messages"])
+        with self._lock:
+            self.payloads.append(payload)
+        output = build_stub_appeal_output(payload)
+        output.pop(self.drop_key, None)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(output)))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        )
+
+
+def _sectioned_generator(completions) -> ModelCGenerator:
+    return ModelCGenerator(
+        config=ModelCConfig(model="openai:gpt-4o-mini", generation_mode="sectioned"),
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+
+
+def test_sectioned_mode_assembles_contract_from_minimal_prompts() -> None:
+    completions = _SectionStubCompletions()
+    result = _sectioned_generator(completions).generate(
+        case_summary={"payer": "Aetna", "denial_reason_text": "Not medically necessary."},
+        retrieved_evidence=[{"source_id": "DFS-1", "snippet": "overturned"}],
+        required_attachments=["Provider note"],
+    )
+
+    assert result["generation_mode"] == "sectioned"
+    assert list(result["output"]) == [
+        "cover_letter",
+        "detailed_justification",
+        "evidence_checklist",
+        "missing_information",
+        "citations",
+    ]
+    assert result["output"]["citations"][0]["source_id"] == "DFS-1"
+    assert result["usage"]["total_tokens"] == 60
+
+    by_section = {tuple(payload["sections"]): payload for payload in completions.payloads}
+    assert "retrieved_evidence" not in by_section[("cover_letter",)]
+    assert "case_summary" not in by_section[("citations",)]
+    assert "required_attachments" in by_section[("evidence_checklist", "missing_information")]
+
+
+def test_sectioned_mode_rejects_incomplete_sections() -> None:
+    generator = _sectioned_generator(_SectionStubCompletions(drop_key="citations"))
+
+    with pytest.raises(ModelCResponseError, match="citations"):
+        generator.generate(case_summary={}, retrieved_evidence=[])
+
+
+def test_sectioned_agenerate_matches_sync_output() -> None:
+    kwargs = {
+        "case_summary": {"payer": "Aetna"},
+        "retrieved_evidence": [{"source_id": "DFS-1", "snippet": "x"}],
+    }
+    sync_result = _sectioned_generator(_SectionStubCompletions()).generate(**kwargs)
+    async_result = asyncio.run(_sectioned_generator(_SectionStubCompletions()).agenerate(**kwargs))
+
+    assert async_result["output"] == sync_result["output"]
+
+
+@pytest.mark.parametrize("generation_mode", ["single", "sectioned"])
+def test_slim_contract_fills_checklist_and_excerpts_locally(generation_mode: str) -> None:
+    completions = _SectionStubCompletions()
+    generator = ModelCGenerator(
+        config=ModelCConfig(
+            model="openai:gpt-4o-mini",
+            generation_mode=generation_mode,
+            output_contract="slim",
+        ),
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+    result = generator.generate(
+        case_summary={"payer": "Aetna"},
+        retrieved_evidence=[{"source_id": "DFS-1", "snippet": "Reviewer overturned the denial."}],
+        required_attachments=["Provider note"],
+    )
+
+    assert all(
+        payload["output_contract"].keys() <= SLIM_OUTPUT_CONTRACT.keys()
+        for payload in completions.payloads
+    )
+    assert "citation_refs" in json.loads(result["raw_text"])
+    assert result["output_contract"] == "slim"
+    assert result["output"]["evidence_checklist"] == [
+        {"item": "Provider note", "status": "missing", "notes": "Confirm and attach."}
+    ]
+    assert result["output"]["citations"][0]["source_excerpt"] == "Reviewer overturned the denial."
+
+
+def test_expand_slim_output_drops_unknown_sources_and_clamps_offsets() -> None:
+    output = expand_slim_output(
+        {
+            "cover_letter": "Letter",
+            "detailed_justification": "Why",
+            "missing_information": [],
+            "citation_refs": [
+                {"claim": "a", "source_id": "DFS-1", "start": 9, "end": 18},
+                {"claim": "b", "source_id": "DFS-1", "start": 5, "end": 999},
+                {"claim": "c", "source_id": "invented"},
+            ],
+        },
+        retrieved_evidence=[{"source_id": "DFS-1", "snippet": "Reviewer overturned it."}],
+        required_attachments=[],
+    )
+
+    assert [citation["source_excerpt"] for citation in output["citations"]] == [
+        "overturne",
+        "Reviewer overturned it.",
+    ]
+    assert output["evidence_checklist"] == []
+
+    with pytest.raises(ModelCResponseError, match="citation_refs"):
+        expand_slim_output(
+            {"cover_letter": "", "detailed_justification": "", "missing_information": []}, [], []
+        )
+
+
+def test_static_instructions_form_a_byte_identical_prefix() -> None:
+    generator = ModelCGenerator(
+        config=ModelCConfig(model="openai:gpt-4o-mini"),
+        client=SimpleNamespace(chat=SimpleNamespace(completions=_StubCompletions())),
+    )
+
+    def messages(payer: str, generated_at: str) -> list[dict[str, str]]:
+        payload = generator._build_payload(
+            {"payer": payer, "generated_at_utc": generated_at},
+            [{"source_id": "DFS-1", "snippet": "x"}],
+            ["Provider note"],
+            None,
+        )
+        return generator._build_messages(payload)
+
+    first = messages("Aetna", "2026-01-01T00:00:00Z")
+    second = messages("Cigna", "2026-01-02T00:00:00Z")
+    repeat = messages("Aetna", "2026-01-03T00:00:00Z")
+
+    assert first[0] == second[0]
+    assert "output_contract" in first[0]["content"]
+    assert "output_contract" not in first[1]["content"]
+    # The timestamp is last, so a repeated case shares everything before it.
+    assert first[1]["content"].split('"generated_at_utc"')[0] == repeat[1]["content"].split(
+        '"generated_at_utc"'
+    )[0]
+
+
+def test_usage_reports_cached_prompt_tokens() -> None:
+    usage = SimpleNamespace(
+        prompt_tokens=1200,
+        completion_tokens=50,
+        total_tokens=1250,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    )
+
+    assert _usage_as_dict(SimpleNamespace(usage=usage))["cached_prompt_tokens"] == 1024
+    assert _usage_as_dict(
+        SimpleNamespace(usage={"prompt_tokens": 10, "prompt_cache_hit_tokens": 8})
+    )["cached_prompt_tokens"] == 8
+    assert "cached_prompt_tokens" not in _usage_as_dict(
+        SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10))
+    )
+
+
+_VALID_PACKET = {
+    "cover_letter": "Dear plan",
+    "detailed_justification": "Because.",
+    "evidence_checklist": [],
+    "missing_information": [],
+    "citations": [{"claim": "a", "source_id": "D1", "source_excerpt": "x"}],
+}
+
+
+def _generator_returning(content: str) -> ModelCGenerator:
+    return ModelCGenerator(
+        config=ModelCConfig(model="groq:llama-3.3-70b-versatile"),
+        client=SimpleNamespace(
+            chat=SimpleNamespace(completions=_StreamingStubCompletions(content))
+        ),
+    )
+
+
+def test_malformed_json_is_repaired_flagged_and_counted() -> None:
+    # Prose before the object and a completion cut off mid-citation.
+    content = "Sure! " + json.dumps(_VALID_PACKET)[:-2] + ', {"claim": "b", "sou'
+    before = json_repair_stats()
+
+    result = _generator_returning(content).generate(case_summary={}, retrieved_evidence=[])
+
+    assert result["json_repaired"] is True
+    assert "closed_truncation" in result["json_repairs"]
+    assert result["output"]["citations"] == _VALID_PACKET["citations"]
+    assert result["raw_text"] == content
+    assert json_repair_stats()["repaired"] == before["repaired"] + 1
+
+
+def test_repaired_output_missing_contract_keys_still_fails() -> None:
+    before = json_repair_stats()
+
+    with pytest.raises(ModelCResponseError, match="missing"):
+        _generator_returning('{"cover_letter": "Dear plan",').generate(
+            case_summary={}, retrieved_evidence=[]
+        )
+    assert json_repair_stats()["failed"] == before["failed"] + 1
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from appealpilot.models.model_c_aisuite import ModelCConfig, ModelCResponseError
+from appealpilot.models.model_c_router import (
+    ModelCRouter,
+    ModelCRouterConfig,
+    ModelCRoutingError,
+    build_model_c_router_config,
+)
+
+
+class _FakeGenerator:
+    def __init__(self, model: str, delay: float = 0.0, fail: bool = False) -> None:
+        self.config = ModelCConfig(model=model)
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ModelCResponseError(f"{self.config.provider} unavailable")
+        return {"provider": self.config.provider, "model": self.config.model, "output": {}}
+
+
+def _router(*generators, **config) -> ModelCRouter:
+    models = tuple(generator.config.model for generator in generators)
+    return ModelCRouter(
+        config=ModelCRouterConfig(models=models, **config), generators=list(generators)
+    )
+
+
+def test_fails_over_and_skips_provider_with_open_circuit() -> None:
+    openai = _FakeGenerator("openai:gpt-5-mini", fail=True)
+    groq = _FakeGenerator("groq:llama-3.3-70b-versatile")
+    router = _router(openai, groq, failure_threshold=1, cooldown_seconds=60)
+
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+    assert result["routing"]["selected_model"] == "groq:llama-3.3-70b-versatile"
+    assert [attempt["outcome"] for attempt in result["routing"]["attempts"]] == ["error", "ok"]
+
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+    assert openai.calls == 1
+    assert result["routing"]["skipped_open_circuit"] == ["openai:gpt-5-mini"]
+
+    stats = router.stats()
+    assert stats["providers"]["openai"]["state"] == "open"
+    assert stats["providers"]["openai"]["circuit_opens"] == 1
+    assert stats["failovers"] == 1
+
+
+def test_errored_provider_is_ranked_behind_healthy_one() -> None:
+    openai = _FakeGenerator("openai:gpt-5-mini", fail=True)
+    groq = _FakeGenerator("groq:llama-3.3-70b-versatile")
+    router = _router(openai, groq, failure_threshold=3)
+
+    router.generate(case_summary={}, retrieved_evidence=[])
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+
+    assert openai.calls == 1
+    assert len(result["routing"]["attempts"]) == 1
+    assert router.stats()["providers"]["openai"]["state"] == "closed"
+
+
+def test_half_open_probe_closes_circuit_on_success() -> None:
+    openai = _FakeGenerator("openai:gpt-5-mini", fail=True)
+    groq = _FakeGenerator("groq:llama-3.3-70b-versatile")
+    router = _router(openai, groq, failure_threshold=1, cooldown_seconds=0.05)
+
+    router.generate(case_summary={}, retrieved_evidence=[])
+    assert router.stats()["providers"]["openai"]["state"] == "open"
+
+    time.sleep(0.06)
+    openai.fail = False
+    groq.delay = 0.01
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+
+    assert openai.calls == 2
+    assert result["routing"]["selected_model"] == "openai:gpt-5-mini"
+    assert router.stats()["providers"]["openai"]["state"] == "closed"
+
+
+def test_all_providers_failing_raises_routing_error_with_details() -> None:
+    router = _router(
+        _FakeGenerator("openai:gpt-5-mini", fail=True),
+        _FakeGenerator("groq:llama-3.3-70b-versatile", fail=True),
+        failure_threshold=1,
+    )
+
+    with pytest.raises(ModelCRoutingError) as excinfo:
+        router.generate(case_summary={}, retrieved_evidence=[])
+    assert len(excinfo.value.routing["attempts"]) == 2
+
+    with pytest.raises(ModelCRoutingError, match="open circuits"):
+        router.generate(case_summary={}, retrieved_evidence=[])
+    assert router.stats()["short_circuited"] == 1
+
+
+def test_routes_to_faster_provider_once_latency_is_observed() -> None:
+    slow = _FakeGenerator("openai:gpt-5-mini", delay=0.05)
+    fast = _FakeGenerator("groq:llama-3.3-70b-versatile", delay=0.0)
+    router = _router(slow, fast)
+
+    assert router.generate(case_summary={}, retrieved_evidence=[])["model"] == slow.config.model
+    # Force one observation of the faster provider via failover.
+    slow.fail = True
+    router.generate(case_summary={}, retrieved_evidence=[])
+    slow.fail = False
+
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+    assert result["routing"]["selected_model"] == fast.config.model
+
+
+def test_hedge_fires_after_delay_and_first_success_wins() -> None:
+    slow = _FakeGenerator("openai:gpt-5-mini", delay=0.3)
+    fast = _FakeGenerator("groq:llama-3.3-70b-versatile", delay=0.0)
+    router = _router(slow, fast, hedge_delay_seconds=0.02)
+
+    started = time.monotonic()
+    result = router.generate(case_summary={}, retrieved_evidence=[])
+
+    assert time.monotonic() - started < 0.25
+    assert result["routing"]["hedged"] is True
+    assert result["routing"]["selected_model"] == fast.config.model
+    assert router.stats()["hedges"] == 1
+    assert router.stats()["hedge_wins"] == 1
+
+
+def test_router_config_reads_env(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("MODEL_C_ROUTER_MODELS", "openai:gpt-5-mini, groq:llama-3.3-70b-versatile")
+    monkeypatch.setenv("MODEL_C_HEDGE_DELAY_SECONDS", "1.5")
+    config = build_model_c_router_config(settings_path=tmp_path / "missing.yaml")
+
+    assert config.models == ("openai:gpt-5-mini", "groq:llama-3.3-70b-versatile")
+    assert config.enabled is True
+    assert config.hedge_delay_seconds == 1.5
+    assert config.provider == "openai"
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from appealpilot import profiling
+from appealpilot.api.app import app
+from appealpilot.profiling import ProfileConfig, ProfileConfigError, build_profile_config
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiling():
+    yield
+    profiling.configure_profiling(None)
+
+
+def _busy(seconds: float = 0.03) -> int:
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def test_build_profile_config_parses_shorthand(tmp_path: Path, monkeypatch) -> None:
+    settings = tmp_path / "settings.yaml"
+    settings.write_text("profiling:\n  profile: header\n  max_files: 5\n")
+
+    config = build_profile_config(settings_path=settings)
+    assert (config.mode, config.max_files) == ("header", 5)
+
+    monkeypatch.setenv("APPEALPILOT_PROFILE", "0.25")
+    config = build_profile_config(settings_path=settings)
+    assert (config.mode, config.sample_rate) == ("sample", 0.25)
+
+    assert build_profile_config(settings, overrides={"profile": "on"}).sample_rate == 1.0
+    assert build_profile_config(settings, overrides={"profile": "off"}).mode == "off"
+    with pytest.raises(ProfileConfigError):
+        build_profile_config(settings, overrides={"profile": "sometimes"})
+    with pytest.raises(ProfileConfigError):
+        build_profile_config(settings, overrides={"profile": "1.5"})
+
+
+def test_off_mode_writes_nothing(tmp_path: Path) -> None:
+    profiling.configure_profiling(ProfileConfig(mode="off", directory=str(tmp_path)))
+
+    with profiling.force_profiling(), profiling.profiled("job"):
+        _busy(0.001)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pstats_profile_and_nested_calls_fold(tmp_path: Path) -> None:
+    profiling.configure_profiling(
+        ProfileConfig(mode="sample", sample_rate=1.0, directory=str(tmp_path))
+    )
+
+    @profiling.profile_call("inner")
+    def inner() -> int:
+        return _busy(0.005)
+
+    with profiling.profiled("outer run"):
+        inner()
+
+    files = list(tmp_path.glob("*.prof"))
+    assert len(files) == 1
+    assert "-outer_run-" in files[0].name
+    functions = {name for (_, _, name) in pstats.Stats(str(files[0])).stats}
+    assert "_busy" in functions
+
+
+def test_collapsed_format_and_rotation(tmp_path: Path) -> None:
+    profiling.configure_profiling(
+        ProfileConfig(
+            mode="sample",
+            sample_rate=1.0,
+            format="collapsed",
+            directory=str(tmp_path),
+            max_files=2,
+            sample_interval_seconds=0.001,
+        )
+    )
+
+    for _ in range(3):
+        with profiling.profiled("collapsed"):
+            _busy()
+
+    files = sorted(tmp_path.glob("*.collapsed"))
+    assert len(files) == 2
+    line = files[-1].read_text().splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert "test_profiling:_busy" in stack
+    assert int(count) >= 1
+
+
+def test_header_mode_profiles_only_flagged_requests(tmp_path: Path) -> None:
+    profiling.configure_profiling(ProfileConfig(mode="header", directory=str(tmp_path)))
+    client = TestClient(app)
+    body = {"denial_text": "Payer: Aetna\nDenial Reason: Not medically necessary."}
+
+    assert client.post("/classify", json=body).status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.post("/classify", json=body, headers={profiling.PROFILE_HEADER: "1"})
+    assert response.status_code == 200
+    assert [path.name.split("-")[1] for path in tmp_path.glob("*.prof")] == ["api.classify"]
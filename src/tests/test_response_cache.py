@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from appealpilot.models.model_c_aisuite import ModelCConfig, ModelCGenerator
+from appealpilot.models.response_cache import (
+    ResponseCache,
+    ResponseCacheConfig,
+    build_response_cache_config,
+)
+
+KEY_A = "aa" + "0" * 62
+KEY_B = "bb" + "0" * 62
+KEY_C = "cc" + "0" * 62
+
+
+class _StubCompletions:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"cover_letter":"ok"}'))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        )
+
+
+class _StubClient:
+    def __init__(self) -> None:
+        self.chat = SimpleNamespace(completions=_StubCompletions())
+
+
+def _entry_files(directory: Path) -> set[str]:
+    return {path.stem for path in directory.glob("*/*.json")}
+
+
+def test_cache_is_disabled_by_default(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("MODEL_C_CACHE_ENABLED", raising=False)
+    assert ResponseCacheConfig().enabled is False
+    assert build_response_cache_config(settings_path=tmp_path / "missing.yaml").enabled is False
+
+
+def test_cache_hits_ignore_generated_timestamp_and_report_zero_usage(tmp_path: Path) -> None:
+    client = _StubClient()
+    generator = ModelCGenerator(
+        config=ModelCConfig(model="openai:gpt-4o-mini"),
+        client=client,
+        cache=ResponseCache(ResponseCacheConfig(directory=str(tmp_path / "cache"))),
+    )
+
+    first = generator.generate(
+        case_summary={"payer": "Aetna", "generated_at_utc": "2026-01-01T00:00:00"},
+        retrieved_evidence=[],
+    )
+    second = generator.generate(
+        case_summary={"payer": "Aetna", "generated_at_utc": "2026-01-02T00:00:00"},
+        retrieved_evidence=[],
+    )
+    bypassed = generator.generate(
+        case_summary={"payer": "Aetna"},
+        retrieved_evidence=[],
+        bypass_cache=True,
+    )
+
+    assert first["cache_hit"] is False
+    assert first["usage"]["total_tokens"] == 15
+    assert second["cache_hit"] is True
+    assert second["output"] == first["output"]
+    assert second["usage"] == {}
+    assert second["cached_usage"]["total_tokens"] == 15
+    assert bypassed["cache_hit"] is False
+    assert len(client.chat.completions.calls) == 2
+    assert generator.cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used_entry_past_max_bytes(tmp_path: Path) -> None:
+    cache = ResponseCache(ResponseCacheConfig(directory=str(tmp_path), max_bytes=500))
+    cache.set(KEY_A, {"output": "x" * 150})
+    (old_entry,) = tmp_path.glob("*/*.json")
+    os.utime(old_entry, (1, 1))
+    cache.set(KEY_B, {"output": "y" * 150})
+    cache.set(KEY_C, {"output": "z" * 150})
+
+    assert _entry_files(tmp_path) == {KEY_B, KEY_C}
+    assert cache.get(KEY_A) is None
+    assert cache.get(KEY_B) == {"output": "y" * 150}
+    assert cache.get(KEY_C) == {"output": "z" * 150}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries_by_creation_time_not_access_time(tmp_path: Path) -> None:
+    cache = ResponseCache(ResponseCacheConfig(directory=str(tmp_path), ttl_seconds=60))
+    cache.set(KEY_A, {"output": "stale"})
+    cache.set(KEY_B, {"output": "fresh"})
+    stale_entry = next(path for path in tmp_path.glob("*/*.json") if path.stem == KEY_A)
+    stale_entry.write_text(
+        json.dumps({"created_at": time.time() - 120, "value": {"output": "stale"}})
+    )
+
+    # A recent mtime (recently read) must not keep an expired entry alive.
+    assert cache.evict() == 1
+    assert _entry_files(tmp_path) == {KEY_B}
+    assert cache.get(KEY_A) is None
+    assert cache.get(KEY_B) == {"output": "fresh"}
+
+
+def test_cache_storage_errors_are_best_effort(tmp_path: Path) -> None:
+    cache = ResponseCache(ResponseCacheConfig(directory=str(tmp_path)))
+    # A regular file where the shard directory should be makes writes fail.
+    (tmp_path / KEY_A[:2]).write_text("not a directory")
+
+    cache.set(KEY_A, {"output": "x"})
+
+    assert cache.get(KEY_A) is None
+    assert cache.stats()["errors"] >= 1
+    assert cache.stats()["writes"] == 0
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from appealpilot.benchmarks.retrieval_eval import (
+    LabeledQuery,
+    RetrievalEvalConfig,
+    RetrievalEvalError,
+    build_labeled_queries,
+    parse_variant,
+    run_retrieval_eval,
+    score_rankings,
+)
+from appealpilot.retrieval import RetrievalDocument
+
+
+def _doc(doc_id: str, treatment: str, diagnosis: str) -> RetrievalDocument:
+    return RetrievalDocument(
+        doc_id=doc_id,
+        text=f"treatment: {treatment}\ndiagnosis: {diagnosis}",
+        metadata={"case_number": doc_id, "treatment": treatment, "diagnosis": diagnosis},
+    )
+
+
+def test_labeled_queries_hold_out_one_record_per_query() -> None:
+    documents = [
+        _doc("a1", "MRI", "Back pain"),
+        _doc("a2", "mri", "back  pain"),
+        _doc("a3", "MRI", "Back pain"),
+        _doc("b1", "Proton therapy", "Prostate cancer"),
+        _doc("c1", "CGM", "Diabetes"),
+        _doc("c2", "CGM", "Diabetes"),
+    ]
+
+    queries, indexed = build_labeled_queries(documents, max_queries=10, seed=1)
+
+    indexed_ids = {document.doc_id for document in indexed}
+    assert len(queries) == 3  # two from the MRI family, one from CGM; singletons skipped
+    for query in queries:
+        assert query.query_id not in indexed_ids
+        assert query.relevant_ids and query.relevant_ids <= indexed_ids
+    assert "b1" in indexed_ids
+
+    with pytest.raises(RetrievalEvalError):
+        build_labeled_queries([_doc("x", "MRI", "Back pain")])
+
+
+def test_score_rankings_recall_and_mrr() -> None:
+    queries = [
+        LabeledQuery("q1", "mri", frozenset({"a", "b"})),
+        LabeledQuery("q2", "cgm", frozenset({"c"})),
+    ]
+    rankings = [["x", "a", "b"], ["y", "z", "w"]]
+
+    scores = score_rankings(rankings, queries, k_values=(1, 3))
+
+    assert scores["recall@1"] == 0.0
+    assert scores["recall@3"] == 0.5  # q1 finds both relevant, q2 none
+    assert scores["mrr"] == 0.25
+
+
+def test_run_retrieval_eval_reports_metrics_and_skips(tmp_path: Path) -> None:
+    documents = [
+        _doc(f"{family}{index}", treatment, diagnosis)
+        for family, treatment, diagnosis in [
+            ("m", "MRI lumbar spine", "radiculopathy"),
+            ("p", "Proton beam therapy", "prostate cancer"),
+            ("g", "Continuous glucose monitor", "type 1 diabetes"),
+        ]
+        for index in range(4)
+    ]
+
+    results = run_retrieval_eval(
+        documents,
+        RetrievalEvalConfig(
+            variants=("hash:64", "no_such_provider"),
+            k_values=(1, 3),
+            max_queries=6,
+            work_dir=str(tmp_path),
+        ),
+    )
+
+    row = results["variants"]["hash:64"]
+    assert results["queries"] == 6 and results["documents"] == 6
+    assert row["recall@3"] == 1.0 and row["mrr"] == 1.0
+    assert row["index_bytes"] > 0 and row["query_p95_seconds"] >= row["query_p50_seconds"]
+    assert "no_such_provider" in results["skipped"]
+
+
+def test_parse_variant() -> None:
+    assert parse_variant("hash:512") == {"embedding_provider": "hash", "hash_dimensions": 512}
+    assert parse_variant("sbert") == {"embedding_provider": "sbert"}
+    with pytest.raises(RetrievalEvalError):
+        parse_variant("sbert:384")
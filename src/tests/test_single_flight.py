@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from appealpilot.workflow.single_flight import SingleFlight, build_request_key
+
+
+def _key(**overrides) -> str:
+    params = {
+        "denial_text": "Payer: Aetna\nDenial Reason: Not medically necessary.",
+        "chart_notes": "Failed PT.",
+        "top_k": 5,
+        "generation_runtime": "template",
+        "retrieval": {"collection_name": "dfs_appeals_cases"},
+        **overrides,
+    }
+    return build_request_key(**params)
+
+
+def test_request_key_normalizes_whitespace_but_not_settings() -> None:
+    assert _key() == _key(denial_text="  Payer: Aetna   Denial Reason: Not medically necessary. ")
+    assert _key() != _key(top_k=6)
+    assert _key() != _key(generation_runtime="aisuite")
+    assert _key() != _key(retrieval={"collection_name": "other"})
+
+
+def test_concurrent_duplicates_share_one_computation() -> None:
+    group: SingleFlight[int] = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def _compute() -> int:
+        calls.append(1)
+        release.wait(timeout=5)
+        return 42
+
+    results: list[tuple[int, bool]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(group.do("same", _compute)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while group.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [(42, False), (42, True), (42, True), (42, True)]
+    assert group.stats() == {"executed": 1, "coalesced": 3, "in_flight": 0}
+
+
+def test_errors_propagate_and_key_is_released() -> None:
+    group: SingleFlight[int] = SingleFlight()
+
+    def _fail() -> int:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        group.do("key", _fail)
+    assert group.do("key", lambda: 7) == (7, False)
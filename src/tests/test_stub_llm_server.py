@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+
+from appealpilot.benchmarks.stub_llm_server import (
+    StubLLMServer,
+    StubLLMServerConfig,
+    estimate_tokens,
+    load_prompt_payload,
+)
+
+
+def _request() -> dict:
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "sys"},
+            {
+                "role": "user",
+                "content": json.dumps(
+                    {"retrieved_evidence": [{"source_id": "DFS-1", "snippet": "x"}]}
+                ),
+            },
+        ],
+    }
+
+
+def test_stub_completion_is_contract_valid_json() -> None:
+    server = StubLLMServer(StubLLMServerConfig(latency_seconds=0.0, tokens_per_second=0.0))
+    try:
+        body, delay = server.build_completion(_request())
+    finally:
+        server.stop()
+
+    output = json.loads(body["choices"][0]["message"]["content"])
+    assert output["citations"][0]["source_id"] == "DFS-1"
+    assert body["usage"]["completion_tokens"] > 0
+    assert delay == 0.0
+
+
+def test_stub_delay_scales_with_completion_tokens() -> None:
+    server = StubLLMServer(StubLLMServerConfig(latency_seconds=0.1, tokens_per_second=400.0))
+    try:
+        body, delay = server.build_completion(_request())
+    finally:
+        server.stop()
+
+    content = body["choices"][0]["message"]["content"]
+    assert delay == 0.1 + estimate_tokens(content) / 400.0
+
+
+def test_stub_stream_chunks_reassemble_to_the_completion() -> None:
+    server = StubLLMServer(StubLLMServerConfig(latency_seconds=0.2, tokens_per_second=0.0))
+    try:
+        body, _ = server.build_completion(_request())
+        chunks = list(server.iter_stream_chunks(_request()))
+    finally:
+        server.stop()
+
+    content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk, _ in chunks)
+    assert content == body["choices"][0]["message"]["content"]
+    assert chunks[0][1] == 0.2
+    assert chunks[-1][0]["choices"][0]["finish_reason"] == "stop"
+    assert chunks[-1][0]["usage"] == body["usage"]
+
+
+def test_stub_reports_cached_prefix_and_discounts_prefill() -> None:
+    server = StubLLMServer(
+        StubLLMServerConfig(
+            latency_seconds=0.0,
+            tokens_per_second=0.0,
+            prompt_tokens_per_second=1000.0,
+            prefix_cache_min_tokens=256,
+        )
+    )
+    static = "s" * 4000
+    first = {"messages": [{"role": "system", "content": static}, {"role": "user", "content": "a"}]}
+    second = {"messages": [{"role": "system", "content": static}, {"role": "user", "content": "b"}]}
+    try:
+        cold, cold_delay = server.build_completion(first)
+        warm, warm_delay = server.build_completion(second)
+    finally:
+        server.stop()
+
+    assert cold["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+    assert warm["usage"]["prompt_tokens_details"]["cached_tokens"] == 896
+    assert warm_delay < cold_delay
+
+
+def test_load_prompt_payload_merges_system_and_user_json() -> None:
+    payload = load_prompt_payload(
+        [
+            {"role": "system", "content": 'Instructions. {"sections": ["citations"]}'},
+            {"role": "user", "content": '{"evidence_ids": ["DFS-1"]}'},
+        ]
+    )
+
+    assert payload == {"sections": ["citations"], "evidence_ids": ["DFS-1"]}